@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# encoding: utf-8
+""" Reports how long the Eagle XML parser and writer take to import
+
+Usage: python test/bench_import.py [REPEATS] [MODULE ...]
+
+Each module is imported in a fresh interpreter REPEATS times (5 by
+default), and the fastest and median times of the import itself are
+printed, so interpreter start up is left out. The imports are from a
+byte compiled copy of the package's python files in a temporary
+directory, so no import pays for compiling its source, and the tree is
+left as it was. With no modules, the Eagle XML parser, the writer and
+the generated bindings are timed. """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import shutil
+import tempfile
+import compileall
+import subprocess
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULES = ['upconvert.parser.eaglexml', 'upconvert.writer.eaglexml',
+           'upconvert.parser.eaglexml.generated_g']
+
+# run in the child, which prints the seconds the import took
+TIMER = ('import sys, time; sys.path.insert(0, %r); start = time.time(); '
+         'import %s; print time.time() - start')
+
+
+def copy_package(directory):
+    """ Copy the python files of the package into directory and byte
+    compile them there """
+    def ignore(path, names):
+        """ Skip all but the python files and the directories """
+        return [name for name in names if not name.endswith('.py')
+                and not os.path.isdir(os.path.join(path, name))]
+
+    target = os.path.join(directory, 'upconvert')
+    shutil.copytree(os.path.join(ROOT_DIR, 'upconvert'), target, ignore=ignore)
+    compileall.compile_dir(target, quiet=1)
+
+
+def cold_import(directory, module):
+    """ Return the seconds module takes to import from directory in a
+    new interpreter """
+    output = subprocess.check_output(
+        [sys.executable, '-c', TIMER % (directory, module)])
+    return float(output.split()[-1])
+
+
+def main():
+    """ Time the imports and print the fastest and median of each """
+    args = sys.argv[1:]
+    repeats = int(args.pop(0)) if args and args[0].isdigit() else 5
+    modules = args or MODULES
+
+    directory = tempfile.mkdtemp()
+    try:
+        copy_package(directory)
+        print '%-40s %10s %10s' % ('module', 'min ms', 'median ms')
+        for module in modules:
+            times = sorted(cold_import(directory, module)
+                           for _ in xrange(repeats))
+            print '%-40s %10.1f %10.1f' % (module, times[0] * 1000,
+                                           times[len(times) // 2] * 1000)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+# encoding: utf-8
+""" Reports how much memory the shapes and points of parsed designs take
+
+Usage: python test/bench_memory.py [FORMAT:FILE ...]
+
+With no arguments, every gerber, specctra, eaglexml and kicad file in the
+test corpus is parsed. The bytes per object count the instance and, for
+classes without __slots__, its __dict__ (but not the values they hold,
+which are shared between both layouts). """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from upconvert.upconverter import Upconverter
+from upconvert.core.shape import Shape, Point
+from upconvert.core.net import NetPoint
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CORPUS = [('gerber', '.ger'), ('specctra', '.dsn'), ('eaglexml', '.sch'),
+          ('kicad', '.sch')]
+
+
+def corpus():
+    """ Return [(format, file name)] of the corpus files to parse """
+    inputs = []
+    for frmt, ext in CORPUS:
+        for top, _, names in os.walk(os.path.join(TEST_DIR, frmt)):
+            for name in sorted(names):
+                if name.endswith(ext):
+                    inputs.append((frmt, os.path.join(top, name)))
+    return sorted(inputs)
+
+
+def shallow_size(obj):
+    """ Return the size of obj and of its __dict__, if it has one """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(root, totals):
+    """ Add the (count, bytes) of every shape, point and net point
+    reachable from root into totals, keyed by class name """
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (basestring, int, long, float)):
+            continue
+        seen.add(id(obj))
+
+        if isinstance(obj, dict):
+            stack.extend(obj.itervalues())
+            continue
+        if isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+            continue
+
+        if isinstance(obj, (Shape, Point, NetPoint)):
+            name = obj.__class__.__name__
+            count, size = totals.get(name, (0, 0))
+            totals[name] = (count + 1, size + shallow_size(obj))
+
+        if hasattr(obj, '__dict__'):
+            stack.extend(obj.__dict__.itervalues())
+        for cls in type(obj).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+
+
+def main():
+    """ Parse the inputs and print the bytes per object of each class """
+    logging.disable(logging.CRITICAL)
+    if len(sys.argv) > 1:
+        inputs = [arg.split(':', 1) for arg in sys.argv[1:]]
+    else:
+        inputs = corpus()
+
+    totals = {}
+    parsed = 0
+    for frmt, filename in inputs:
+        try:
+            design = Upconverter.parse(filename, frmt)
+        except Exception: # pylint: disable=W0703
+            continue
+        if design is not None:
+            measure(design, totals)
+            parsed += 1
+
+    print '%d of %d files parsed' % (parsed, len(inputs))
+    print '%-16s %10s %12s %8s' % ('class', 'objects', 'bytes', 'per obj')
+    for name, (count, size) in sorted(totals.iteritems()):
+        print '%-16s %10d %12d %8.1f' % (name, count, size, float(size) / count)
+    count = sum(count for count, _ in totals.itervalues())
+    size = sum(size for _, size in totals.itervalues())
+    if count:
+        print '%-16s %10d %12d %8.1f' % ('all', count, size, float(size) / count)
+
+
+if __name__ == '__main__':
+    main()
@@ -66,6 +66,11 @@ class Annotation:
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the annotation by an affine Matrix """
+        self.x, self.y = matrix.apply(self.x, self.y)
+
+
     def json(self):
         """ Return an annotation as JSON """
         anno_json =  {
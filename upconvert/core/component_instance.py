@@ -97,6 +97,12 @@ class ComponentInstance:
             attr.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the instance by an affine Matrix """
+        for attr in self.symbol_attributes:
+            attr.transform(matrix)
+
+
     def json(self):
         """ Return a component as JSON """
         json = {
@@ -159,6 +165,13 @@ class SymbolAttribute:
             anno.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the attributes by an affine Matrix """
+        self.x, self.y = matrix.apply(self.x, self.y)
+        for anno in self.annotations:
+            anno.transform(matrix)
+
+
     def json(self):
         """ Return the body as JSON """
 
@@ -189,6 +202,13 @@ class FootprintAttribute:
         self.layer = layer
 
 
+    def copy(self):
+        """ Return a copy of the attributes, to change without changing
+        the instance """
+        return FootprintAttribute(self.x, self.y, self.rotation,
+                                  self.flip_horizontal, self.layer)
+
+
     def scale(self, factor):
         """ Scale the x & y coordinates in the attributes. """
         self.x *= factor
@@ -281,6 +301,13 @@ class FootprintPos:
         self.side = side
 
 
+    def copy(self):
+        """ Return a copy of the position, to change without changing
+        the instance """
+        return FootprintPos(self.x, self.y, self.rotation,
+                            self.flip_horizontal, self.side)
+
+
     def scale(self, factor):
         """ Scale the x & y coordinates in the attributes. """
         self.x *= factor
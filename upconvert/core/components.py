@@ -20,7 +20,10 @@
 # limitations under the License.
 
 
-from upconvert.core.shape import Point
+from itertools import chain
+
+from upconvert.core.shape import Point, bounding_box, box_points, xy_of
+from upconvert.core.transform import transform
 from upconvert.utils.stringify import stringify_attributes
 
 
@@ -55,6 +58,12 @@ class Components:
             component.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the library components by an affine Matrix """
+        for component in self.components.values():
+            component.transform(matrix)
+
+
     def json(self):
         """ Copy to a new dictionary to return """
         ret = dict()
@@ -113,6 +122,12 @@ class Component:
             symbol.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the symbols by an affine Matrix """
+        for symbol in self.symbols:
+            symbol.transform(matrix)
+
+
     def json(self):
         """ Return a component as JSON """
         return {
@@ -155,6 +170,12 @@ class Symbol:
             body.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the bodies by an affine Matrix """
+        for body in self.bodies:
+            body.transform(matrix)
+
+
     def json(self):
         """ Return a symbol as JSON """
         return {"bodies":[b.json() for b in self.bodies]}
@@ -204,6 +225,14 @@ class Footprint:
             gen_obj.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the bodies and generated objects by an affine Matrix """
+        for body in self.bodies:
+            body.transform(matrix)
+        for gen_obj in self.gen_objs:
+            transform(gen_obj, matrix)
+
+
     def json(self):
         """ Return a footprint as JSON """
         return {"bodies":[b.json() for b in self.bodies],
@@ -213,6 +242,10 @@ class Footprint:
 class SBody:
     """ A body of a Symbol of a Component """
 
+    # bounding box, cached by bounds() until a method that adds or moves
+    # shapes or pins runs
+    _bounds = None
+
     def __init__(self):
         self.shapes = list()
         self.pins = list()
@@ -220,29 +253,35 @@ class SBody:
 
     def bounds(self):
         """ Return the min and max points of the bounding box around a body """
-        points = sum([s.bounds() for s in self.shapes + self.pins], [])
-        x_values = [pt.x for pt in points]
-        y_values = [pt.y for pt in points]
-        if len(x_values) == 0:
+        if self._bounds is None:
+            points = chain.from_iterable(
+                s.bounds() for s in chain(self.shapes, self.pins))
             # Empty body includes just the origin
-            x_values = [0]
-            y_values = [0]
-        return [Point(min(x_values), min(y_values)),
-                Point(max(x_values), max(y_values))]
+            self._bounds = bounding_box(xy_of(points)) or (0, 0, 0, 0)
+        return box_points(self._bounds)
+
+
+    def invalidate_bounds(self):
+        """ Drop the cached bounds. The methods of the body drop it
+        themselves; call this after moving its shapes or pins in place. """
+        self._bounds = None
 
 
     def add_pin(self, pin):
         """ Add a pin to a symbol """
         self.pins.append(pin)
+        self._bounds = None
 
 
     def add_shape(self, shape):
         """ Add a shape to a symbol """
         self.shapes.append(shape)
+        self._bounds = None
 
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the symbol. """
+        self._bounds = None
         for shape in self.shapes:
             shape.scale(factor)
         for pin in self.pins:
@@ -251,6 +290,7 @@ class SBody:
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the symbol. """
+        self._bounds = None
         for shape in self.shapes:
             shape.shift(dx, dy)
         for pin in self.pins:
@@ -259,12 +299,22 @@ class SBody:
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the symbol. """
+        self._bounds = None
         for shape in self.shapes:
             shape.rebase_y_axis(height)
         for pin in self.pins:
             pin.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the shapes and pins by an affine Matrix """
+        self._bounds = None
+        for shape in self.shapes:
+            shape.transform(matrix)
+        for pin in self.pins:
+            pin.transform(matrix)
+
+
     def json(self):
         """ Return a symbol as JSON """
         return {
@@ -276,6 +326,10 @@ class SBody:
 class FBody:
     """ A body of a footprint of a Component """
 
+    # bounding box, cached by bounds() until a method that adds or moves
+    # shapes runs
+    _bounds = None
+
     def __init__(self):
         self.shapes = list()
         self.layer = None
@@ -285,40 +339,53 @@ class FBody:
 
     def bounds(self):
         """ Return the min and max points of the bounding box around a body """
-        points = sum([s.bounds() for s in self.shapes], [])
-        x_values = [pt.x for pt in points]
-        y_values = [pt.y for pt in points]
-        if len(x_values) == 0:
+        if self._bounds is None:
+            points = chain.from_iterable(s.bounds() for s in self.shapes)
             # Empty body includes just the origin
-            x_values = [0]
-            y_values = [0]
-        return [Point(min(x_values), min(y_values)),
-                Point(max(x_values), max(y_values))]
+            self._bounds = bounding_box(xy_of(points)) or (0, 0, 0, 0)
+        return box_points(self._bounds)
+
+
+    def invalidate_bounds(self):
+        """ Drop the cached bounds. The methods of the body drop it
+        themselves; call this after moving its shapes in place. """
+        self._bounds = None
 
 
     def add_shape(self, shape):
         """ Add a shape to a footprint """
         self.shapes.append(shape)
+        self._bounds = None
 
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the footprint. """
+        self._bounds = None
         for shape in self.shapes:
             shape.scale(factor)
 
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the footprint. """
+        self._bounds = None
         for shape in self.shapes:
             shape.shift(dx, dy)
 
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the footprint. """
+        self._bounds = None
         for shape in self.shapes:
             shape.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the shapes by an affine Matrix """
+        self._bounds = None
+        for shape in self.shapes:
+            shape.transform(matrix)
+
+
     def json(self):
         """ Return a footprint as JSON """
         return {
@@ -330,6 +397,7 @@ class FBody:
 
 
     def rotate(self, rotation):
+        self._bounds = None
         self.rotation = (self.rotation + rotation) % 2
         for shape in self.shapes:
             shape.rotate(rotation)
@@ -389,6 +457,14 @@ class Pin:
         self.p2.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the pin by an affine Matrix """
+        if self.label is not None:
+            self.label.transform(matrix)
+        self.p1.transform(matrix)
+        self.p2.transform(matrix)
+
+
     def json(self):
         """ Return a pin as JSON """
         ret = {
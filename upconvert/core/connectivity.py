@@ -0,0 +1,225 @@
+#!/usr/bin/env python2
+""" Connectivity helpers for building nets out of wire segments """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from upconvert.core.net import Net
+from upconvert.core.spatial import GridIndex
+
+
+class DisjointSet:
+    """ A union-find forest over hashable items, with union by rank
+    and path halving, so a sequence of n operations costs O(n a(n)) """
+
+    def __init__(self):
+        self.parent = dict()
+        self.rank = dict()
+
+
+    def __contains__(self, item):
+        return item in self.parent
+
+
+    def add(self, item):
+        """ Add item as a singleton set, if it is not already known """
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+
+
+    def find(self, item):
+        """ Return the representative of the set containing item """
+        self.add(item)
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+
+    def union(self, item_a, item_b):
+        """ Merge the sets containing item_a and item_b, returning the
+        representative of the merged set """
+        root_a = self.find(item_a)
+        root_b = self.find(item_b)
+        if root_a == root_b:
+            return root_a
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        return root_a
+
+
+def build_nets(segments, pin_points=()):
+    """ Group wire segments into nets.
+
+    segments is an iterable of (NetPoint, NetPoint) pairs, where points
+    with the same coordinates are the same NetPoint object, and any
+    segments crossing a junction have already been divided at it. Each
+    segment is connected into exactly one net, so the connected points
+    of each NetPoint are the same as connecting the segments one at a
+    time.
+
+    pin_points are NetPoints that pins connect to. One that is not on a
+    segment still gets a net of its own when it joins several pins.
+
+    Returns the nets sorted by net_id, which is the smallest point_id
+    in each net. """
+
+    segments = list(segments)
+
+    forest = DisjointSet()
+    for point_a, point_b in segments:
+        forest.union(point_a, point_b)
+
+    root2net = dict()
+    for seg in segments:
+        root = forest.find(seg[0])
+        if root not in root2net:
+            root2net[root] = Net('')
+        root2net[root].connect(seg)
+
+    nets = root2net.values()
+
+    # add single-point nets for overlapping pins that are not
+    # already in other nets
+    for point in pin_points:
+        if point not in forest and len(point.connected_components) > 1:
+            net = Net('')
+            net.add_point(point)
+            nets.append(net)
+
+    for net in nets:
+        net.net_id = min(net.points)
+
+    nets.sort(key=lambda net : net.net_id)
+
+    return nets
+
+
+def find_interior_points(segments, points, coord=None):
+    """ Find the points lying strictly inside each segment, ie. on the
+    segment but not at either of its end points.
+
+    Horizontal and vertical segments are looked up in sorted buckets of
+    the points sharing their fixed coordinate, diagonal segments in a
+    GridIndex of the points, so the cost is close to linear rather than
+    segments x points.
+
+    segments is an iterable of (end point, end point) pairs, and coord
+    maps a point to its (x, y) coordinates (points are (x, y) tuples
+    themselves by default).
+
+    Returns a dict mapping each segment with interior points to a list
+    of them. """
+
+    if coord is None:
+        coord = lambda point: point
+
+    segments = list(segments)
+    located = [(coord(point), point) for point in points]
+
+    rows = _Buckets(((y, x), point) for (x, y), point in located)
+    cols = _Buckets(((x, y), point) for (x, y), point in located)
+    grid = None
+
+    found = dict()
+
+    for seg in segments:
+        (ax, ay), (bx, by) = coord(seg[0]), coord(seg[1])
+
+        if ax == bx:
+            inside = cols.between(ax, ay, by)
+        elif ay == by:
+            inside = rows.between(ay, ax, bx)
+        else:
+            if grid is None:
+                grid = _diagonal_grid(located, segments, coord)
+            inside = [point for (cx, cy), point in
+                      grid.within(min(ax, bx), min(ay, by),
+                                  max(ax, bx), max(ay, by))
+                      if (cx - ax) * (by - ay) == (bx - ax) * (cy - ay)
+                      and min(ax, bx) < cx < max(ax, bx)]
+
+        if inside:
+            found[seg] = inside
+
+    return found
+
+
+def split_segments(segments, points):
+    """ Divide each (x, y) coordinate segment at every point lying
+    strictly inside it, keeping the direction of the segment.
+
+    Returns the new set of segments. """
+
+    segments = set(segments)
+    interior = find_interior_points(segments, points)
+
+    for seg, inside in interior.iteritems():
+        (ax, ay), end = seg
+        inside.sort(key=lambda (x, y): abs(x - ax) + abs(y - ay))
+        chain = [seg[0]] + inside + [end]
+        segments.remove(seg)
+        segments.update(zip(chain, chain[1:]))
+
+    return segments
+
+
+class _Buckets:
+    """ Points grouped by one coordinate and sorted by the other """
+
+    def __init__(self, keyed_points):
+        buckets = defaultdict(list)
+        for key, point in keyed_points:
+            buckets[key[0]].append((key[1], point))
+
+        self.keys = dict()
+        self.points = dict()
+        for fixed, bucket in buckets.iteritems():
+            bucket.sort(key=lambda item: item[0])
+            self.keys[fixed] = [key for key, _ in bucket]
+            self.points[fixed] = [point for _, point in bucket]
+
+
+    def between(self, fixed, end_a, end_b):
+        """ Return the points at fixed strictly between end_a and end_b """
+        if fixed not in self.keys:
+            return []
+        low, high = min(end_a, end_b), max(end_a, end_b)
+        keys = self.keys[fixed]
+        return self.points[fixed][bisect_right(keys, low):bisect_left(keys, high)]
+
+
+def _diagonal_grid(located, segments, coord):
+    """ Return a GridIndex of the located points, with cells the size of
+    the mean extent of the diagonal segments """
+    extents = []
+    for seg in segments:
+        (ax, ay), (bx, by) = coord(seg[0]), coord(seg[1])
+        if ax != bx and ay != by:
+            extents.append(max(abs(bx - ax), abs(by - ay)))
+    return GridIndex(float(sum(extents)) / len(extents), located,
+                     box=lambda ((x, y), _): (x, y, x, y))
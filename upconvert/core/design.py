@@ -20,9 +20,11 @@
 # limitations under the License.
 
 
+from itertools import izip
+
 from upconvert.core.design_attributes import DesignAttributes
 from upconvert.core.components import Components
-from upconvert.core.shape import Point
+from upconvert.core.shape import bounding_box, box_points
 
 
 class Design:
@@ -30,6 +32,10 @@ class Design:
     the top level of the output format.  The internal structure of this
     class closely matches the JSON output."""
 
+    # bounding box, cached by bounds() until a method of the design that
+    # adds or moves nets, annotations or components runs
+    _bounds = None
+
     def __init__(self):
         self.nets = list()
         self.components = Components()
@@ -55,27 +61,43 @@ class Design:
 
     def bounds(self):
         """ Return the min and max point of a design """
-        bounds = [net.bounds() for net in self.nets]
-        bounds.extend([anno.bounds() for anno in self.design_attributes.annotations])
-        offset_bounds = lambda (p1, p2), (xo, yo): [Point(p1.x + xo, p1.y + yo),
-                                                    Point(p2.x + xo, p2.y + yo)]
+        if self._bounds is None:
+            # by convention, an empty design will bound just the origin
+            self._bounds = (bounding_box(self._bounding_coords())
+                            or (0, 0, 0, 0))
+        return box_points(self._bounds)
+
+
+    def invalidate_bounds(self):
+        """ Drop the cached bounds of the design and of its nets and
+        component bodies. The design's own methods drop them; call this
+        after moving anything in the design in place, or after adding to
+        its lists directly. """
+        self._bounds = None
+        for net in self.nets:
+            net.invalidate_bounds()
+        for lib_comp in self.components.components.itervalues():
+            for symbol in lib_comp.symbols:
+                for body in symbol.bodies:
+                    body.invalidate_bounds()
+
+
+    def _bounding_coords(self):
+        """ Generate the (x, y) of the bounds of everything in the design """
+        for net in self.nets:
+            for point in net.bounds():
+                yield point.x, point.y
+        for anno in self.design_attributes.annotations:
+            for point in anno.bounds():
+                yield point.x, point.y
         for comp in self.component_instances:
-            offsets = [(att.x, att.y) for att in comp.symbol_attributes]
             lib_comp = self.components.components[comp.library_id]
-            bodybounds = [b.bounds() for b in lib_comp.symbols[comp.symbol_index].bodies]
+            bodies = lib_comp.symbols[comp.symbol_index].bodies
             # the offsets in symbol_attributes will align and apply to the
             # library components bodies
-            bounds.extend([offset_bounds(b, o) for b, o in zip(bodybounds, offsets)])
-        # flatten out bounds to just a list of Points
-        bounds = sum(bounds, [])
-        x_values = [pt.x for pt in bounds]
-        y_values = [pt.y for pt in bounds]
-        # by convention, an empty design will bound just the origin
-        if len(x_values) == 0:
-            x_values = [0]
-            y_values = [0]
-        return [Point(min(x_values), min(y_values)),
-                Point(max(x_values), max(y_values))]
+            for body, att in izip(bodies, comp.symbol_attributes):
+                for point in body.bounds():
+                    yield point.x + att.x, point.y + att.y
 
 
     def set_version(self, file_version, exporter):
@@ -91,16 +113,19 @@ class Design:
     def add_component_instance(self, component_instance):
         """ Add an instance """
         self.component_instances.append(component_instance)
+        self._bounds = None
 
 
     def add_component(self, library_id, component):
         """ Add a library part """
         self.components.add_component(library_id, component)
+        self._bounds = None
 
 
     def add_net(self, net):
         """ Add a net """
         self.nets.append(net)
+        self._bounds = None
 
 
     def add_pin(self, pin):
@@ -116,10 +141,12 @@ class Design:
     def set_design_attributes(self, design_attributes):
         """ Add design level attributes """
         self.design_attributes = design_attributes
+        self._bounds = None
 
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the core. """
+        self._bounds = None
         for net in self.nets:
             net.scale(factor)
         self.components.scale(factor)
@@ -134,6 +161,7 @@ class Design:
 
     def shift(self, dx, dy):
         """ Shift the design dx to all x & dy to all y coordinates in the core. """
+        self._bounds = None
         for net in self.nets:
             net.shift(dx, dy)
         self.components.shift(dx, dy)
@@ -147,6 +175,7 @@ class Design:
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinates in the core. """
+        self._bounds = None
         for net in self.nets:
             net.rebase_y_axis(height)
         self.components.rebase_y_axis(height)
@@ -158,6 +187,28 @@ class Design:
             pin.rebase_y_axis(height)
 
 
+    def apply_transform(self, matrix):
+        """ Move the design by an affine Matrix (see core.transform) in one
+        pass, with the same result as the scale(), shift() and
+        rebase_y_axis() calls it was composed from. Like them, it only
+        scales the design attributes. """
+        factor = matrix.steps()[0]
+        if matrix.is_identity():
+            return
+        self._bounds = None
+        for net in self.nets:
+            net.transform(matrix)
+        self.components.transform(matrix)
+        for instance in self.component_instances:
+            instance.transform(matrix)
+        for shape in self.shapes:
+            shape.transform(matrix)
+        for pin in self.pins:
+            pin.transform(matrix)
+        if factor != 1:
+            self.design_attributes.scale(factor)
+
+
     def generate_netlist(self):
         """ The netlist as generated from the schematic. """
         pass
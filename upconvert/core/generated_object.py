@@ -22,6 +22,8 @@
 import logging
 
 from upconvert.core.shape import Circle, Point, Rectangle, RoundedRectangle
+from upconvert.core.shape import max_point_of, min_point_of, points_json, \
+    rebase_points, scale_points, shift_points, transform_points
 from upconvert.core.components import FBody
 from upconvert.core.component_instance import FootprintAttribute
 
@@ -310,24 +312,12 @@ class Path(object):
 
     def min_point(self):
         """ Return the min point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = min([pt.x for pt in self.points])
-            y = min([pt.y for pt in self.points])
-        return Point(x, y)
+        return min_point_of(self.points)
 
 
     def max_point(self):
         """ Return the max point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = max([pt.x for pt in self.points])
-            y = max([pt.y for pt in self.points])
-        return Point(x, y)
+        return max_point_of(self.points)
 
 
     def move(self, x, y):
@@ -347,26 +337,28 @@ class Path(object):
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the polygon. """
-        for point in self.points:
-            point.scale(factor)
+        scale_points(self.points, factor)
 
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the polygon. """
-        for point in self.points:
-            point.shift(dx, dy)
+        shift_points(self.points, dx, dy)
 
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the polygon. """
-        for point in self.points:
-            point.rebase_y_axis(height)
+        rebase_points(self.points, height)
+
+
+    def transform(self, matrix):
+        """ Move the path's points by an affine Matrix """
+        transform_points(self.points, matrix)
 
 
     def json(self):
         """ Return the polygon as JSON """
         return {
-            "points": [point.json() for point in self.points],
+            "points": points_json(self.points),
             "layer": self.layer,
             "width": self.width,
             "is_closed": self.is_closed,
@@ -386,24 +378,12 @@ class Pour(object):
 
     def min_point(self):
         """ Return the min point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = min([pt.x for pt in self.points])
-            y = min([pt.y for pt in self.points])
-        return Point(x, y)
+        return min_point_of(self.points)
 
 
     def max_point(self):
         """ Return the max point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = max([pt.x for pt in self.points])
-            y = max([pt.y for pt in self.points])
-        return Point(x, y)
+        return max_point_of(self.points)
 
 
     def move(self, x, y):
@@ -423,26 +403,28 @@ class Pour(object):
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the pour. """
-        for point in self.points:
-            point.scale(factor)
+        scale_points(self.points, factor)
 
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the pour. """
-        for point in self.points:
-            point.shift(dx, dy)
+        shift_points(self.points, dx, dy)
 
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the pour. """
-        for point in self.points:
-            point.rebase_y_axis(height)
+        rebase_points(self.points, height)
+
+
+    def transform(self, matrix):
+        """ Move the pour's points by an affine Matrix """
+        transform_points(self.points, matrix)
 
 
     def json(self):
         """ Return the polygon as JSON """
         return {
-            "points": [point.json() for point in self.points],
+            "points": points_json(self.points),
             "layer": self.layer,
             "subtractive_shapes": [subtractive_shape.json() for subtractive_shape in self.subtractive_shapes],
             "readded_shapes": [readded_shape.json() for readded_shape in self.readded_shapes],
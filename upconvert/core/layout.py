@@ -19,12 +19,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
-import freetype
 import logging
 import re
 
-from upconvert.core.shape import Circle, Label, Line, Point, Rectangle, RoundedRectangle
+from upconvert.core.shape import Circle, Label, Line, Point, Rectangle, RoundedRectangle, \
+    attributes_of
 
 log = logging.getLogger('core.layout')
 
@@ -101,11 +100,12 @@ class Image:
     def add_shape(self, shape, parent, parent_offset, offset):
         """ Add a shape to the image. (might be added as a smear or fill) """
         # Copy the shape so it can be mutated without affecting other instances
-        shapecpy = copy.deepcopy(shape)
+        shapecpy = shape.copy()
 
         # XXX(shamer): a label needs to be rendered before in-place rotations are made so the bounding box for the shape
         # are known
         if isinstance(shapecpy, Label):
+            import freetype # only needed to render labels, and slow to import
             self.face.set_char_size(int(shapecpy.font_size))
 
             label_contours = []
@@ -129,15 +129,15 @@ class Image:
                     points = [Point(t[0], t[1]) for t in outline.points[start:end+1]]
                     tags = outline.tags[start:end+1]
                     # Close the contour by repeating the last point.
-                    points.append(copy.deepcopy(points[0]))
-                    tags.append(copy.deepcopy(tags[0]))
+                    points.append(Point(points[0]))
+                    tags.append(tags[0])
 
                     segments = [[points[0], ], ]
                     # Group points into segments. The tag identifies real vs control points.
                     for point_idx in range(1, len(points) ):
                         segments[-1].append(points[point_idx])
                         if tags[point_idx] & (1 << 0) and point_idx < (len(points)-1):
-                            segments.append([copy.deepcopy(points[point_idx]),])
+                            segments.append([Point(points[point_idx]),])
 
                     # take the fist and last points of each segment (the non-control points). To approximate the curves
                     # using straight lines.
@@ -224,7 +224,7 @@ class Image:
                     instance_name += '-F'
 
                 # XXX(shamer): additional copy is made so the x, y can be reset for use as a ComplexInstance
-                shapecpycpy = copy.deepcopy(shapecpy)
+                shapecpycpy = shapecpy.copy()
                 shapecpycpy.x = 0
                 shapecpycpy.y = 0
                 shapecpycpy.is_centered = True
@@ -373,7 +373,7 @@ class Aperture:
         self.code = code
 
         #XXX(shamer): aperture doesn't include the offset/placement of the shape
-        shapecpy = copy.deepcopy(shape)
+        shapecpy = shape.copy()
         shapecpy.x = 0
         shapecpy.y = 0
 
@@ -386,10 +386,10 @@ class Aperture:
         if not isinstance(other, Aperture):
             return False
 
-        same_shape = self.shape.__dict__ == other.shape.__dict__
+        same_shape = attributes_of(self.shape) == attributes_of(other.shape)
         same_hole = (self.hole == other.hole or
                      (self.hole and other.hole and
-                      self.hole.__dict__ == other.hole.__dict__))
+                      attributes_of(self.hole) == attributes_of(other.hole)))
         return same_shape and same_hole
 
 
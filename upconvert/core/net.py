@@ -20,7 +20,9 @@
 # limitations under the License.
 
 
-from upconvert.core.shape import Point
+from itertools import chain
+
+from upconvert.core.shape import bounding_box, box_points, xy_of
 from upconvert.utils.stringify import stringify_attributes
 
 
@@ -28,6 +30,10 @@ class Net:
     """ a Net with metadata and a list of points (with connections)
     Internal representation of a net, closely matches JSON net """
 
+    # bounding box, cached by bounds() until a method that adds or moves
+    # points or annotations runs
+    _bounds = None
+
     def __init__(self, net_id):
         self.net_id = net_id
         self.points = dict()
@@ -37,19 +43,27 @@ class Net:
 
     def bounds(self):
         """ Return the min and max points of the bounding box """
-        x_values = [p.x for p in self.points.values()]
-        y_values = [p.y for p in self.points.values()]
-        # get a list of all the bounding points for annotations
-        bounds = sum([ann.bounds() for ann in self.annotations], [])
-        x_values.extend([pt.x for pt in bounds])
-        y_values.extend([pt.y for pt in bounds])
-        return [Point(min(x_values), min(y_values)),
-                Point(max(x_values), max(y_values))]
+        if self._bounds is None:
+            annotation_bounds = chain.from_iterable(
+                ann.bounds() for ann in self.annotations)
+            box = bounding_box(chain(xy_of(self.points.itervalues()),
+                                     xy_of(annotation_bounds)))
+            if box is None:
+                raise ValueError('net %s has no points' % self.net_id)
+            self._bounds = box
+        return box_points(self._bounds)
+
+
+    def invalidate_bounds(self):
+        """ Drop the cached bounds. The methods of the net drop it
+        themselves; call this after moving its points or annotations in place. """
+        self._bounds = None
 
 
     def add_annotation(self, annotation):
         """ Add an annotation """
         self.annotations.append(annotation)
+        self._bounds = None
 
 
     def add_attribute(self, key, value):
@@ -60,6 +74,7 @@ class Net:
     def add_point(self, point):
         """ Add a point p to the net """
         self.points[point.point_id] = point
+        self._bounds = None
 
 
     def conn_point(self, point_a, point_b):
@@ -86,6 +101,7 @@ class Net:
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the net. """
+        self._bounds = None
         for point in self.points.values():
             point.scale(factor)
         for anno in self.annotations:
@@ -94,6 +110,7 @@ class Net:
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the net. """
+        self._bounds = None
         for point in self.points.values():
             point.shift(dx, dy)
         for anno in self.annotations:
@@ -102,12 +119,22 @@ class Net:
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the net. """
+        self._bounds = None
         for point in self.points.values():
             point.rebase_y_axis(height)
         for anno in self.annotations:
             anno.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the net's points and annotations by an affine Matrix """
+        self._bounds = None
+        for point in self.points.values():
+            point.transform(matrix)
+        for anno in self.annotations:
+            anno.transform(matrix)
+
+
     def json(self):
         """ Return a net as JSON """
         return {
@@ -119,9 +146,11 @@ class Net:
             }
 
 
-class NetPoint:
+class NetPoint(object):
     """ A point, basic element in a net """
 
+    __slots__ = ('point_id', 'x', 'y', 'connected_points', 'connected_components')
+
     def __init__(self, point_id, x, y):
         self.point_id = point_id
         self.x = x
@@ -157,6 +186,11 @@ class NetPoint:
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the point by an affine Matrix """
+        self.x, self.y = matrix.apply(self.x, self.y)
+
+
     def json(self):
         """ Return a netpoint as JSON """
         return {
@@ -21,15 +21,48 @@
 
 
 import logging
+from array import array
+from itertools import izip
 from math import sqrt, pi, sin, cos, asin, acos
 
+from upconvert.core.transform import apply_steps
+
 log = logging.getLogger('core.shape')
 
+# marks a slot that has not been set, when copying shapes
+_UNSET = object()
+
+
+def attributes_of(obj):
+    """ Return a dict of the instance attributes of obj, the way
+    obj.__dict__ would if it had one. Shapes and points keep their
+    attributes in __slots__ instead, as large layouts have millions. """
+    attrs = dict(getattr(obj, '__dict__', ()))
+    for name in slot_names(type(obj)):
+        if hasattr(obj, name):
+            attrs[name] = getattr(obj, name)
+    return attrs
+
+
+_SLOT_NAMES = {}
+
+def slot_names(cls):
+    """ Return the names of the __slots__ of cls and of its bases """
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = tuple(name for klass in cls.__mro__
+                      for name in klass.__dict__.get('__slots__', ()))
+        _SLOT_NAMES[cls] = names
+    return names
+
 
 class Shape(object):
     """a Shape with metadata and a list of shape parts
     Internal representation of the shapes closely matches JSON shapes """
 
+    __slots__ = ('type', 'attributes', 'styles', 'rotation', 'flip_horizontal',
+                 'x', 'y')
+
     def __init__(self):
         self.type = None
         self.attributes = dict()
@@ -83,6 +116,45 @@ class Shape(object):
         self.y += dy
 
 
+    def transform(self, matrix):
+        """ Move the shape by an affine Matrix, through its scale(),
+        shift() and rebase_y_axis() """
+        apply_steps(self, matrix)
+
+
+    def copy(self):
+        """ Return a copy of the shape that can be moved, rotated or
+        resized without changing this one. It is much cheaper than
+        copy.deepcopy(): the fields are copied as they are, except the
+        attributes and styles, which get dicts of their own. Shapes that
+        hold Points copy them in their own copy(). """
+        cls = self.__class__
+        cpy = cls.__new__(cls)
+        for name in slot_names(cls):
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                setattr(cpy, name, value)
+        cpy.attributes = dict(self.attributes)
+        cpy.styles = dict(self.styles)
+        return cpy
+
+
+    def transformed(self, matrix):
+        """ Return a copy of the shape moved by an affine Matrix """
+        cpy = self.copy()
+        cpy.transform(matrix)
+        return cpy
+
+
+    def _move_anchor(self, matrix):
+        """ Move (x, y) by an affine Matrix, and return its scale factor
+        for the sizes the shape's transform() still has to scale """
+        factor = matrix.steps()[0]
+        self.x = matrix.a * self.x + matrix.c
+        self.y = matrix.e * self.y + matrix.f
+        return factor
+
+
     def bounds(self):
         """ Return the min and max points of the bounding box """
         return [self.min_point(), self.max_point()]
@@ -107,6 +179,8 @@ class Shape(object):
 class Rectangle(Shape):
     """ A rectangle, defined by x, y of top left corner and width, height"""
 
+    __slots__ = ('width', 'height', 'is_centered')
+
     def __init__(self, x, y, width, height, is_centered=False):
         super(Rectangle, self).__init__()
         self.type = "rectangle"
@@ -170,6 +244,13 @@ class Rectangle(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the rectangle by an affine Matrix """
+        factor = self._move_anchor(matrix)
+        self.width *= factor
+        self.height *= factor
+
+
     def json(self):
         """ Return the rectangle as JSON """
         return {
@@ -215,6 +296,8 @@ class RoundedRectangle(Shape):
     """ A rectangle with rounded corners, defined by x, y of top left corner
     and width, height and corner radius"""
 
+    __slots__ = ('width', 'height', 'radius')
+
     def __init__(self, x, y, width, height, radius): # pylint: disable=R0913
         super(RoundedRectangle, self).__init__()
         self.type = "rounded_rectangle"
@@ -292,6 +375,14 @@ class RoundedRectangle(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the rounded rectangle by an affine Matrix """
+        factor = self._move_anchor(matrix)
+        self.width *= factor
+        self.height *= factor
+        self.radius *= factor
+
+
     def json(self):
         """ Return the rounded rectangle as JSON """
         return {
@@ -336,6 +427,8 @@ class Arc(Shape):
     """ arc defined by center point x, y, two angles between which an
     arc is drawn, and a radius """
 
+    __slots__ = ('start_angle', 'end_angle', 'radius')
+
     def __init__(self, x, y, start_angle, end_angle, radius): # pylint: disable=R0913
         super(Arc, self).__init__()
         self.type = "arc"
@@ -435,6 +528,12 @@ class Arc(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the arc by an affine Matrix """
+        factor = self._move_anchor(matrix)
+        self.radius *= factor
+
+
     def json(self):
         """ Return the arc as JSON """
         return {
@@ -452,6 +551,8 @@ class Arc(Shape):
 class Circle(Shape):
     """ circle defined by center point x, y and radius """
 
+    __slots__ = ('radius',)
+
     def __init__(self, x, y, radius):
         super(Circle, self).__init__()
         self.type = "circle"
@@ -509,6 +610,12 @@ class Circle(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the circle by an affine Matrix """
+        factor = self._move_anchor(matrix)
+        self.radius *= factor
+
+
     def json(self):
         """ Return the circle as JSON """
         return {
@@ -527,8 +634,12 @@ class Circle(Shape):
 class Label(Shape):
     """ Text label with x, y location, alignment, rotation and text.
     Alignment can be 'left','right', or 'center'. """
+
     # pylint: disable=W0223
 
+    __slots__ = ('text', 'baseline', 'font_size', 'font_family', 'align',
+                 '_min_point', '_max_point', '_segments')
+
     def __init__(self, x, y, text, font_size=10, font_family='sans-serif', align='left', baseline='alphabetic', rotation=0.0, flip=False):
         super(Label, self).__init__()
         self.type = "label"
@@ -566,6 +677,19 @@ class Label(Shape):
                  self.baseline == other.baseline))
 
 
+    def copy(self):
+        """ Return a copy of the label, with copies of its rendered
+        segments and bounds """
+        cpy = super(Label, self).copy()
+        cpy._segments = [[Point(point) for point in segment]
+                         for segment in self._segments]
+        if self._min_point is not None:
+            cpy._min_point = Point(self._min_point)
+        if self._max_point is not None:
+            cpy._max_point = Point(self._max_point)
+        return cpy
+
+
     def min_point(self):
         """ As a hack, return the label's position. """
         return Point(self.x, self.y)
@@ -680,13 +804,15 @@ class Label(Shape):
 
 
     def __repr__(self):
-        return '<Label(x={x}, y={y}, text="{text}", font_size={font_size}, font_family="{font_family}", align="{align}", baseline="{baseline}", rotation={rotation})>'.format(**self.__dict__)
+        return '<Label(x={x}, y={y}, text="{text}", font_size={font_size}, font_family="{font_family}", align="{align}", baseline="{baseline}", rotation={rotation})>'.format(**attributes_of(self))
 
 
 
 class Line(Shape):
     """ line segment from point1 to point2 """
 
+    __slots__ = ('p1', 'p2')
+
     def __init__(self, p1, p2):
         super(Line, self).__init__()
         self.type = "line"
@@ -701,6 +827,14 @@ class Line(Shape):
                  self.p2 == other.p2))
 
 
+    def copy(self):
+        """ Return a copy of the line, with copies of its points """
+        cpy = super(Line, self).copy()
+        cpy.p1 = Point(self.p1)
+        cpy.p2 = Point(self.p2)
+        return cpy
+
+
     def min_point(self):
         """ Return the min point of the shape """
         x = self.p1.x
@@ -774,6 +908,12 @@ class Line(Shape):
         self.p2.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the line by an affine Matrix """
+        self.p1.transform(matrix)
+        self.p2.transform(matrix)
+
+
     def json(self):
         """ Return the line as JSON """
         return {
@@ -791,6 +931,8 @@ class Line(Shape):
 class Polygon(Shape):
     """ A polygon is just a list of points, drawn as connected in order """
 
+    __slots__ = ('points',)
+
     def __init__(self, points=None):
         super(Polygon, self).__init__()
         self.type = "polygon"
@@ -803,26 +945,21 @@ class Polygon(Shape):
                  self.points == other.points))
 
 
+    def copy(self):
+        """ Return a copy of the polygon, with a copy of its points """
+        cpy = super(Polygon, self).copy()
+        cpy.points = copy_points(self.points)
+        return cpy
+
+
     def min_point(self):
         """ Return the min point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = min([pt.x for pt in self.points])
-            y = min([pt.y for pt in self.points])
-        return Point(x, y)
+        return min_point_of(self.points)
 
 
     def max_point(self):
         """ Return the max point of the shape """
-        if len(self.points) < 1:
-            # by convention
-            x, y = 0, 0
-        else:
-            x = max([pt.x for pt in self.points])
-            y = max([pt.y for pt in self.points])
-        return Point(x, y)
+        return max_point_of(self.points)
 
 
     def move(self, x, y):
@@ -842,27 +979,29 @@ class Polygon(Shape):
 
     def scale(self, factor):
         """ Scale the x & y coordinates in the polygon. """
-        for point in self.points:
-            point.scale(factor)
+        scale_points(self.points, factor)
 
 
     def shift(self, dx, dy):
         """ Shift the x & y coordinates in the polygon. """
-        for point in self.points:
-            point.shift(dx, dy)
+        shift_points(self.points, dx, dy)
 
 
     def rebase_y_axis(self, height):
         """ Rebase the y coordinate in the polygon. """
-        for point in self.points:
-            point.rebase_y_axis(height)
+        rebase_points(self.points, height)
+
+
+    def transform(self, matrix):
+        """ Move the polygon's points by an affine Matrix """
+        transform_points(self.points, matrix)
 
 
     def json(self):
         """ Return the polygon as JSON """
         return {
             "type": self.type,
-            "points": [point.json() for point in self.points],
+            "points": points_json(self.points),
             #"attributes": stringify_attributes(self.attributes),
             "styles": self.styles,
             }
@@ -871,6 +1010,8 @@ class Polygon(Shape):
 class BezierCurve(Shape):
     """ A parametric curved line """
 
+    __slots__ = ('control1', 'control2', 'p1', 'p2', '_memo_cache')
+
     def __init__(self, control1, control2, p1, p2):
         super(BezierCurve, self).__init__()
         self.type = "bezier"
@@ -890,6 +1031,19 @@ class BezierCurve(Shape):
                  self.p2 == other.p2))
 
 
+    def copy(self):
+        """ Return a copy of the curve, with copies of its points """
+        cpy = super(BezierCurve, self).copy()
+        cpy.control1 = Point(self.control1)
+        cpy.control2 = Point(self.control2)
+        cpy.p1 = Point(self.p1)
+        cpy.p2 = Point(self.p2)
+        # the memos are keyed on the points, so they hold for the copy too
+        cpy._memo_cache = dict((key, dict(memo)) for key, memo
+                               in self._memo_cache.iteritems())
+        return cpy
+
+
     def _line(self):
         """ Convert the curve into a set of points. """
         segments = [(self.p1, self.control1),
@@ -990,6 +1144,14 @@ class BezierCurve(Shape):
         self.p2.rebase_y_axis(height)
 
 
+    def transform(self, matrix):
+        """ Move the curve by an affine Matrix """
+        self.control1.transform(matrix)
+        self.control2.transform(matrix)
+        self.p1.transform(matrix)
+        self.p2.transform(matrix)
+
+
     def json(self):
         """ Return the bezier curve as JSON """
         return {
@@ -1012,6 +1174,9 @@ class Moire(Shape):
     positive.
 
     """
+
+    __slots__ = ('outer_diameter', 'ring_thickness', 'gap_thickness', 'max_rings',
+                 'hair_thickness', 'hair_length')
     def __init__(self, x, y, outer, ring_thickness, gap, max_rings, # pylint: disable=R0913
                  hair_thickness, hair_length, rotation):
         super(Moire, self).__init__()
@@ -1071,6 +1236,11 @@ class Moire(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the moire by an affine Matrix """
+        self._move_anchor(matrix)
+
+
     def json(self):
         """ Return the moire as JSON """
         return {
@@ -1096,6 +1266,8 @@ class Thermal(Shape):
     Rotation is in rad/pi, clockwise positive.
 
     """
+
+    __slots__ = ('outer_diameter', 'inner_diameter', 'gap_thickness')
     def __init__(self, x, y, outer, inner, gap, rotation=0): # pylint: disable=R0913
         super(Thermal, self).__init__()
         self.type = "thermal"
@@ -1159,6 +1331,11 @@ class Thermal(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the thermal by an affine Matrix """
+        self._move_anchor(matrix)
+
+
     def json(self):
         """ Return the thermal as JSON """
         return {
@@ -1181,6 +1358,8 @@ class RegularPolygon(Shape):
     Rotation is in rad/pi, clockwise positive.
 
     """
+
+    __slots__ = ('outer_diameter', 'vertices')
     def __init__(self, x, y, outer, vertices, rotation=0): # pylint: disable=R0913
         super(RegularPolygon, self).__init__()
         self.type = "regular polygon"
@@ -1267,9 +1446,11 @@ class RegularPolygon(Shape):
             }
 
 
-class Point:
+class Point(object):
     """ Simple x, y coordinate. Different from the 'Point' in Nets """
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y=None):
         if y is not None:
             self.x = x
@@ -1303,7 +1484,7 @@ class Point:
                      round(self.x, precision) == round(other.x, precision) and
                      round(self.y, precision) == round(other.y, precision))
         else:
-            equal = self.__dict__ == other.__dict__
+            equal = attributes_of(self) == attributes_of(other)
         return equal
 
 
@@ -1365,6 +1546,11 @@ class Point:
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the point by an affine Matrix """
+        self.x, self.y = matrix.apply(self.x, self.y)
+
+
     def json(self):
         """ Return the point as JSON """
         return {
@@ -1373,9 +1559,296 @@ class Point:
             }
 
 
+class PointView(Point):
+    """ A Point whose x and y are kept in a PointArray, at a position in
+    it. Reading or setting x and y reads or sets the array, so code
+    written for lists of Points works on a PointArray unchanged. """
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index): # pylint: disable=W0231
+        self.store = store
+        self.index = index
+
+    def __reduce__(self):
+        return PointView, (self.store, self.index)
+
+    def _get_x(self):
+        return self.store.xs[self.index]
+
+    def _set_x(self, value):
+        self.store.set(self.index, value, self.y)
+
+    def _get_y(self):
+        return self.store.ys[self.index]
+
+    def _set_y(self, value):
+        self.store.set(self.index, self.x, value)
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+
+
+class PointArray(object):
+    """ The points of an outline kept as two columns of numbers, instead
+    of a list of Point objects, for outlines with many thousands of
+    points (pours, paths). It behaves as a list of Points: indexing and
+    iterating give PointViews onto the columns, and Points (or (x, y)
+    pairs) can be appended. Transforms and bounds run over whole columns
+    at once.
+
+    A column is an array('l') while all its values are ints, and an
+    array('d') once any is a float, so values keep the types they would
+    have in Points. """
+
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, points=()):
+        xs, ys = [], []
+        for point in points:
+            if isinstance(point, Point):
+                xs.append(point.x)
+                ys.append(point.y)
+            else:
+                xs.append(point[0])
+                ys.append(point[1])
+        self.xs = _column(xs)
+        self.ys = _column(ys)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [PointView(self, i) for i in xrange(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('point index out of range')
+        return PointView(self, index)
+
+    def __setitem__(self, index, point):
+        self.set(index, point.x, point.y)
+
+    def __delitem__(self, index):
+        del self.xs[index]
+        del self.ys[index]
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield PointView(self, index)
+
+    def __eq__(self, other):
+        return (len(self) == len(other) and
+                all(mine == theirs for mine, theirs in izip(self, other)))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'PointArray(%r)' % zip(self.xs, self.ys)
+
+    def copy(self):
+        """ Return a PointArray with copies of the columns """
+        cpy = PointArray()
+        cpy.xs = self.xs[:]
+        cpy.ys = self.ys[:]
+        return cpy
+
+    def set(self, index, x, y):
+        """ Set the point at index to (x, y) """
+        self.xs = _fits(self.xs, x)
+        self.ys = _fits(self.ys, y)
+        self.xs[index] = x
+        self.ys[index] = y
+
+    def append(self, point):
+        """ Add a Point to the end """
+        self.xs = _fits(self.xs, point.x)
+        self.ys = _fits(self.ys, point.y)
+        self.xs.append(point.x)
+        self.ys.append(point.y)
+
+    def extend(self, points):
+        """ Add Points to the end """
+        for point in points:
+            self.append(point)
+
+    def scale(self, factor):
+        """ Scale the x & y coordinates of every point """
+        self.xs = _column([x * factor for x in self.xs], self.xs, factor)
+        self.ys = _column([y * factor for y in self.ys], self.ys, factor)
+
+    def shift(self, dx, dy):
+        """ Shift the x & y coordinates of every point """
+        self.xs = _column([x + dx for x in self.xs], self.xs, dx)
+        self.ys = _column([y + dy for y in self.ys], self.ys, dy)
+
+    def rebase_y_axis(self, height):
+        """ Rebase the y coordinate of every point """
+        self.ys = _column([height - y for y in self.ys], self.ys, height)
+
+    def transform(self, matrix):
+        """ Move every point by an affine Matrix, a column at a time """
+        a, b, c, d, e, f = matrix.row()
+        xs, ys = self.xs, self.ys
+        if b == 0 and d == 0:
+            self.xs = _column([a * x + c for x in xs], xs, a, c)
+            self.ys = _column([e * y + f for y in ys], ys, e, f)
+        else:
+            # each new column is made from both old ones
+            both = ys if xs.typecode == 'l' else xs
+            self.xs = _column([a * x + b * y + c for x, y in izip(xs, ys)],
+                              both, a, b, c)
+            self.ys = _column([d * x + e * y + f for x, y in izip(xs, ys)],
+                              both, d, e, f)
+
+    def min_point(self):
+        """ Return the min x & y of the points """
+        return Point(min(self.xs), min(self.ys))
+
+    def max_point(self):
+        """ Return the max x & y of the points """
+        return Point(max(self.xs), max(self.ys))
+
+    def json(self):
+        """ Return the points as JSON """
+        return [{"x": int(x), "y": int(y)} for x, y in izip(self.xs, self.ys)]
+
+
+def _column(values, column=None, *operands):
+    """ Return an array of a list of values: of ints if they all are
+    ints (or, if they were made from an existing column and operands,
+    if those all are), otherwise of floats """
+    if column is not None:
+        is_int = column.typecode == 'l' and all(
+            type(operand) in (int, long) for operand in operands)
+    else:
+        is_int = all(type(value) in (int, long) for value in values)
+    if is_int:
+        try:
+            return array('l', values)
+        except OverflowError:
+            pass
+    return array('d', values)
+
+
+def _fits(column, value):
+    """ Return column, or a float copy of it if value does not fit in it """
+    if column.typecode == 'l' and type(value) not in (int, long):
+        return array('d', column)
+    return column
+
+
+def scale_points(points, factor):
+    """ Scale the x & y coordinates of a list of points or a PointArray """
+    if isinstance(points, PointArray):
+        points.scale(factor)
+    else:
+        for point in points:
+            point.scale(factor)
+
+
+def shift_points(points, dx, dy):
+    """ Shift the x & y coordinates of a list of points or a PointArray """
+    if isinstance(points, PointArray):
+        points.shift(dx, dy)
+    else:
+        for point in points:
+            point.shift(dx, dy)
+
+
+def rebase_points(points, height):
+    """ Rebase the y coordinate of a list of points or a PointArray """
+    if isinstance(points, PointArray):
+        points.rebase_y_axis(height)
+    else:
+        for point in points:
+            point.rebase_y_axis(height)
+
+
+def transform_points(points, matrix):
+    """ Move a list of points or a PointArray by an affine Matrix """
+    if isinstance(points, PointArray):
+        points.transform(matrix)
+    else:
+        for point in points:
+            point.transform(matrix)
+
+
+def copy_points(points):
+    """ Return a copy of a list of Points or of a PointArray """
+    if isinstance(points, PointArray):
+        return points.copy()
+    return [Point(point) for point in points]
+
+
+def min_point_of(points):
+    """ Return the min point of a list of points or a PointArray """
+    if len(points) < 1:
+        # by convention
+        return Point(0, 0)
+    if isinstance(points, PointArray):
+        return points.min_point()
+    return Point(min([pt.x for pt in points]), min([pt.y for pt in points]))
+
+
+def max_point_of(points):
+    """ Return the max point of a list of points or a PointArray """
+    if len(points) < 1:
+        # by convention
+        return Point(0, 0)
+    if isinstance(points, PointArray):
+        return points.max_point()
+    return Point(max([pt.x for pt in points]), max([pt.y for pt in points]))
+
+
+def bounding_box(coords):
+    """ Return (min x, min y, max x, max y) of an iterable of (x, y)
+    pairs, in one pass without building lists, or None if it is empty.
+    Like min() and max(), the first of equal values is kept. """
+    coords = iter(coords)
+    for min_x, min_y in coords:
+        max_x, max_y = min_x, min_y
+        break
+    else:
+        return None
+    for x, y in coords:
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    return (min_x, min_y, max_x, max_y)
+
+
+def box_points(box):
+    """ Return a bounding_box() as [min point, max point] """
+    min_x, min_y, max_x, max_y = box
+    return [Point(min_x, min_y), Point(max_x, max_y)]
+
+
+def xy_of(points):
+    """ Generate the (x, y) of each of an iterable of points """
+    for point in points:
+        yield point.x, point.y
+
+
+def points_json(points):
+    """ Return a list of points or a PointArray as JSON """
+    if isinstance(points, PointArray):
+        return points.json()
+    return [point.json() for point in points]
+
+
 class Obround(Shape):
     """ An oval, defined by x, y at center and width, height"""
 
+    __slots__ = ('width', 'height')
+
     def __init__(self, x, y, width, height):
         super(Obround, self).__init__()
         self.type = "obround"
@@ -1425,6 +1898,13 @@ class Obround(Shape):
         self.y = height - self.y
 
 
+    def transform(self, matrix):
+        """ Move the obround by an affine Matrix """
+        factor = self._move_anchor(matrix)
+        self.width *= factor
+        self.height *= factor
+
+
     def json(self):
         """ Return the oval as JSON """
         return {
@@ -1441,6 +1921,8 @@ class Obround(Shape):
 class RoundedSegment(Shape):
     """ A segment with rounded ends. """
 
+    __slots__ = ('p1', 'p2', 'width')
+
     def __init__(self, p1, p2, width):
         super(RoundedSegment, self).__init__()
         self.type = "rounded_segment"
@@ -1456,6 +1938,14 @@ class RoundedSegment(Shape):
                  self.p2 == other.p2))
 
 
+    def copy(self):
+        """ Return a copy of the segment, with copies of its points """
+        cpy = super(RoundedSegment, self).copy()
+        cpy.p1 = Point(self.p1)
+        cpy.p2 = Point(self.p2)
+        return cpy
+
+
     def min_point(self):
         """ Return the min point of the shape """
         raise NotImplemented('RoundedSegment.min_point() not implemented')
@@ -1498,6 +1988,15 @@ class RoundedSegment(Shape):
         self.p2.y = height - self.p2.y
 
 
+    def transform(self, matrix):
+        """ Move the rounded segment by an affine Matrix """
+        factor = matrix.steps()[0]
+        self.p1.transform(matrix)
+        self.p2.transform(matrix)
+        if factor != 1:
+            self.width *= factor
+
+
     def json(self):
         """ Return the rounded segment as JSON """
         return {
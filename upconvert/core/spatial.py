@@ -0,0 +1,163 @@
+#!/usr/bin/env python2
+""" A uniform grid index for "what is at or near this point" queries """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import defaultdict
+from math import floor, hypot
+
+
+def point_box(point):
+    """ Return the box of anything with an x & y, eg. a NetPoint or Point """
+    return (point.x, point.y, point.x, point.y)
+
+
+def segment_box(segment):
+    """ Return the box of a pair of points with an x & y each """
+    point_a, point_b = segment
+    return (min(point_a.x, point_b.x), min(point_a.y, point_b.y),
+            max(point_a.x, point_b.x), max(point_a.y, point_b.y))
+
+
+def shape_box(shape):
+    """ Return the box of a shape, from its min and max points """
+    min_pt, max_pt = shape.min_point(), shape.max_point()
+    return (min_pt.x, min_pt.y, max_pt.x, max_pt.y)
+
+
+class GridIndex:
+    """ A uniform grid hash of items by their (min_x, min_y, max_x, max_y)
+    bounding boxes. Each item is filed in every cell its box covers, so a
+    query only looks at the items in the cells it covers itself.
+
+    The cell size should be about the size of the typical query (or item),
+    eg. the mean length of the segments to be looked up.
+
+    box maps an item to its bounding box; point_box(), segment_box() and
+    shape_box() cover NetPoints, pairs of points and shapes. By default
+    items are (x, y) tuples. """
+
+    def __init__(self, size, items=(), box=None):
+        if not size > 0:
+            raise ValueError('grid cell size must be positive, not %r' % (size,))
+        self.size = float(size)
+        self.box = box or (lambda (x, y): (x, y, x, y))
+        self.cells = defaultdict(list)
+        self.count = 0
+        for item in items:
+            self.insert(item)
+
+
+    def __len__(self):
+        return self.count
+
+
+    def cell(self, x, y):
+        """ Return the cell holding the point at x, y """
+        return int(floor(x / self.size)), int(floor(y / self.size))
+
+
+    def insert(self, item, box=None):
+        """ Add item to the index, under box if given or else its own """
+        if box is None:
+            box = self.box(item)
+        low_x, low_y = self.cell(box[0], box[1])
+        high_x, high_y = self.cell(box[2], box[3])
+        entry = (box, item)
+        for cell_x in xrange(low_x, high_x + 1):
+            for cell_y in xrange(low_y, high_y + 1):
+                self.cells[cell_x, cell_y].append(entry)
+        self.count += 1
+
+
+    def near(self, min_x, min_y, max_x, max_y):
+        """ Return the (box, item) entries filed in the cells covered by
+        the range, whether or not their boxes meet it. Entries come out
+        once each, cell by cell, in the order they were inserted. """
+        low_x, low_y = self.cell(min_x, min_y)
+        high_x, high_y = self.cell(max_x, max_y)
+        cells = self.cells
+        near = []
+        seen = set()
+        for cell_x in xrange(low_x, high_x + 1):
+            for cell_y in xrange(low_y, high_y + 1):
+                for entry in cells.get((cell_x, cell_y), ()):
+                    if id(entry) not in seen:
+                        seen.add(id(entry))
+                        near.append(entry)
+        return near
+
+
+    def within(self, min_x, min_y, max_x, max_y):
+        """ Return the items whose boxes meet the range, edges included """
+        return [item for box, item in self.near(min_x, min_y, max_x, max_y)
+                if box[0] <= max_x and min_x <= box[2]
+                and box[1] <= max_y and min_y <= box[3]]
+
+
+    def at(self, x, y):
+        """ Return the items whose boxes hold the point at x, y """
+        return self.within(x, y, x, y)
+
+
+    def nearest(self, x, y):
+        """ Return the item whose box is closest to the point at x, y, or
+        None if the index is empty. Rings of cells are searched outwards
+        from the point until no unsearched cell can hold anything closer,
+        or until a ring would cost more than checking every cell. """
+        cell_x, cell_y = self.cell(x, y)
+        best, best_dist = None, None
+        ring = 0
+        while (2 * ring + 1) ** 2 <= len(self.cells):
+            for key in _ring(cell_x, cell_y, ring):
+                for box, item in self.cells.get(key, ()):
+                    dist = _distance(box, x, y)
+                    if best_dist is None or dist < best_dist:
+                        best, best_dist = item, dist
+            # anything in a further ring is at least ring cells away
+            if best_dist is not None and best_dist <= ring * self.size:
+                return best
+            ring += 1
+
+        for entries in self.cells.itervalues():
+            for box, item in entries:
+                dist = _distance(box, x, y)
+                if best_dist is None or dist < best_dist:
+                    best, best_dist = item, dist
+        return best
+
+
+def _distance(box, x, y):
+    """ Return the distance from the point at x, y to a box """
+    return hypot(max(box[0] - x, 0, x - box[2]),
+                 max(box[1] - y, 0, y - box[3]))
+
+
+def _ring(cell_x, cell_y, ring):
+    """ Generate the cells at chebyshev distance ring from a cell """
+    if ring == 0:
+        yield cell_x, cell_y
+        return
+    for offset in xrange(-ring, ring + 1):
+        yield cell_x + offset, cell_y - ring
+        yield cell_x + offset, cell_y + ring
+    for offset in xrange(-ring + 1, ring):
+        yield cell_x - ring, cell_y + offset
+        yield cell_x + ring, cell_y + offset
@@ -33,10 +33,16 @@ import unittest
 
 def mkbounds(obj, left, top, right, bot):
     """ Helper function for testing bounds. """
-    def newbounds():
+    def newbounds(*_):
         """ Function that gets returned"""
         return [Point(left, top), Point(right, bot)]
-    obj.bounds = newbounds
+    if hasattr(obj, '__dict__'):
+        obj.bounds = newbounds
+    else:
+        # shapes have __slots__, so override bounds in a subclass instead
+        cls = type(obj)
+        obj.__class__ = type(cls.__name__, (cls,),
+                             {'__slots__': (), 'bounds': newbounds})
 
 
 class ComponentsTests(unittest.TestCase):
@@ -168,6 +174,21 @@ class SBodyTests(unittest.TestCase):
         self.assertEqual(bottom_right.x, 5)
         self.assertEqual(bottom_right.y, 4)
 
+    def test_bounds_cache(self):
+        '''Test that SBody.bounds() is cached until the body changes'''
+        pin = Pin('foo', Point(0, 0), Point(2, 1))
+        self.bod.add_pin(pin)
+        self.assertEqual(self.bod.bounds(), [Point(0, 0), Point(2, 1)])
+
+        pin.p2.x = 7
+        self.assertEqual(self.bod.bounds(), [Point(0, 0), Point(2, 1)])
+        self.bod.invalidate_bounds()
+        self.assertEqual(self.bod.bounds(), [Point(0, 0), Point(7, 1)])
+        self.bod.shift(1, 1)
+        self.assertEqual(self.bod.bounds(), [Point(1, 1), Point(8, 2)])
+        self.bod.add_pin(Pin('bar', Point(-3, 0), Point(0, 0)))
+        self.assertEqual(self.bod.bounds(), [Point(-3, 0), Point(8, 2)])
+
 
 class PinTests(unittest.TestCase):
     """ The tests of the core module pin feature """
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The connectivity test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.core.connectivity import DisjointSet, build_nets, \
+    find_interior_points, split_segments
+from upconvert.core.net import NetPoint, ConnectedComponent
+import unittest
+
+
+def make_point(x, y):
+    """ Make a NetPoint named the way the parsers name them """
+    return NetPoint('%da%d' % (x, y), x, y)
+
+
+class DisjointSetTests(unittest.TestCase):
+    """ The tests of the core module disjoint set feature """
+
+    def test_union_find(self):
+        """ Unioned items share a representative, others do not. """
+        forest = DisjointSet()
+        forest.union(1, 2)
+        forest.union(3, 4)
+        forest.union(2, 4)
+        forest.add(5)
+        self.assertTrue(forest.find(1) is forest.find(3))
+        self.assertTrue(forest.find(5) is not forest.find(1))
+        self.assertTrue(5 in forest)
+        self.assertFalse(6 in forest)
+
+
+class BuildNetsTests(unittest.TestCase):
+    """ The tests of the core module build nets feature """
+
+    def test_build_nets(self):
+        """ Segments sharing points end up in the same net. """
+        pts = dict((xy, make_point(*xy)) for xy in
+                   [(0, 0), (0, 10), (10, 10), (50, 50), (50, 60)])
+        segments = [(pts[0, 0], pts[0, 10]),
+                    (pts[50, 50], pts[50, 60]),
+                    (pts[10, 10], pts[0, 10])]
+
+        nets = build_nets(segments)
+
+        self.assertEqual([net.net_id for net in nets], ['0a0', '50a50'])
+        self.assertEqual(sorted(nets[0].points), ['0a0', '0a10', '10a10'])
+        self.assertEqual(sorted(nets[0].points['0a10'].connected_points),
+                         ['0a0', '10a10'])
+        self.assertEqual(sorted(nets[1].points), ['50a50', '50a60'])
+
+    def test_single_point_nets(self):
+        """ Pins overlapping off a wire get a net of their own. """
+        wired = make_point(0, 0)
+        lone = make_point(20, 20)
+        overlap = make_point(30, 30)
+        for point in (wired, lone, overlap, overlap):
+            point.add_connected_component(ConnectedComponent('U1', '1'))
+
+        nets = build_nets([(wired, make_point(0, 10))],
+                          [wired, lone, overlap])
+
+        self.assertEqual([net.net_id for net in nets], ['0a0', '30a30'])
+        self.assertEqual(nets[1].points.keys(), ['30a30'])
+
+
+class SegmentSplittingTests(unittest.TestCase):
+    """ The tests of the core module segment splitting feature """
+
+    def test_find_interior_points(self):
+        """ Only points strictly inside a segment are found. """
+        horizontal = ((0, 0), (10, 0))
+        vertical = ((5, 10), (5, -10))
+        diagonal = ((0, 0), (10, 10))
+        points = [(0, 0), (5, 0), (10, 0), (5, 5), (5, 20), (7, 3)]
+
+        found = find_interior_points([horizontal, vertical, diagonal], points)
+
+        self.assertEqual(sorted(found), sorted([horizontal, vertical, diagonal]))
+        self.assertEqual(found[horizontal], [(5, 0)])
+        self.assertEqual(sorted(found[vertical]), [(5, 0), (5, 5)])
+        self.assertEqual(found[diagonal], [(5, 5)])
+
+    def test_find_interior_net_points(self):
+        """ Points can be mapped to coordinates. """
+        pt_a, pt_b, pt_c = make_point(0, 0), make_point(0, 10), make_point(0, 5)
+
+        found = find_interior_points([(pt_a, pt_b)], [pt_a, pt_b, pt_c],
+                                     coord=lambda point: (point.x, point.y))
+
+        self.assertEqual(found, {(pt_a, pt_b): [pt_c]})
+
+    def test_split_segments(self):
+        """ Segments are divided into a chain at their interior points. """
+        segments = split_segments([((10, 0), (0, 0)), ((0, 5), (0, 9))],
+                                  [(2, 0), (7, 0), (0, 9)])
+
+        self.assertEqual(segments, set([((10, 0), (7, 0)), ((7, 0), (2, 0)),
+                                        ((2, 0), (0, 0)), ((0, 5), (0, 9))]))
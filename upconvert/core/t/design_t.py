@@ -23,11 +23,12 @@
 
 
 from upconvert.core.design import Design
-from upconvert.core.net import Net
-from upconvert.core.shape import Point
+from upconvert.core.net import Net, NetPoint
+from upconvert.core.shape import Point, PointArray, Polygon, Rectangle, Line
 from upconvert.core.annotation import Annotation
-from upconvert.core.components import Component, Symbol, SBody
+from upconvert.core.components import Component, Symbol, SBody, Pin
 from upconvert.core.component_instance import ComponentInstance, SymbolAttribute
+from upconvert.core.transform import Matrix
 import unittest
 
 
@@ -156,3 +157,80 @@ class DesignTests(unittest.TestCase):
         self.assertEqual(top_left.y, -2)
         self.assertEqual(btm_right.x, 6)
         self.assertEqual(btm_right.y, 5)
+
+    def test_bounds_cache(self):
+        """ bounds() is cached until the design adds or moves parts """
+        net = Net('foo')
+        net.add_point(NetPoint('a', 1, 2))
+        net.add_point(NetPoint('b', 3, 4))
+        self.des.add_net(net)
+        self.assertEqual(self.des.bounds(), [Point(1, 2), Point(3, 4)])
+
+        # children moved in place are only seen after invalidate_bounds()
+        net.shift(10, 10)
+        net.points['b'].x = 50
+        self.assertEqual(self.des.bounds(), [Point(1, 2), Point(3, 4)])
+        self.des.invalidate_bounds()
+        self.assertEqual(self.des.bounds(), [Point(11, 12), Point(50, 14)])
+
+        # the design's own methods drop it
+        self.des.shift(-10, -10)
+        self.assertEqual(self.des.bounds(), [Point(1, 2), Point(40, 4)])
+        other = Net('bar')
+        other.add_point(NetPoint('c', -1, 0))
+        self.des.add_net(other)
+        self.assertEqual(self.des.bounds(), [Point(-1, 0), Point(40, 4)])
+
+        # the points returned are the caller's to change
+        self.des.bounds()[0].x = 100
+        self.assertEqual(self.des.bounds()[0].x, -1)
+
+    def mkdesign(self):
+        """ Fill the design with a bit of everything that moves """
+        net = Net('n')
+        net.add_point(NetPoint('a', 1, 2))
+        net.add_point(NetPoint('b', 5, -3))
+        net.add_annotation(Annotation('net', 2, 2, 0, True))
+        self.des.add_net(net)
+
+        body = SBody()
+        body.add_shape(Rectangle(1, 1, 4, 2))
+        body.add_shape(Polygon(PointArray([(0, 0), (3, 0), (3, 4)])))
+        body.add_pin(Pin('1', Point(0, 0), Point(0, 5)))
+        libcomp = Component('bar')
+        libcomp.add_symbol(Symbol())
+        libcomp.symbols[0].add_body(body)
+        self.des.add_component('foo', libcomp)
+
+        attr = SymbolAttribute(7, 8, 0)
+        attr.add_annotation(Annotation('ref', 7, 9, 0, True))
+        compinst = ComponentInstance('U1', libcomp, 'foo', 0)
+        compinst.add_symbol_attribute(attr)
+        self.des.add_component_instance(compinst)
+
+        self.des.add_shape(Line(Point(-1, -1), Point(2, 3)))
+        self.des.design_attributes.add_annotation(Annotation('d', 4, 4, 0, True))
+
+    def test_apply_transform(self):
+        """ apply_transform moves the design like the calls it was made of """
+        self.mkdesign()
+        expected = Design()
+        self.des, expected = expected, self.des
+        self.mkdesign()
+        expected.scale(3)
+        expected.shift(2, -5)
+        expected.rebase_y_axis(100)
+        expected.shift(0, 7)
+
+        self.des.apply_transform(
+            Matrix().scale(3).shift(2, -5).rebase_y_axis(100).shift(0, 7))
+        self.assertEqual(self.des.json(), expected.json())
+        self.assertEqual(self.des.nets[0].points['b'].x, 17)
+        self.assertEqual(self.des.nets[0].points['b'].y, 121)
+
+    def test_apply_transform_rotation(self):
+        """ apply_transform refuses matrices the core cannot follow """
+        self.mkdesign()
+        self.assertRaises(ValueError, self.des.apply_transform,
+                          Matrix(0, -1, 0, 1, 0, 0))
+        self.assertEqual(self.des.nets[0].points['a'].x, 1)
@@ -25,6 +25,7 @@
 from upconvert.core.net import Net
 from upconvert.core.net import NetPoint
 from upconvert.core.net import ConnectedComponent
+from upconvert.core.shape import Point
 import unittest
 
 
@@ -56,6 +57,25 @@ class NetTests(unittest.TestCase):
         self.assertEqual(btm_right.x, 4)
         self.assertEqual(btm_right.y, 5)
 
+    def test_bounds_cache(self):
+        """ bounds() is cached until the net adds or moves points """
+        self.net.add_point(NetPoint('a', 1, 3))
+        self.net.add_point(NetPoint('b', 4, 2))
+        self.assertEqual(self.net.bounds(), [Point(1, 2), Point(4, 3)])
+
+        self.net.add_point(NetPoint('c', 0, 9))
+        self.assertEqual(self.net.bounds(), [Point(0, 2), Point(4, 9)])
+        self.net.points['a'].x = -5
+        self.assertEqual(self.net.bounds(), [Point(0, 2), Point(4, 9)])
+        self.net.invalidate_bounds()
+        self.assertEqual(self.net.bounds(), [Point(-5, 2), Point(4, 9)])
+        self.net.scale(2)
+        self.assertEqual(self.net.bounds(), [Point(-10, 4), Point(8, 18)])
+
+        # the points returned are the caller's to change
+        self.net.bounds()[0].x = 100
+        self.assertEqual(self.net.bounds()[0].x, -10)
+
 
 class NetPointTests(unittest.TestCase):
     """ The tests of the core module net point feature """
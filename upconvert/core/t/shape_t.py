@@ -35,6 +35,11 @@ from upconvert.core.shape import Moire
 from upconvert.core.shape import Thermal
 from upconvert.core.shape import BezierCurve
 from upconvert.core.shape import Point
+from upconvert.core.shape import PointArray
+from upconvert.core.shape import attributes_of
+from upconvert.core.transform import Matrix
+import copy
+import pickle
 import unittest
 from math import sin, cos, pi
 
@@ -55,6 +60,49 @@ class ShapeTests(unittest.TestCase):
         shp = Shape()
         assert shp.type == None
 
+    def test_slots(self):
+        """ Shapes keep their attributes in slots, and still copy and
+        pickle with all of them. """
+        lab = Label(1, 2, 'foo', align='center', rotation=0.5)
+        lab.add_attribute('bar', 'baz')
+        self.assertFalse(hasattr(lab, '__dict__'))
+        self.assertFalse(hasattr(Point(1, 2), '__dict__'))
+        self.assertRaises(AttributeError, setattr, lab, 'misspelt', 1)
+        self.assertEqual(attributes_of(Point(1, 2)), {'x': 1, 'y': 2})
+        for copied in (copy.deepcopy(lab),
+                       pickle.loads(pickle.dumps(lab, pickle.HIGHEST_PROTOCOL))):
+            self.assertEqual(attributes_of(copied), attributes_of(lab))
+            self.assertEqual(copied.json(), lab.json())
+
+    def test_copy(self):
+        """ copy() matches copy.deepcopy(), and moving the copy leaves
+        the original where it was. """
+        shapes = [Rectangle(1, 2, 3, 4), Circle(1, 2, 3),
+                  Label(1, 2, 'foo', align='center', rotation=0.5),
+                  Line(Point(1, 2), Point(3, 4)),
+                  Polygon([Point(1, 2), Point(3, 4), Point(5, 0)]),
+                  Polygon(PointArray([Point(1, 2), Point(3, 4)])),
+                  BezierCurve(Point(1, 2), Point(3, 4), Point(5, 6), Point(7, 8)),
+                  Moire(1, 2, 3, 4, 5, 6, 7, 8, 9), Thermal(1, 2, 3, 4, 5)]
+        for shape in shapes:
+            shape.add_attribute('layer', 'top')
+            before = shape.json()
+            copied = shape.copy()
+            self.assertEqual(type(copied), type(shape))
+            self.assertEqual(copied.json(), copy.deepcopy(shape).json())
+            copied.shift(10, 20)
+            copied.rotate(0.5)
+            copied.add_attribute('layer', 'bottom')
+            self.assertEqual(shape.json(), before)
+
+    def test_transformed(self):
+        """ transformed() moves a copy of the shape by a Matrix """
+        line = Line(Point(1, 2), Point(3, 4))
+        moved = line.transformed(Matrix().scale(2).shift(1, 1))
+        self.assertEqual((moved.p1.x, moved.p1.y, moved.p2.x, moved.p2.y),
+                         (3, 5, 7, 9))
+        self.assertEqual((line.p1.x, line.p1.y), (1, 2))
+
 
 class RectangleTests(unittest.TestCase):
     """ The tests of the core module rectangle shape """
@@ -349,6 +397,37 @@ class PolygonTests(unittest.TestCase):
         self.assertEqual(self.poly.max_point().x, 4)
         self.assertEqual(self.poly.max_point().y, 7)
 
+    def test_point_array(self):
+        '''Test a Polygon with columnar points against one with a list'''
+        xys = [(1, 3), (3, 7), (4, 3), (3, -2)]
+        columnar = Polygon(PointArray(xys))
+        for _xy in xys:
+            self.poly.add_point(_xy)
+        self.assertEqual(columnar, self.poly)
+
+        for poly in (columnar, self.poly):
+            poly.shift(2, 1)
+            poly.scale(1.5)
+            poly.rebase_y_axis(10)
+            poly.points[0].x += 1
+        self.assertEqual(columnar.json(), self.poly.json())
+        self.assertEqual(columnar.min_point(), self.poly.min_point())
+        self.assertEqual(columnar.max_point(), self.poly.max_point())
+        self.assertEqual([(pt.x, pt.y) for pt in columnar.points],
+                         [(pt.x, pt.y) for pt in self.poly.points])
+
+    def test_point_array_types(self):
+        '''Test that PointArray values keep the types they would in Points'''
+        points = PointArray([(1, 3), (3, 7)])
+        points.shift(1, 1)
+        self.assertEqual(type(points[0].x), int)
+        points.scale(0.5)
+        self.assertEqual(type(points[0].x), float)
+        self.assertEqual(points[0].x, 1.0)
+        points.append(Point(5, 6))
+        self.assertEqual(points[-1], Point(5, 6))
+        self.assertEqual(len(points[1:]), 2)
+
 
 class RegularPolygonTests(unittest.TestCase):
     """ The tests of the core module regular polygon shape. """
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The spatial index test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+
+from upconvert.core.spatial import GridIndex, point_box, segment_box, \
+    shape_box
+from upconvert.core.net import NetPoint
+from upconvert.core.shape import Rectangle
+import random
+import unittest
+
+
+class GridIndexTests(unittest.TestCase):
+    """ The tests of the core module spatial index feature """
+
+    def test_point_queries(self):
+        """ Points are found at, within and nearest a location """
+        points = [NetPoint('%da%d' % (x, y), x, y)
+                  for x in range(0, 100, 10) for y in range(0, 100, 10)]
+        grid = GridIndex(25, points, box=point_box)
+        self.assertEqual(len(grid), 100)
+        self.assertEqual([p.point_id for p in grid.at(30, 40)], ['30a40'])
+        self.assertEqual(grid.at(31, 40), [])
+        self.assertEqual(sorted(p.point_id for p in grid.within(5, 5, 20, 10)),
+                         ['10a10', '20a10'])
+        self.assertEqual(grid.nearest(52, 68).point_id, '50a70')
+        self.assertEqual(grid.nearest(-500, 1000).point_id, '0a90')
+
+    def test_boxes(self):
+        """ Segments and shapes are found anywhere along their boxes """
+        seg = (NetPoint('a', 0, 0), NetPoint('b', 100, 10))
+        rect = Rectangle(200, 50, 10, 20)
+        grid = GridIndex(10)
+        grid.insert(seg, segment_box(seg))
+        grid.insert(rect, shape_box(rect))
+        self.assertEqual(grid.at(55, 5), [seg])
+        self.assertEqual(grid.at(205, 60), [rect])
+        self.assertEqual(grid.within(0, 0, 300, 300), [seg, rect])
+        self.assertEqual(grid.nearest(150, 10), seg)
+        self.assertEqual(grid.nearest(190, 40), rect)
+
+    def test_nearest_matches_brute_force(self):
+        """ nearest() finds a point as close as a linear scan does """
+        rand = random.Random(4)
+        coords = [(rand.randint(-500, 500), rand.randint(-500, 500))
+                  for _ in range(300)]
+        grid = GridIndex(40, coords)
+        for _ in range(100):
+            x, y = rand.uniform(-800, 800), rand.uniform(-800, 800)
+            dist = lambda (px, py): (px - x) ** 2 + (py - y) ** 2
+            self.assertEqual(dist(grid.nearest(x, y)), min(map(dist, coords)))
+
+    def test_empty(self):
+        """ An empty index finds nothing, and cells must have a size """
+        grid = GridIndex(1)
+        self.assertEqual(grid.at(0, 0), [])
+        self.assertEqual(grid.nearest(0, 0), None)
+        self.assertRaises(ValueError, GridIndex, 0)
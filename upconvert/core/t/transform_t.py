@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The transform test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.core.transform import Matrix, transform
+from upconvert.core.shape import Point, PointArray, Rectangle
+import unittest
+
+
+class MatrixTests(unittest.TestCase):
+    """ The tests of the core module transform feature """
+
+    def test_compose(self):
+        """ Operations compose in the order they are chained """
+        matrix = Matrix().scale(2).shift(3, 4).rebase_y_axis(10)
+        self.assertEqual(matrix.row(), (2, 0, 3, 0, -2, 6))
+        self.assertEqual(matrix.apply(1, 1), (5, 4))
+        self.assertEqual(Matrix().shift(3, 4).scale(2).apply(1, 1), (8, 10))
+        self.assertTrue(Matrix().rebase_y_axis(5).rebase_y_axis(5).is_identity())
+
+    def test_steps(self):
+        """ A matrix splits into a scale, a shift and a rebase """
+        self.assertEqual(Matrix().shift(1, 2).scale(3).steps(), (3, 3, 6, None))
+        self.assertEqual(Matrix().scale(2).rebase_y_axis(7).shift(1, 1).steps(),
+                         (2, 1, 0, 8))
+        self.assertRaises(ValueError, Matrix(0, -1, 0, 1, 0, 0).steps)
+        self.assertRaises(ValueError, Matrix(a=2, e=3).steps)
+
+    def test_transform(self):
+        """ transform() moves objects with or without a transform method """
+        matrix = Matrix().scale(2).shift(1, 1).rebase_y_axis(10)
+        point = Point(1, 2)
+        transform(point, matrix)
+        self.assertEqual((point.x, point.y), (3, 5))
+
+        rect = Rectangle(1, 2, 3, 4)
+        transform(rect, matrix)
+        self.assertEqual((rect.x, rect.y, rect.width, rect.height), (3, 5, 6, 8))
+
+    def test_point_array(self):
+        """ A PointArray moves a column at a time, keeping int columns """
+        points = PointArray([(1, 2), (3, 4)])
+        points.transform(Matrix().scale(2).rebase_y_axis(10))
+        self.assertEqual(points, [Point(2, 6), Point(6, 2)])
+        self.assertEqual(points.xs.typecode, 'l')
+
+        points.transform(Matrix(0, -1, 0, 1, 0, 0.5))
+        self.assertEqual(points, [Point(-6, 2.5), Point(-2, 6.5)])
+        self.assertEqual(points.xs.typecode, 'l')
+        self.assertEqual(points.ys.typecode, 'd')
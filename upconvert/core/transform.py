@@ -0,0 +1,142 @@
+#!/usr/bin/env python2
+""" Affine transforms of the core's coordinates """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class Matrix(object):
+    """ A 2x3 affine matrix, mapping (x, y) to
+    (a * x + b * y + c, d * x + e * y + f).
+
+    scale(), shift() and rebase_y_axis() mirror the methods of the same
+    names on the core classes, but instead of moving anything they
+    return a new matrix that does the old one and then the operation.
+    So a chain like
+
+        Matrix().scale(10).shift(dx, dy).rebase_y_axis(height)
+
+    costs nothing until the matrix is handed to
+    Design.apply_transform(), which moves every coordinate once. """
+
+    __slots__ = ('a', 'b', 'c', 'd', 'e', 'f', '_steps')
+
+    def __init__(self, a=1, b=0, c=0, d=0, e=1, f=0): # pylint: disable=R0913
+        self.a, self.b, self.c = a, b, c
+        self.d, self.e, self.f = d, e, f
+        self._steps = None
+
+
+    def __eq__(self, other):
+        return isinstance(other, Matrix) and self.row() == other.row()
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
+    def __repr__(self):
+        return 'Matrix(%r, %r, %r, %r, %r, %r)' % self.row()
+
+
+    def row(self):
+        """ Return the matrix as a tuple (a, b, c, d, e, f) """
+        return (self.a, self.b, self.c, self.d, self.e, self.f)
+
+
+    def then(self, other):
+        """ Return a matrix that applies this matrix, then other """
+        return Matrix(other.a * self.a + other.b * self.d,
+                      other.a * self.b + other.b * self.e,
+                      other.a * self.c + other.b * self.f + other.c,
+                      other.d * self.a + other.e * self.d,
+                      other.d * self.b + other.e * self.e,
+                      other.d * self.c + other.e * self.f + other.f)
+
+
+    def scale(self, factor):
+        """ Return this matrix followed by scaling x & y by factor """
+        return self.then(Matrix(a=factor, e=factor))
+
+
+    def shift(self, dx, dy):
+        """ Return this matrix followed by a shift of dx & dy """
+        return self.then(Matrix(c=dx, f=dy))
+
+
+    def rebase_y_axis(self, height):
+        """ Return this matrix followed by rebasing y to height - y """
+        return self.then(Matrix(e=-1, f=height))
+
+
+    def apply(self, x, y):
+        """ Return the point (x, y) moved by the matrix. Terms with a zero
+        coefficient are left out, so int coordinates stay ints when
+        every coefficient that touches them is an int. """
+        if self.b == 0 and self.d == 0:
+            return (self.a * x + self.c, self.e * y + self.f)
+        return (self.a * x + self.b * y + self.c,
+                self.d * x + self.e * y + self.f)
+
+
+    def is_identity(self):
+        """ True if the matrix leaves every point where it is """
+        return self.row() == (1, 0, 0, 0, 1, 0)
+
+
+    def steps(self):
+        """ Return the matrix as the operations the core classes know:
+        (factor, dx, dy, height), to be applied as scale(factor), then
+        shift(dx, dy), then rebase_y_axis(height) if height is not None.
+
+        The core only stores sizes (widths, radii) and not directions,
+        so it can only be moved by matrices that scale both axes alike,
+        without rotating or shearing. Any chain of scale(), shift() and
+        rebase_y_axis() gives one of those; other matrices raise a
+        ValueError. """
+        if self._steps is None:
+            if self.b != 0 or self.d != 0 or self.a not in (self.e, -self.e):
+                raise ValueError('cannot apply %r to the core, it only '
+                                 'supports scales, shifts and y axis '
+                                 'rebases' % (self,))
+            if self.a == self.e:
+                self._steps = (self.a, self.c, self.f, None)
+            else:
+                self._steps = (self.a, self.c, 0, self.f)
+        return self._steps
+
+
+def transform(obj, matrix):
+    """ Move obj by matrix. Objects with a transform(matrix) method move
+    themselves in one pass; anything else is moved by apply_steps(). """
+    if hasattr(obj, 'transform'):
+        obj.transform(matrix)
+    else:
+        apply_steps(obj, matrix)
+
+
+def apply_steps(obj, matrix):
+    """ Move obj by the steps of matrix, through its scale(), shift()
+    and rebase_y_axis() """
+    factor, dx, dy, height = matrix.steps()
+    if factor != 1:
+        obj.scale(factor)
+    if dx != 0 or dy != 0:
+        obj.shift(dx, dy)
+    if height is not None:
+        obj.rebase_y_axis(height)
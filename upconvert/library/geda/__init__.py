@@ -0,0 +1,239 @@
+""" The upverter symbol library for gEDA """
+
+import os
+import json
+import hashlib
+import logging
+
+from upconvert.utils.cache import cache_dir, write_atomic
+
+SYMBOLS_DIR = os.path.dirname(__file__)
+
+INDEX_VERSION = 1
+
+ALL_INDEXES = {} # { realpath: SymbolIndex }
+
+log = logging.getLogger('library.geda') # pylint: disable=C0103
+
+
+def find_symbols(symbol_dirs):
+    """ Parses each directory in *symbol_dirs* searching for
+        gEDA symbol files based on its extension (extension: .sym).
+        It creates a symbol file lookup of basename (without
+        extension) and absolute path to the symbol file. Where
+        names clash, the first directory (and the first file in
+        a top-down walk of it) wins.
+
+        The walk of each directory is served from a SymbolIndex,
+        so only directories that changed since they were last
+        indexed are listed again.
+
+        Returns a dictionary of file basename and absolute path.
+    """
+    known_symbols = {}
+    for symbol_dir in symbol_dirs:
+        if os.path.exists(symbol_dir):
+            symbols = get_index(symbol_dir).paths(symbol_dir)
+            if not known_symbols:
+                known_symbols.update(symbols)
+            else:
+                for name, filepath in symbols.iteritems():
+                    if name not in known_symbols:
+                        known_symbols[name] = filepath
+
+    return known_symbols
+
+
+def fingerprint(symbol_dirs):
+    """ Returns a fingerprint of the .sym files that find_symbols()
+        would find in *symbol_dirs*: the relative path, mtime and
+        size of each, which changes when a symbol file is added,
+        removed, renamed or edited.
+    """
+    fingerprints = []
+    for symbol_dir in symbol_dirs:
+        if os.path.exists(symbol_dir):
+            fingerprints.append(get_index(symbol_dir).fingerprint())
+        else:
+            fingerprints.append(None)
+    return fingerprints
+
+
+def get_index(symbol_dir):
+    """ Return the up to date SymbolIndex of *symbol_dir*. Indexes
+        are kept for the life of the process and stored in the
+        on-disk cache if there is one, so a fresh process only has
+        to check the directory fingerprints.
+    """
+    top = os.path.realpath(symbol_dir)
+    index = ALL_INDEXES.get(top)
+    if index is None:
+        index = ALL_INDEXES[top] = SymbolIndex(top)
+        index.load()
+
+    if index.refresh():
+        index.save()
+
+    return index
+
+
+class SymbolIndex(object):
+    """ The .sym files found in a walk of one symbol directory, along
+    with a fingerprint (mtime & size) of every directory walked. Adding,
+    removing or renaming a file changes the fingerprint of the directory
+    it is in, so only those directories have to be listed again. """
+
+    def __init__(self, top):
+        self.top = top
+        self.dirs = {} # relative dir -> [mtime, size, subdirs, sym files]
+        self.symbols = [] # [(name, relative path)] in walk order
+        self.resolved = {} # symbol dir -> {name: path}
+
+
+    def cache_file(self):
+        """ Return the path of the on-disk copy of this index, or None
+        if there is no cache directory. """
+        directory = cache_dir()
+        if directory is None:
+            return None
+        return os.path.join(directory, 'geda-symbols-%s.json'
+                            % hashlib.md5(self.top).hexdigest())
+
+
+    def load(self):
+        """ Load the on-disk copy of this index, if there is a usable one """
+        path = self.cache_file()
+        if path is None or not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            log.debug('ignoring unreadable symbol index %s', path)
+            return
+
+        if data.get('version') != INDEX_VERSION or data.get('top') != self.top:
+            return
+
+        for rel_dir, (mtime, size, subdirs, files) in data['dirs'].iteritems():
+            self.dirs[_str(rel_dir)] = [mtime, size,
+                                        [_str(d) for d in subdirs],
+                                        [_str(f) for f in files]]
+        self.symbols = [(_str(name), _str(rel_path))
+                        for name, rel_path in data['symbols']]
+
+
+    def save(self):
+        """ Store this index in the on-disk cache, if there is one """
+        path = self.cache_file()
+        if path is None:
+            return
+
+        try:
+            data = json.dumps({'version': INDEX_VERSION,
+                               'top': self.top,
+                               'dirs': self.dirs,
+                               'symbols': self.symbols})
+            write_atomic(path, data)
+        except (IOError, OSError, UnicodeDecodeError), err:
+            log.debug('could not store symbol index %s: %s', path, err)
+
+
+    def refresh(self):
+        """ Walk the directory tree top-down in the same order as
+        os.walk with sorted subdirectories, listing only directories
+        whose fingerprint changed. Returns True if anything changed. """
+        dirs = {}
+        changed = False
+        stack = ['']
+
+        while stack:
+            rel_dir = stack.pop()
+            path = os.path.join(self.top, rel_dir) if rel_dir else self.top
+
+            try:
+                stat = os.stat(path)
+                fingerprint = [stat.st_mtime, stat.st_size]
+            except OSError:
+                fingerprint = [None, None]
+
+            entry = self.dirs.get(rel_dir)
+            if entry is None or entry[:2] != fingerprint:
+                entry = fingerprint + list(_list_dir(path))
+                changed = True
+
+            dirs[rel_dir] = entry
+            stack.extend(os.path.join(rel_dir, d) for d in reversed(entry[2]))
+
+        if not changed and len(dirs) == len(self.dirs):
+            return False
+
+        self.dirs = dirs
+        self.symbols = []
+        self.resolved = {}
+
+        seen = set()
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            _, _, subdirs, files = dirs[rel_dir]
+            for filename in files:
+                name = os.path.splitext(filename)[0].lower()
+                if name not in seen:
+                    seen.add(name)
+                    self.symbols.append((name, os.path.join(rel_dir, filename)))
+            stack.extend(os.path.join(rel_dir, d) for d in reversed(subdirs))
+
+        return True
+
+
+    def fingerprint(self):
+        """ Return [(relative path, mtime, size)] of the symbol files,
+        in walk order. """
+        files = []
+        for _, rel_path in self.symbols:
+            try:
+                stat = os.stat(os.path.join(self.top, rel_path))
+                files.append((rel_path, stat.st_mtime, stat.st_size))
+            except OSError:
+                files.append((rel_path, None, None))
+        return files
+
+
+    def paths(self, symbol_dir):
+        """ Return the symbol name to path lookup of this index, with
+        paths starting with *symbol_dir*. """
+        if symbol_dir not in self.resolved:
+            self.resolved[symbol_dir] = dict(
+                (name, os.path.join(symbol_dir, rel_path))
+                for name, rel_path in self.symbols)
+        return self.resolved[symbol_dir]
+
+
+def _list_dir(path):
+    """ List one directory the way os.walk does, returning the sorted
+    subdirectories to descend into and the .sym files. """
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return [], []
+
+    subdirs = []
+    files = []
+    for name in names:
+        if os.path.isdir(os.path.join(path, name)):
+            if not os.path.islink(os.path.join(path, name)):
+                subdirs.append(name)
+        elif name.endswith('.sym'):
+            files.append(name)
+
+    subdirs.sort()
+    return subdirs, files
+
+
+def _str(value):
+    """ Turn a name read back from JSON into the str os.walk returns """
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
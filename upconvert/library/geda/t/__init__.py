@@ -0,0 +1 @@
+""" Tests for the gEDA symbol library. """
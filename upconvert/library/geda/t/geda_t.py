@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The geda library test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.library import geda
+from upconvert.utils.cache import CACHE_DIR_ENV
+
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+
+class GEDATests(TestCase):
+    """ The tests of the geda library """
+
+    def setUp(self):
+        """ Index symbols into a fresh cache """
+        self.old_cache_dir = os.environ.get(CACHE_DIR_ENV)
+        self.cache_dir = tempfile.mkdtemp()
+        self.sym_dir = tempfile.mkdtemp()
+        os.environ[CACHE_DIR_ENV] = self.cache_dir
+        geda.ALL_INDEXES.clear()
+
+    def tearDown(self):
+        """ Restore the cache """
+        if self.old_cache_dir is None:
+            del os.environ[CACHE_DIR_ENV]
+        else:
+            os.environ[CACHE_DIR_ENV] = self.old_cache_dir
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.sym_dir)
+        geda.ALL_INDEXES.clear()
+
+    def add_symbol(self, *path):
+        """ Create an empty symbol file in the symbol directory """
+        path = os.path.join(self.sym_dir, *path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        open(path, 'w').close()
+        return path
+
+    def test_find_symbols_matches_walk(self):
+        """ The bundled library is indexed like a walk of it """
+
+        expected = {}
+        for dirpath, dirnames, filenames in os.walk(geda.SYMBOLS_DIR):
+            dirnames.sort()
+            for filename in filenames:
+                name, ext = os.path.splitext(filename)
+                if ext == '.sym' and name.lower() not in expected:
+                    expected[name.lower()] = os.path.join(dirpath, filename)
+
+        self.assertEqual(geda.find_symbols([geda.SYMBOLS_DIR]), expected)
+
+    def test_first_symbol_wins(self):
+        """ Earlier directories and shallower files win name clashes """
+
+        opamp = self.add_symbol('opamp.sym')
+        self.add_symbol('a', 'OPAMP.sym')
+        resistor = self.add_symbol('a', 'resistor.sym')
+        self.add_symbol('b', 'resistor.sym')
+
+        symbols = geda.find_symbols([self.sym_dir, geda.SYMBOLS_DIR])
+
+        self.assertEqual(symbols['opamp'], opamp)
+        self.assertEqual(symbols['resistor'], resistor)
+        self.assertTrue('title-b' in symbols)
+
+    def test_changed_directory_is_reindexed(self):
+        """ Adding a symbol is picked up by the next lookup """
+
+        self.add_symbol('a', 'opamp.sym')
+        self.assertFalse('resistor' in geda.find_symbols([self.sym_dir]))
+
+        resistor = self.add_symbol('a', 'resistor.sym')
+        # make sure the directory fingerprint moves on coarse clocks
+        stat = os.stat(os.path.dirname(resistor))
+        os.utime(os.path.dirname(resistor), (stat.st_atime, stat.st_mtime + 10))
+
+        self.assertEqual(geda.find_symbols([self.sym_dir])['resistor'], resistor)
+
+    def test_index_is_stored(self):
+        """ A new process reuses the index stored on disk """
+
+        opamp = self.add_symbol('opamp.sym')
+        geda.find_symbols([self.sym_dir])
+        geda.ALL_INDEXES.clear()
+
+        index = geda.SymbolIndex(os.path.realpath(self.sym_dir))
+        index.load()
+
+        self.assertEqual(index.symbols, [('opamp', 'opamp.sym')])
+        self.assertFalse(index.refresh())
+        self.assertEqual(index.paths(self.sym_dir), {'opamp': opamp})
@@ -1,38 +1,304 @@
 """ The upverter part library for KiCAD """
 
+import os
+import zlib
+import atexit
+import hashlib
+import logging
+import cPickle as pickle
+
 from os.path import dirname, exists, join
 
+from upconvert.utils.cache import cache_dir, write_atomic
+from upconvert.utils.inputs import is_buffer, open_input
+
 PARTS_DIR = join(dirname(__file__), 'parts')
 
-ALL_COMPONENTS = {} # { libname: { KiCADLibrary } }
+# bump whenever parsed components change shape, to drop stored libraries
+STORE_VERSION = 3
+
+# the rough in-memory cost of indexing one component, besides its names
+INDEX_ENTRY_BYTES = 64
+
+log = logging.getLogger('library.kicad') # pylint: disable=C0103
 
 
 def lookup_part(name, libs):
     """
     Given the name of a KiCAD part, attempt to locate a part in the
     first library which matches it. Return the Component if
-    successful, None otherwise.
+    successful, None otherwise. Every call returns a new Component.
     """
     for lib in libs:
-        if lib not in ALL_COMPONENTS:
-            ALL_COMPONENTS[lib] = read_library(lib)
+        library = read_library(lib)
 
-        if name in ALL_COMPONENTS[lib]:
-            return ALL_COMPONENTS[lib][name]
+        if library is not None and name in library:
+            return library.lookup(name)
 
 
 def read_library(lib):
     """
-    Read the library with the given name if it exists and return a
-    KiCADLibrary object. Otherwise return an empty dict.
+    Return the StoredLibrary for the library with the given name if it
+    exists, otherwise None.
     """
 
     libfile = join(PARTS_DIR, lib + '.lib')
 
     if exists(libfile):
-        from upconvert.parser.kicad import KiCADLibrary
-        library = KiCADLibrary()
-        library.parse(libfile)
-        return library.name2cpt
+        return LIBRARY_STORE.get(libfile)
     else:
-        return {}
+        return None
+
+
+class StoredLibrary(object):
+    """
+    A KiCAD library file, indexed by the names and aliases of its DEF
+    blocks and their byte offsets. A component is only parsed the first
+    time it is asked for, and is then kept as a pickle. It is unpickled
+    each time it is asked for after that, so callers are free to scale
+    or otherwise modify it.
+
+    Newly parsed components only mark the library dirty; it is written
+    to disk by save(), which the LibraryStore calls when the library is
+    evicted or a parse is finished.
+
+    The path may also be an open file-like object, for a library held
+    in memory. Those are never stored on disk.
+    """
+
+    def __init__(self, path, fingerprint, parts):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.parts = parts # [[name, aliases, offset, pickled or None]]
+        self.dirty = False
+        self.store = None # the LibraryStore holding this library, if any
+
+        # the approximate size of the library in memory, in bytes
+        self.size = sum(INDEX_ENTRY_BYTES + len(name) + len(' '.join(aliases))
+                        + len(data or '') for name, aliases, _, data in parts)
+
+        # name (or alias) -> index into parts, the way KiCADLibrary
+        # resolves names: first component wins, aliases overwrite
+        self.name2index = {}
+        for index, (part_name, aliases, _, _) in enumerate(parts):
+            if part_name not in self.name2index:
+                self.name2index[part_name] = index
+                for alias in aliases:
+                    self.name2index[alias] = index
+
+    def __contains__(self, name):
+        return name in self.name2index
+
+    def names(self):
+        """ Return [(name, aliases)] of all the components, in file order """
+        return [(name, aliases) for name, aliases, _, _ in self.parts]
+
+    def lookup(self, name):
+        """ Return a new copy of the named component, or None """
+        index = self.name2index.get(name)
+        if index is None:
+            return None
+        return self.part(index)
+
+    def part(self, index):
+        """ Return a new copy of the component at the given index into
+        parts, parsing it from the library file if needed """
+        data = self.parts[index][3]
+        if data is not None:
+            return pickle.loads(data)
+        return self.read(index)
+
+    def components(self, indexes=None):
+        """ Return new copies of the components at the given indexes
+        into parts, or of all of them, in file order """
+        if indexes is None:
+            indexes = range(len(self.parts))
+        return [self.part(index) for index in indexes]
+
+    def read(self, index):
+        """ Parse the component at the given index from the library
+        file, keeping a pickle of it """
+        from upconvert.parser.kicad import ComponentParser
+
+        with open_input(self.path, 'rb') as f:
+            f.seek(self.parts[index][2])
+            cpt = ComponentParser(f.readline()).parse(f)
+        cpt.name = cpt.name.upper()
+
+        data = pickle.dumps(cpt, pickle.HIGHEST_PROTOCOL)
+        self.parts[index][3] = data
+        self.dirty = True
+        self.size += len(data)
+        if self.store is not None:
+            self.store.grew(len(data))
+        return cpt
+
+    @staticmethod
+    def cache_file(path):
+        """ Return where a library is stored on disk, or None """
+        directory = cache_dir()
+        if directory is None:
+            return None
+        return join(directory, 'kicad-lib-%s.pickle.z'
+                    % hashlib.md5(path).hexdigest())
+
+    @classmethod
+    def load(cls, path, fingerprint):
+        """ Load a library from disk, if it is stored for this version
+        of the file. Returns a StoredLibrary or None. """
+        cache_file = cls.cache_file(path)
+        if cache_file is None or not exists(cache_file):
+            return None
+
+        try:
+            with open(cache_file, 'rb') as f:
+                version, stored_path, stored_fingerprint, parts = \
+                    pickle.loads(zlib.decompress(f.read()))
+        except Exception: # pylint: disable=W0703
+            log.debug('ignoring unreadable library store %s', cache_file)
+            return None
+
+        if (version, stored_path, tuple(stored_fingerprint)) != \
+                (STORE_VERSION, path, fingerprint):
+            return None
+
+        return cls(path, fingerprint, parts)
+
+    def save(self):
+        """ Store the library on disk, if there is a cache directory """
+        self.dirty = False
+        if is_buffer(self.path):
+            return
+
+        cache_file = self.cache_file(self.path)
+        if cache_file is None:
+            return
+
+        data = (STORE_VERSION, self.path, self.fingerprint, self.parts)
+        try:
+            write_atomic(cache_file, zlib.compress(
+                pickle.dumps(data, pickle.HIGHEST_PROTOCOL), 1))
+        except (IOError, OSError), err:
+            log.debug('could not store library %s: %s', cache_file, err)
+
+
+class LibraryStore(object):
+    """
+    KiCAD library files keyed by path, mtime and size. Libraries are kept
+    in an in-process LRU bounded by their size in memory, so a library
+    file is only scanned again when it changes, and each component in it
+    is only parsed once. When there is an on-disk cache directory (see
+    utils.cache.cache_dir) libraries are stored there too, for later
+    processes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0 # the approximate size of the libraries, in bytes
+        self.libraries = {} # realpath -> StoredLibrary
+        self.recent = [] # realpaths, least recently used first
+        self.realpaths = {} # file name -> realpath
+
+    def get(self, filename):
+        """ Return the StoredLibrary for a library file """
+        path = self.realpaths.get(filename)
+        if path is None:
+            path = self.realpaths[filename] = os.path.realpath(filename)
+        stat = os.stat(path)
+        fingerprint = (stat.st_mtime, stat.st_size)
+
+        library = self.libraries.get(path)
+        if library is not None and library.fingerprint != fingerprint:
+            self.forget(path)
+            library = None
+        if library is None:
+            library = StoredLibrary.load(path, fingerprint)
+            if library is None:
+                library = StoredLibrary(path, fingerprint, scan_parts(path))
+                library.save()
+
+        self.remember(path, library)
+        return library
+
+    def remember(self, path, library):
+        """ Make a library the most recently used, evicting the least
+        recently used libraries once over max_bytes """
+        if self.libraries.get(path) is library:
+            self.recent.remove(path)
+        else:
+            self.libraries[path] = library
+            library.store = self
+            self.size += library.size
+        self.recent.append(path)
+        self.evict()
+
+    def grew(self, size):
+        """ Count size more bytes for a library, as its components are
+        parsed, evicting other libraries once over max_bytes """
+        self.size += size
+        self.evict()
+
+    def evict(self):
+        """ Forget the least recently used libraries until the store is
+        no bigger than max_bytes, keeping the most recent one """
+        while self.size > self.max_bytes and len(self.recent) > 1:
+            self.forget(self.recent[0])
+
+    def forget(self, path):
+        """ Drop a library from the LRU, saving it if it is dirty, and
+        return it """
+        self.recent.remove(path)
+        library = self.libraries.pop(path)
+        library.store = None
+        self.size -= library.size
+        if library.dirty:
+            library.save()
+        return library
+
+    def flush(self):
+        """ Save every library with newly parsed components """
+        for library in self.libraries.itervalues():
+            if library.dirty:
+                library.save()
+
+    def clear(self):
+        """ Drop every library from the LRU """
+        for path in list(self.recent):
+            self.forget(path)
+        self.realpaths.clear()
+
+
+def scan_parts(filename):
+    """
+    Scan a library file (or file-like object) for its DEF blocks without parsing them, into
+    [[name, aliases, byte offset of the DEF line, None]], with names
+    and aliases upper case. A DEF block's ALIAS line is read the way
+    ComponentParser reads it: the last one wins.
+    """
+
+    parts = []
+    part = None
+    offset = 0
+
+    with open_input(filename, 'rb') as f:
+        for line in f:
+            if part is None:
+                if line.startswith('DEF '):
+                    name = line.split()[1]
+                    if name.startswith('~'):
+                        name = name[1:]
+                    part = [name.upper(), [], offset, None]
+                    parts.append(part)
+            elif line.lstrip().startswith(('ALIAS', 'ENDDEF')):
+                words = line.split()
+                if words[0] == 'ALIAS':
+                    part[1] = [alias.upper() for alias in words[1:]]
+                elif words[0] == 'ENDDEF':
+                    part = None
+            offset += len(line)
+
+    return parts
+
+
+LIBRARY_STORE = LibraryStore()
+atexit.register(LIBRARY_STORE.flush)
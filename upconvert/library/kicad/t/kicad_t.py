@@ -22,11 +22,32 @@
 # limitations under the License.
 
 
-from upconvert.library.kicad import lookup_part
+from upconvert.library.kicad import lookup_part, LibraryStore, \
+    StoredLibrary, LIBRARY_STORE
 from upconvert.core.components import Component
+from upconvert.parser.kicad import KiCAD
+from upconvert.utils.cache import CACHE_DIR_ENV
 
 from unittest import TestCase
 
+import os
+import time
+import shutil
+import tempfile
+
+TEST_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..',
+                        'test', 'kicad')
+
+
+LIBRARY = """EESchema-LIBRARY Version 2.3
+DEF %s R 0 0 N Y 1 F N
+ALIAS %s
+DRAW
+X ~ 1 0 150 50 D 60 60 1 1 P
+ENDDRAW
+ENDDEF
+"""
+
 
 class KicadTests(TestCase):
     """ The tests of the kicad library """
@@ -51,3 +72,171 @@ class KicadTests(TestCase):
         found = lookup_part(name, libs)
 
         self.assertEqual(found, None)
+
+    def test_lookup_returns_copies(self):
+        """ Test that each lookup returns a new component """
+
+        name = 'DS18B20Z'
+        libs = ['1wire']
+
+        found = lookup_part(name, libs)
+        found.scale(10)
+
+        self.assertFalse(lookup_part(name, libs) is found)
+        self.assertEqual(lookup_part(name, libs).json(),
+                         lookup_part(name, libs).json())
+
+
+class LibraryStoreTests(TestCase):
+    """ The tests of the kicad library store """
+
+    def setUp(self):
+        """ Store libraries in a fresh cache """
+        self.old_cache_dir = os.environ.get(CACHE_DIR_ENV)
+        self.cache_dir = tempfile.mkdtemp()
+        self.lib_dir = tempfile.mkdtemp()
+        os.environ[CACHE_DIR_ENV] = self.cache_dir
+        self.store = LibraryStore()
+
+    def tearDown(self):
+        """ Restore the cache """
+        if self.old_cache_dir is None:
+            del os.environ[CACHE_DIR_ENV]
+        else:
+            os.environ[CACHE_DIR_ENV] = self.old_cache_dir
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.lib_dir)
+
+    def write_library(self, filename, name, alias, mtime=None):
+        """ Write a one part library file """
+        path = os.path.join(self.lib_dir, filename)
+        with open(path, 'w') as f:
+            f.write(LIBRARY % (name, alias))
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_names_and_aliases(self):
+        """ Test looking parts up by upper case name and alias """
+
+        path = self.write_library('a.lib', 'res', 'resistor')
+        library = self.store.get(path)
+
+        self.assertEqual(library.lookup('RES').name, 'RES')
+        self.assertEqual(library.lookup('RESISTOR').name, 'RES')
+        self.assertEqual(library.lookup('res'), None)
+        self.assertEqual([cpt.name for cpt in library.components()], ['RES'])
+
+    def test_parts_parsed_on_demand(self):
+        """ Test that only the components looked up are parsed """
+
+        path = os.path.join(self.lib_dir, 'two.lib')
+        with open(path, 'w') as f:
+            f.write(LIBRARY % ('res', 'resistor')
+                    + (LIBRARY % ('~cap', 'capacitor')).split('\n', 1)[1])
+        library = self.store.get(path)
+
+        self.assertEqual(library.names(), [('RES', ['RESISTOR']),
+                                           ('CAP', ['CAPACITOR'])])
+        self.assertEqual([data for _, _, _, data in library.parts],
+                         [None, None])
+
+        self.assertEqual(library.lookup('CAPACITOR').name, 'CAP')
+        self.assertEqual(library.parts[0][3], None)
+
+        # parsed components are stored on disk once flushed
+        self.assertTrue(library.dirty)
+        self.assertEqual(LibraryStore().get(path).parts[1][3], None)
+        self.store.flush()
+        self.assertFalse(library.dirty)
+        stored = LibraryStore().get(path)
+        self.assertEqual(stored.parts[0][3], None)
+        self.assertNotEqual(stored.parts[1][3], None)
+        self.assertEqual([cpt.name for cpt in stored.components()],
+                         ['RES', 'CAP'])
+
+    def test_reuse_and_reparse(self):
+        """ Test that a library is reused until its file changes """
+
+        path = self.write_library('a.lib', 'res', 'resistor', 1000)
+        library = self.store.get(path)
+
+        self.assertTrue(self.store.get(path) is library)
+
+        # a new process loads the library from disk
+        stored = LibraryStore().get(path)
+        self.assertFalse(stored is library)
+        self.assertTrue('RES' in stored)
+
+        self.write_library('a.lib', 'cap', 'capacitor', 2000)
+        self.assertTrue('CAP' in self.store.get(path))
+        self.assertTrue('CAP' in LibraryStore().get(path))
+
+    def test_eviction(self):
+        """ Test that the least recently used libraries are evicted """
+
+        paths = [self.write_library('%d.lib' % i, 'res', 'resistor')
+                 for i in range(3)]
+        self.store.max_bytes = self.store.get(paths[0]).size * 2
+
+        for path in paths:
+            self.store.get(path)
+
+        self.assertEqual(self.store.recent, [os.path.realpath(path)
+                                             for path in paths[1:]])
+
+    def test_size(self):
+        """ Test that the store keeps count of the size of its libraries """
+
+        paths = [self.write_library('%d.lib' % i, 'res', 'resistor')
+                 for i in range(3)]
+        libraries = [self.store.get(path) for path in paths]
+        size = sum(library.size for library in libraries)
+        self.assertEqual(self.store.size, size)
+
+        libraries[1].lookup('RES')
+        self.assertTrue(libraries[1].size > size / 3)
+        self.assertEqual(self.store.size,
+                         sum(library.size for library in libraries))
+
+        # evicting a library saves its parsed components
+        self.store.max_bytes = libraries[1].size + libraries[2].size
+        self.store.get(paths[1])
+        self.store.get(paths[2])
+        self.store.get(paths[0])
+        self.assertEqual(self.store.recent, [os.path.realpath(path)
+                                             for path in (paths[2], paths[0])])
+        self.assertEqual(self.store.size, libraries[2].size
+                         + libraries[0].size)
+        self.assertFalse(libraries[1].dirty)
+        self.assertNotEqual(LibraryStore().get(paths[1]).parts[0][3], None)
+
+    def test_memory_only(self):
+        """ Test that nothing is stored on disk without a cache directory """
+
+        os.environ[CACHE_DIR_ENV] = ''
+        path = self.write_library('a.lib', 'res', 'resistor')
+        self.assertEqual(StoredLibrary.cache_file(path), None)
+
+        self.store.get(path).lookup('RES')
+        self.store.flush()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_warm_parse(self):
+        """ Test that parsing designs again reuses their libraries """
+
+        filenames = [os.path.join(TEST_DIR, name)
+                     for name in sorted(os.listdir(TEST_DIR))
+                     if name.endswith('.sch')]
+
+        def parse_all():
+            """ Return the seconds taken to parse every design """
+            start = time.time()
+            for filename in filenames:
+                KiCAD().parse(filename)
+            return time.time() - start
+
+        LIBRARY_STORE.clear()
+        cold = parse_all()
+        warm = parse_all()
+        self.assertTrue(warm < cold, (warm, cold))
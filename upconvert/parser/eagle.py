@@ -23,6 +23,9 @@
 # Default values are used for fields missed in files of previous versions.
 #
 
+import logging
+import mmap
+import re
 import struct
 import math
 
@@ -32,6 +35,9 @@ from upconvert.core.design import Design
 from upconvert.core.net import Net, NetPoint, ConnectedComponent
 from upconvert.core.components import Component, Symbol, SBody, Pin
 from upconvert.core.shape import Point, Line, Label, Arc, Circle, Rectangle, Polygon
+from upconvert.utils.inputs import open_input, read_head
+
+log = logging.getLogger('parser.eagle') # pylint: disable=C0103
 
 #class EagleBinConsts:
 #    """ Just a set of constants to be used by both parser and writer
@@ -57,6 +63,7 @@ class Eagle:
         """ A struct that represents a header """
         constant = 0x10
         template = "=4BI4B3I"
+        codec = struct.Struct(template)
 
         def __init__(self, version="5.11", numofblocks=0):
             """ Just a constructor
@@ -71,7 +78,7 @@ class Eagle:
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Header.template, chunk)
+            _dta = Eagle.Header.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Header(
                                 version=Eagle._do_ojs('%d.%d' % (_dta[5], _dta[6])),
@@ -85,18 +92,11 @@ class Eagle:
         """
         constant = 0x11
         template = "=4BI4BII4B"
+        codec = struct.Struct(template)
 
-        # TODO if i need to synchronize access?..
-        counter = 0
-
-        def __init__(self, copyno=0, seqno=None):
+        def __init__(self, copyno=0, seqno=0):
             """ Just a constructor
             """
-            if None == seqno:
-                seqno = Eagle.Settings.counter
-                Eagle.Settings.counter += 1
-            else:
-                Eagle.Settings.counter = 1 + seqno
             self.seqno = seqno # looks like first and second blocks
                                #  starts with the same byte set
                                #  but then the second set starts to evolve
@@ -104,20 +104,17 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses ?? settings ?? block
-                TODO synchronization could be needed
+                (the parser numbers the blocks as it adds them)
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Settings.template, chunk)
+            _dta = Eagle.Settings.codec.unpack_from(chunk)
 
 # [11] -- sequence number of a copy (incremented on each 'save as', even with no changes)
 #          (for first "settings" block only; second one contains 0 there)
-            _ret_val = Eagle.Settings(seqno=Eagle.Settings.counter,
-                                         copyno=_dta[8]
-                                        )
-            Eagle.Settings.counter += 1
+            _ret_val = Eagle.Settings(copyno=_dta[8])
             return _ret_val
 
     class Grid:
@@ -125,6 +122,7 @@ class Eagle:
         """
         constant = 0x12
         template = "=4B5I"
+        codec = struct.Struct(template)
 
         unitmask = 0x0f
         units = {
@@ -161,12 +159,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses grid block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Grid.template, chunk)
+            _dta = Eagle.Grid.codec.unpack_from(chunk)
 
             try:
                 _unit = Eagle.Grid.units[Eagle.Grid.unitmask & _dta[3]]
@@ -202,6 +200,7 @@ class Eagle:
         """
         constant = 0x13
         template = "=7B2I9s"
+        codec = struct.Struct(template)
 
         linkedsignmask = 0x10
 
@@ -237,12 +236,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses single layer block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Layer.template, chunk)
+            _dta = Eagle.Layer.codec.unpack_from(chunk)
 
             _linked = False # a kind of a "twin" layer
 # these visible / active signs looks like legacy ones
@@ -266,7 +265,7 @@ class Eagle:
             if Eagle.Layer.no_embed_str != _dta[9][0]:
                 _name = Eagle._do_ojs(_dta[9].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Layer(number=_dta[3],
                                    name=_name,
@@ -325,6 +324,7 @@ class Eagle:
         """
         constant = 0x14
         template = "=4B3I3B5s"
+        codec = struct.Struct(template)
 
         max_embed_len = 5
         no_embed_str = b'\x7f'
@@ -342,18 +342,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses attribute header block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.AttributeHeader.template, chunk)
+            _dta = Eagle.AttributeHeader.codec.unpack_from(chunk)
 
             _schematic = None
             if Eagle.AttributeHeader.no_embed_str != _dta[10][0]:
                 _schematic = Eagle._do_ojs(_dta[10].rstrip('\0'))
             else: # from external string block
-                _schematic = Eagle.attr_jar_list.next().name
+                _schematic = strings.next().name
 
 # number of shapes + header of shapes
 # number of attributes, excluding this line
@@ -370,6 +370,7 @@ class Eagle:
         """
         constant = 0x15
         template = "=4B3I8s"
+        codec = struct.Struct(template)
 
         max_embed_len = 8
         no_embed_str = b'\x7f'
@@ -398,18 +399,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses library block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Library.template, chunk)
+            _dta = Eagle.Library.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Library.no_embed_str != _dta[7][0]:
                 _name = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
 # three ints are counters, have to recheck
             _ret_val = Eagle.Library(name=_name,
@@ -424,6 +425,7 @@ class Eagle:
         """
         constant = 0x17
         template = "=4B3I8s"
+        codec = struct.Struct(template)
 
         max_embed_len = 8
         no_embed_str = b'\x7f'
@@ -437,18 +439,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses deviceset block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.DeviceSetHeader.template, chunk)
+            _dta = Eagle.DeviceSetHeader.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.DeviceSetHeader.no_embed_str != _dta[7][0]:
                 _name = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.DeviceSetHeader(name=_name,
                                        numofblocks=_dta[4],
@@ -461,6 +463,7 @@ class Eagle:
         """
         constant = 0x18
         template = "=4B3I8s"
+        codec = struct.Struct(template)
 
         max_embed_len = 8
         no_embed_str = b'\x7f'
@@ -474,18 +477,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses symbolheader block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.SymbolHeader.template, chunk)
+            _dta = Eagle.SymbolHeader.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.SymbolHeader.no_embed_str != _dta[7][0]:
                 _name = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.SymbolHeader(name=_name,
                                           numofblocks=_dta[4],
@@ -498,6 +501,7 @@ class Eagle:
         """
         constant = 0x19
         template = "=4B3I8s"
+        codec = struct.Struct(template)
 
         max_embed_len = 8
         no_embed_str = b'\x7f'
@@ -511,18 +515,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses packageheader block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.PackageHeader.template, chunk)
+            _dta = Eagle.PackageHeader.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.PackageHeader.no_embed_str != _dta[7][0]:
                 _name = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.PackageHeader(name=_name,
                                            numofblocks=_dta[4],
@@ -535,6 +539,7 @@ class Eagle:
         """
         constant = 0x1d
         template = "=2BHI4BI8s"
+        codec = struct.Struct(template)
 
         max_embed_len = 8
         no_embed_str = b'\x7f'
@@ -547,18 +552,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses symbol block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Symbol.template, chunk)
+            _dta = Eagle.Symbol.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Symbol.no_embed_str != _dta[9][0]:
                 _name = Eagle._do_ojs(_dta[9].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
 # number of shapes, excluding this line
             _ret_val = Eagle.Symbol(libid=_dta[5],
@@ -572,6 +577,7 @@ class Eagle:
         """
         constant = 0x1e
         template = "=2BH2IB5s6s"
+        codec = struct.Struct(template)
 
         max_embed_nlen = 5
         max_embed_dlen = 6
@@ -585,24 +591,24 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses package block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Package.template, chunk)
+            _dta = Eagle.Package.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Package.no_embed_str != _dta[6][0]:
                 _name = Eagle._do_ojs(_dta[6].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _desc = None
             if Eagle.Package.no_embed_str != _dta[7][0]:
                 _desc = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _desc = Eagle.attr_jar_list.next().name
+                _desc = strings.next().name
 
 # number of shapes, excluding this line
             _ret_val = Eagle.Package(name=_name,
@@ -616,6 +622,7 @@ class Eagle:
         """
         constant = 0x1f
         template = "=2BH2I4B8s"
+        codec = struct.Struct(template)
 
         constantmid1 = 0x7fff7fff
         constantmid2 = 0x80008000
@@ -631,12 +638,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses net
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Net.template, chunk)
+            _dta = Eagle.Net.codec.unpack_from(chunk)
 
             if (Eagle.Net.constantmid1 != _dta[3] or
                     Eagle.Net.constantmid2 != _dta[4]):
@@ -646,7 +653,7 @@ class Eagle:
             if Eagle.Net.no_embed_str != _dta[9][0]:
                 _name = Eagle._do_ojs(_dta[9].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Net(name=_name,
                                  nclass=_dta[6],
@@ -659,6 +666,7 @@ class Eagle:
         """
         constant = 0x38
         template = "=2B3H3B5s8s"
+        codec = struct.Struct(template)
 
         max_embed_len1 = 5
         max_embed_len2 = 8
@@ -679,24 +687,24 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses part
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Part.template, chunk)
+            _dta = Eagle.Part.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Part.no_embed_str != _dta[8][0]:
                 _name = Eagle._do_ojs(_dta[8].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _value = None
             if Eagle.Part.no_embed_str != _dta[9][0]:
                 _value = Eagle._do_ojs(_dta[9].rstrip('\0'))
             else: # from external string block
-                _value = Eagle.attr_jar_list.next().name
+                _value = strings.next().name
 
             _ret_val = Eagle.Part(name=_name,
                                  libid=_dta[3],
@@ -716,6 +724,7 @@ class Eagle:
         """
         constant = 0x37
         template = "=2B2H2B5s5s6s"
+        codec = struct.Struct(template)
 
         max_embed_len1 = 5
         max_embed_len2 = 5
@@ -742,30 +751,30 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses deviceset
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.DeviceSet.template, chunk)
+            _dta = Eagle.DeviceSet.codec.unpack_from(chunk)
 
             _prefix = None
             if Eagle.DeviceSet.no_embed_str != _dta[6][0]:
                 _prefix = Eagle._do_ojs(_dta[6].rstrip('\0'))
             else: # from external string block
-                _prefix = Eagle.attr_jar_list.next().name
+                _prefix = strings.next().name
 
             _desc = None
             if Eagle.DeviceSet.no_embed_str != _dta[7][0]:
                 _desc = Eagle._do_ojs(_dta[7].rstrip('\0'))
             else: # from external string block
-                _desc = Eagle.attr_jar_list.next().name
+                _desc = strings.next().name
 
             _name = None
             if Eagle.DeviceSet.no_embed_str != _dta[8][0]:
                 _name = Eagle._do_ojs(_dta[8].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
 # numofshapes excludes connections-related info
 # their num is numofconnblocks
@@ -789,6 +798,7 @@ class Eagle:
         """
         constant = 0x3a
         template = "=2BH20s"
+        codec = struct.Struct(template)
 
         max_embed_len = 20
         no_embed_str = b'\x7f'
@@ -800,18 +810,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses bus
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Bus.template, chunk)
+            _dta = Eagle.Bus.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Package.no_embed_str != _dta[3][0]:
                 _name = Eagle._do_ojs(_dta[3].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Bus(name=_name,
                                  numofshapes=_dta[2],
@@ -823,6 +833,7 @@ class Eagle:
         """
         constant = 0x1a
         template = "=2BH5I"
+        codec = struct.Struct(template)
 
         def __init__(self, numofshapes=0, shapes=None, # pylint: disable=R0913
                      numofpartblocks=0, parts=None,
@@ -849,12 +860,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses shape header block
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.ShapeHeader.template, chunk)
+            _dta = Eagle.ShapeHeader.codec.unpack_from(chunk)
 
 # number of shapes, excluding this header block
             _ret_val = Eagle.ShapeHeader(numofshapes=_dta[2],
@@ -869,6 +880,7 @@ class Eagle:
         """
         constant = 0x20
         template = "=2BHI4B3I"
+        codec = struct.Struct(template)
 
         def __init__(self, numofshapes=0, shapes=None,
                      cumulativenumofshapes=0):
@@ -879,12 +891,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses segment
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Segment.template, chunk)
+            _dta = Eagle.Segment.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Segment(numofshapes=_dta[2],
                                      cumulativenumofshapes=_dta[5], # TODO recheck
@@ -896,6 +908,7 @@ class Eagle:
         """
         constant = 0x36
         template = "=2B2H13s5s"
+        codec = struct.Struct(template)
 
         constantmid_def = "''"
 
@@ -925,17 +938,17 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses header for 'connections' blocks
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.ConnectionHeader.template, chunk)
+            _dta = Eagle.ConnectionHeader.codec.unpack_from(chunk)
 
             if Eagle.ConnectionHeader.no_embed_str != _dta[4][0]:
                 _attrstr = Eagle._do_ojs(_dta[4].rstrip('\0'))
             else: # from external string block
-                _attrstr = Eagle.attr_jar_list.next().name
+                _attrstr = strings.next().name
 
             _attrs = []
             _techs = []
@@ -959,7 +972,7 @@ class Eagle:
             if Eagle.ConnectionHeader.no_embed_str != _dta[5][0]:
                 _name = Eagle._do_ojs(_dta[5].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
             if Eagle.ConnectionHeader.constantmid_def == _name:
                 _name = ''
 
@@ -976,6 +989,7 @@ class Eagle:
         """
         constant = 0x3c
         template = "=2B22B"
+        codec = struct.Struct(template)
 
         connset_len = 22
 
@@ -988,12 +1002,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses connection indexes set
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Connections.template, chunk)
+            _dta = Eagle.Connections.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Connections(connections=[x for x in _dta[2:]
                                                                 if 0 != x],
@@ -1111,6 +1125,7 @@ class Eagle:
         """
         constant = 0x21
         template = "=2BH2I2H4BI"
+        codec = struct.Struct(template)
 
         def __init__(self, width, layer, numofshapes=0, shapes=None):
             """ Just a constructor
@@ -1121,12 +1136,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses segment
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Polygon.template, chunk)
+            _dta = Eagle.Polygon.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Polygon(numofshapes=_dta[2],
                                      width=(Eagle.Polygon.width_xscale *
@@ -1141,6 +1156,7 @@ class Eagle:
         """
         constant = 0x30
         template = "=2BH2iH6BI"
+        codec = struct.Struct(template)
 
         smashed_mask = 0x01 # IC, +PART
         smashed2_mask = 0x02 #??
@@ -1160,12 +1176,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses instance
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Instance.template, chunk)
+            _dta = Eagle.Instance.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Instance(numofshapes=_dta[2],
                                      x=Eagle.Instance.decode_real(_dta[3]),
@@ -1187,6 +1203,7 @@ class Eagle:
         """
         constant = 0x25
         template = "=4B2i2IH2B"
+        codec = struct.Struct(template)
 
         def __init__(self, x, y, radius, width, layer): # pylint: disable=R0913
             """ Just a constructor
@@ -1199,12 +1216,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses rectangle
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Circle.template, chunk)
+            _dta = Eagle.Circle.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Circle(
                                       x=Eagle.Shape.decode_real(_dta[4]),
@@ -1222,6 +1239,7 @@ class Eagle:
         """
         constant = 0x26
         template = "=4B4i4B"
+        codec = struct.Struct(template)
 
         def __init__(self, x1, y1, x2, y2, layer, rotate): # pylint: disable=R0913
             """ Just a constructor
@@ -1235,12 +1253,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses rectangle
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Rectangle.template, chunk)
+            _dta = Eagle.Rectangle.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Rectangle(
                                       x1=Eagle.Shape.decode_real(_dta[4]),
@@ -1257,6 +1275,7 @@ class Eagle:
         """
         constant = 0x22
         template = "=4B4iH2B"
+        codec = struct.Struct(template)
 
         stylemask = 0x0f
         styles = {
@@ -1286,12 +1305,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses wire
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Wire.template, chunk)
+            _dta = Eagle.Wire.codec.unpack_from(chunk)
 
             if Eagle.Wire.wire_sign == _dta[10]:
                 _ret_val = Eagle.Wire(
@@ -1321,6 +1340,7 @@ class Eagle:
         """
         constant = 0x27
         template = "=4B5I"
+        codec = struct.Struct(template)
 
         constantmid = 0x000013d8
 
@@ -1333,12 +1353,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses junction
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Junction.template, chunk)
+            _dta = Eagle.Junction.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Junction(x=Eagle.Shape.decode_real(_dta[4]),
                                          y=Eagle.Shape.decode_real(_dta[5]),
@@ -1353,6 +1373,7 @@ class Eagle:
         """
         constant = 0x28
         template = "=4B5I"
+        codec = struct.Struct(template)
 
         def __init__(self, x, y, drill):
             """ Just a constructor
@@ -1364,12 +1385,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses junction
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Hole.template, chunk)
+            _dta = Eagle.Hole.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Hole(x=Eagle.Shape.decode_real(_dta[4]),
                                   y=Eagle.Shape.decode_real(_dta[5]),
@@ -1383,6 +1404,7 @@ class Eagle:
         """
         constant = 0x2b
         template = "=4B2i2H3B5s"
+        codec = struct.Struct(template)
 
         max_embed_len = 5
         no_embed_str = b'\x7f'
@@ -1399,18 +1421,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses junction
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.SMD.template, chunk)
+            _dta = Eagle.SMD.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.SMD.no_embed_str != _dta[11][0]:
                 _name = Eagle._do_ojs(_dta[11].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.SMD(name=_name,
                                  x=Eagle.Shape.decode_real(_dta[4]),
@@ -1453,7 +1475,7 @@ class Eagle:
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.FixedArc.template, chunk)
+            _dta = Eagle.FixedArc.codec.unpack_from(chunk)
 
             _curve = None
             if _dta[10] in Eagle.Wire.arc_preset1:
@@ -1488,6 +1510,7 @@ class Eagle:
         """ A struct that represents a free angle arc
         """
         template = "=4B4IH2B" # 3-bytes long coords here..
+        codec = struct.Struct(template)
 
         @staticmethod
         def parse(chunk):
@@ -1495,7 +1518,7 @@ class Eagle:
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Arc.template, chunk)
+            _dta = Eagle.Arc.codec.unpack_from(chunk)
 
             # sign propogation by hand
             _x1 = (Eagle.Shape.decode_real(_dta[4] & 0xffffff)
@@ -1568,6 +1591,7 @@ class Eagle:
         """
         constant = 0x2a
         template = "=4B3I3B5s"
+        codec = struct.Struct(template)
 
         max_embed_len = 5
         no_embed_str = b'\x7f'
@@ -1584,18 +1608,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses pad
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Pad.template, chunk)
+            _dta = Eagle.Pad.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Pad.no_embed_str != _dta[10][0]:
                 _name = Eagle._do_ojs(_dta[10].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Pad(name=_name,
                                  x=Eagle.Shape.decode_real(_dta[4]),
@@ -1611,6 +1635,7 @@ class Eagle:
         """
         constant = 0x2c
         template = "=4B2i2B10s"
+        codec = struct.Struct(template)
 
         max_embed_len = 10
         no_embed_str = b'\x7f'
@@ -1667,18 +1692,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses pin
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Pin.template, chunk)
+            _dta = Eagle.Pin.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Pin.no_embed_str != _dta[8][0]:
                 _name = Eagle._do_ojs(_dta[8].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Pin(name=_name,
                                  x=Eagle.Shape.decode_real(_dta[4]),
@@ -1705,6 +1730,7 @@ class Eagle:
         """
         constant = 0x2d
         template = "=4B2i2BH8s"
+        codec = struct.Struct(template)
 
         addlevels = {
                      0x00: "must",
@@ -1728,18 +1754,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses junction
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Gate.template, chunk)
+            _dta = Eagle.Gate.codec.unpack_from(chunk)
 
             _name = None
             if Eagle.Gate.no_embed_str != _dta[9][0]:
                 _name = Eagle._do_ojs(_dta[9].rstrip('\0'))
             else: # from external string block
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Gate(x=Eagle.Shape.decode_real(_dta[4]),
                                   y=Eagle.Shape.decode_real(_dta[5]),
@@ -1754,6 +1780,7 @@ class Eagle:
         """
         constant = 0x31
         template = "=4B2iH4B6s"
+        codec = struct.Struct(template)
 
         max_embed_len = 5
         delimeter = b'!'
@@ -1773,18 +1800,18 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses text
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Text.template, chunk)
+            _dta = Eagle.Text.codec.unpack_from(chunk)
 
             _value = None
             if Eagle.Text.no_embed_str != _dta[11][0]:
                 _value = Eagle._do_ojs(_dta[11].rstrip('\0'))
             else: # from external string block
-                _value = Eagle.attr_jar_list.next().name
+                _value = strings.next().name
 
             _ret_val = Eagle.Text(value=_value,
                                      x=Eagle.Shape.decode_real(_dta[4]),
@@ -1817,6 +1844,7 @@ class Eagle:
         """
         constant = 0x33
         template = "=4B2I2H4BI"
+        codec = struct.Struct(template)
 
         mirroredmask = 0x10
         onoffmask = 0x01
@@ -1839,12 +1867,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses label
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Label.template, chunk)
+            _dta = Eagle.Label.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Label(x=Eagle.Shape.decode_real(_dta[4]),
                                       y=Eagle.Shape.decode_real(_dta[5]),
@@ -1871,6 +1899,7 @@ class Eagle:
         """
         constant = 0x43
         template = "=4B4i4B"
+        codec = struct.Struct(template)
 
         bleftmask = 0x08
         btopmask = 0x04
@@ -1897,12 +1926,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses frame
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.Frame.template, chunk)
+            _dta = Eagle.Frame.codec.unpack_from(chunk)
 
             _ret_val = Eagle.Frame(x1=Eagle.Shape.decode_real(_dta[4]),
                                       y1=Eagle.Shape.decode_real(_dta[5]),
@@ -1923,6 +1952,7 @@ class Eagle:
         """
         constant = 0x34
         template = "=4B2i2H4B4s"
+        codec = struct.Struct(template)
 
         def __init__(self, x, y, size, layer, rotate, font, name="NAME"): # pylint: disable=R0913
             """ Just a constructor
@@ -1937,12 +1967,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses attribute-name
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.AttributeNam.template, chunk)
+            _dta = Eagle.AttributeNam.codec.unpack_from(chunk)
 
             _ret_val = Eagle.AttributeNam(x=Eagle.Shape.decode_real(_dta[4]),
                                           y=Eagle.Shape.decode_real(_dta[5]),
@@ -1969,12 +1999,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses attribute-name
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.AttributeVal.template, chunk)
+            _dta = Eagle.AttributeVal.codec.unpack_from(chunk)
 
             _ret_val = Eagle.AttributeVal(x=Eagle.Shape.decode_real(_dta[4]),
                                           y=Eagle.Shape.decode_real(_dta[5]),
@@ -2001,12 +2031,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses attribute-name
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.AttributePrt.template, chunk)
+            _dta = Eagle.AttributePrt.codec.unpack_from(chunk)
 
 # [7] ?
             _ret_val = Eagle.AttributePrt(x=Eagle.Shape.decode_real(_dta[4]),
@@ -2026,6 +2056,7 @@ class Eagle:
         """
         constant = 0x3d
         template = "=4B3H14s"
+        codec = struct.Struct(template)
 
         def __init__(self, partno, gateno, pinno):
             """ Just a constructor
@@ -2037,12 +2068,12 @@ class Eagle:
             return
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None): # pylint: disable=W0613
             """ Parses attribute-name
             """
             _ret_val = None
 
-            _dta = struct.unpack(Eagle.PinRef.template, chunk)
+            _dta = Eagle.PinRef.codec.unpack_from(chunk)
 
             _ret_val = Eagle.PinRef(partno=_dta[4],
                                     gateno=_dta[5],
@@ -2055,6 +2086,7 @@ class Eagle:
         """
         constant = 0x42
         template = "=3BI17s"
+        codec = struct.Struct(template)
 
         max_embed_len = 17
         delimeter = b'!'
@@ -2085,13 +2117,13 @@ class Eagle:
             return (_name, _value)
 
         @staticmethod
-        def parse(chunk):
+        def parse(chunk, strings=None):
             """ Parses block attribute
             """
             _ret_val = None
             (_name, _value) = (None, None)
 
-            _dta = struct.unpack(Eagle.Attribute.template, chunk)
+            _dta = Eagle.Attribute.codec.unpack_from(chunk)
 
             if Eagle.Attribute.no_embed_str != _dta[4][0]: # embedded attr
                 (_name, _value) = Eagle.Attribute._parse(_dta[4].rstrip('\x00'))
@@ -2099,7 +2131,7 @@ class Eagle:
 # TODO decode [8] [9] [10]
 # [11] -- a kind of a marker, 0x09 / 0x08; 4 bytes long int, changed on each save as, even with no changes
 #  probably just a random int, no any pattern was discovered
-                _name = Eagle.attr_jar_list.next().name
+                _name = strings.next().name
 
             _ret_val = Eagle.Attribute(name=_name,
                                           value=_value
@@ -2253,9 +2285,15 @@ class Eagle:
     noregblockconst = b'\x13\x12\x99\x19'
     noregdelimeter = b'\0'
 
-    def __init__(self):
+    def __init__(self, lazy=False):
         """ Basic initilaization
+
+            A lazy parser only decodes the devsets and symbols of the
+            libraries the placed parts come from, which is all that the
+            design is built from; it passes over the other libraries and
+            every library's packages, leaving them empty.
         """
+        self.lazy = lazy
         self.header = None
         self.layers = []
         self.settings = []
@@ -2275,8 +2313,7 @@ class Eagle:
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an eagle schematic """
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0
         if ('\x10' == data[0x00] and '\x11' == data[0x18] and
                 '\x11' == data[0x30] and '\x12' == data[0x48]):
@@ -2284,126 +2321,273 @@ class Eagle:
         return confidence
 
 
-    def _parse_blocks(self, filehandle, numofblocks): # pylint: disable=R0912
+    def _parse_blocks(self, data, numofblocks, strings):
         """ Parse fixed length block part of a file
+
+        data holds the whole file (a memory map or a string), and the
+        blocks are read from it after the header block, as zero-copy
+        buffer slices. Each block is decoded by the parser the block
+        table has for its type byte, then put in place by the table's
+        handler, which keeps the parsing position in a cursor.
+
+        strings iterates over the file's external strings (Attributes),
+        which the blocks too short to hold a name take in turn.
+
+        A handler can have the blocks after its own passed over, by
+        setting the cursor's skip to the number of them.
         """
-# to keep parsing position
-        _cur_lib = None
-        _cur_web = None # consists of one or more shapesets/segments
-        _cur_segment = None # consists of one or more shapes
-        _prev_segment = None # for polygons only
-        _cur_connset = None # consists of one or more shapes (deviceset shows two types)
+        _table = Eagle._block_table()
+        _cursor = Eagle._BlockCursor()
+
+        _size = self.blocksize
+        _end = (1 + numofblocks) * _size
+        if len(data) < _end:
+            raise struct.error('unpack requires a string argument of length %d'
+                               % _size)
+
+        if self.lazy:
+            _cursor.used = Eagle._used_libraries(data, _end)
 
 # loop through 24 byte long blocks
-        for _nn in range(numofblocks):
-            _dta = filehandle.read(self.blocksize)
-
-#            print"d>",' '.join([x.encode('hex') for x in _dta])
-
-            _type = struct.unpack("24B", _dta)[0]
-            if Eagle.Settings.constant == _type:
-                self.settings.append(self.Settings.parse(_dta))
-            elif Eagle.Grid.constant == _type:
-                self.grid = self.Grid.parse(_dta)
-            elif Eagle.Layer.constant == _type:
-                self.layers.append(self.Layer.parse(_dta))
-            elif Eagle.AttributeHeader.constant == _type:
-                self.attributeheader = self.AttributeHeader.parse(_dta)
-            elif Eagle.Library.constant == _type:
-                _cur_lib = self.Library.parse(_dta)
-                self.libraries.append(_cur_lib)
-            elif Eagle.DeviceSetHeader.constant == _type:
-                _cur_web = self.DeviceSetHeader.parse(_dta)
-                _cur_lib.devsets.append(_cur_web)
-            elif Eagle.SymbolHeader.constant == _type:
-                _cur_web = self.SymbolHeader.parse(_dta)
-                _cur_lib.symbols.append(_cur_web)
-            elif Eagle.PackageHeader.constant == _type:
-                _cur_web = self.PackageHeader.parse(_dta)
-                _cur_lib.packages.append(_cur_web)
-            elif Eagle.Symbol.constant == _type:
-                _cur_segment = self.Symbol.parse(_dta)
-                _cur_web.shapesets.append(_cur_segment)
-                _prev_segment = None
-            elif Eagle.Package.constant == _type:
-                _cur_segment = self.Package.parse(_dta)
-                _cur_web.shapesets.append(_cur_segment)
-                _prev_segment = None
-            elif Eagle.ShapeHeader.constant == _type:
-                self.shapeheader = self.ShapeHeader.parse(_dta)
-                _cur_segment = self.shapeheader
-            elif Eagle.Bus.constant == _type:
-                _cur_web = self.Bus.parse(_dta)
-                self.shapeheader.buses.append(_cur_web)
-            elif Eagle.Net.constant == _type:
-                _cur_web = self.Net.parse(_dta)
-                self.shapeheader.nets.append(_cur_web)
-            elif Eagle.Segment.constant == _type:
-                _cur_segment = self.Segment.parse(_dta)
-                _cur_web.shapes.append(_cur_segment)
-                _prev_segment = None
-            elif Eagle.DeviceSet.constant == _type:
-                _cur_segment = self.DeviceSet.parse(_dta)
-                _cur_web.shapesets.append(_cur_segment)
-                _prev_segment = None
-            elif Eagle.ConnectionHeader.constant == _type:
-                _cur_connset = self.ConnectionHeader.parse(_dta)
-                _cur_segment.connblocks.append(_cur_connset)
-                _prev_segment = None
-            elif Eagle.Part.constant == _type:
-                _cur_web = self.Part.parse(_dta)
-                self.shapeheader.parts.append(_cur_web)
-            elif Eagle.Polygon.constant == _type:
-                if None == _prev_segment: # next polygon in the same segment
-                    _prev_segment = _cur_segment
-                _cur_segment = self.Polygon.parse(_dta)
-                _prev_segment.shapes.append(_cur_segment)
-            elif Eagle.Instance.constant == _type:
-                _cur_segment = self.Instance.parse(_dta)
-                _cur_web.shapes.append(_cur_segment)
-                _prev_segment = None
-            elif Eagle.Connections.constant == _type:
-                _cur_connset.shapes.append(self.Connections.parse(_dta))
-            elif Eagle.Gate.constant == _type:
-                _cur_segment.shapes.append(self.Gate.parse(_dta))
-            elif Eagle.Circle.constant == _type:
-                _cur_segment.shapes.append(self.Circle.parse(_dta))
-            elif Eagle.Rectangle.constant == _type:
-                _cur_segment.shapes.append(self.Rectangle.parse(_dta))
-            elif Eagle.Wire.constant == _type:
-                _cur_segment.shapes.append(self.Wire.parse(_dta))
-            elif Eagle.Hole.constant == _type:
-                _cur_segment.shapes.append(self.Hole.parse(_dta))
-            elif Eagle.SMD.constant == _type:
-                _cur_segment.shapes.append(self.SMD.parse(_dta))
-            elif Eagle.PinRef.constant == _type:
-                _cur_segment.shapes.append(self.PinRef.parse(_dta))
-            elif Eagle.Junction.constant == _type:
-                _cur_segment.shapes.append(self.Junction.parse(_dta))
-            elif Eagle.Pad.constant == _type:
-                _cur_segment.shapes.append(self.Pad.parse(_dta))
-            elif Eagle.Pin.constant == _type:
-                _cur_segment.shapes.append(self.Pin.parse(_dta))
-            elif Eagle.Label.constant == _type:
-                _cur_segment.shapes.append(self.Label.parse(_dta))
-            elif Eagle.AttributeNam.constant == _type:
-                _cur_segment.shapes.append(self.AttributeNam.parse(_dta))
-            elif Eagle.AttributeVal.constant == _type:
-                _cur_segment.shapes.append(self.AttributeVal.parse(_dta))
-            elif Eagle.AttributePrt.constant == _type:
-                _cur_segment.shapes.append(self.AttributePrt.parse(_dta))
-            elif Eagle.Text.constant == _type:
-                _cur_segment.shapes.append(self.Text.parse(_dta))
-            elif Eagle.Frame.constant == _type:
-                _cur_segment.shapes.append(self.Frame.parse(_dta))
-            elif Eagle.Attribute.constant == _type:
-                self.attributes.append(self.Attribute.parse(_dta))
+        _offset = _size
+        while _offset < _end:
+            _type = ord(data[_offset])
+            if _type in _table:
+                _parse, _add = _table[_type]
+                _add(self, _cursor,
+                     _parse(buffer(data, _offset, _size), strings))
             else:
-# TODO remove
-                print("unknown block tag %s" % hex(_type))
+                log.debug('unknown block tag %s', hex(_type))
+            _offset += _size
+
+            if 0 < _cursor.skip:
+                _offset = Eagle._skip_blocks(data, _offset,
+                                min(_end, _offset + _cursor.skip * _size),
+                                strings)
+                _cursor.skip = 0
 
         return
 
+    @staticmethod
+    def _used_libraries(data, end):
+        """ Returns the set of the libids (counted from 1) of the placed
+            parts, found by a pass over the blocks up to the end offset
+            that jumps over each library by its block counts
+        """
+        _used = set()
+        _size = Eagle.blocksize
+        _offset = _size
+        while _offset < end:
+            _type = ord(data[_offset])
+            if Eagle.Library.constant == _type:
+                _dta = Eagle.Library.codec.unpack_from(data, _offset)
+                _offset += (_dta[4] + _dta[5] + _dta[6]) * _size
+            elif Eagle.Part.constant == _type:
+                _used.add(Eagle.Part.codec.unpack_from(data, _offset)[3])
+            _offset += _size
+        return _used
+
+    @staticmethod
+    def _skip_blocks(data, offset, end, strings):
+        """ Passes over the blocks from offset up to the end offset without
+            decoding them, but takes the external strings they would have
+            taken out of strings, for the blocks after them. Returns end.
+        """
+        _table = Eagle._external_table()
+        _size = Eagle.blocksize
+        for _offset in xrange(offset, end, _size):
+            _type = ord(data[_offset])
+            if _type in _table:
+                _marker, _fields = _table[_type]
+                for _field in _fields:
+                    if _marker == data[_offset + _field]:
+                        strings.next()
+        return end
+
+    class _BlockCursor:
+        """ Where _parse_blocks() is in the tree of blocks """
+
+        def __init__(self):
+            """ Just a constructor
+            """
+            self.lib = None
+            self.web = None # consists of one or more shapesets/segments
+            self.segment = None # consists of one or more shapes
+            self.prev_segment = None # for polygons only
+            self.connset = None # consists of one or more shapes (deviceset shows two types)
+            self.used = None # libids to decode libraries of, or None for all
+            self.skip = 0 # number of blocks to pass over
+            return
+
+    _blocks = None
+    _externals = None
+
+    @classmethod
+    def _block_table(cls):
+        """ Returns a map of block type bytes to (parse, add) pairs: the
+            block struct's parse function, called as parse(chunk, strings),
+            and the handler that adds the parsed block to the tree, called
+            as add(self, cursor, block)
+        """
+        if None == cls._blocks:
+            _handlers = (
+                (cls.Settings, cls._add_settings),
+                (cls.Grid, cls._add_grid),
+                (cls.Layer, cls._add_layer),
+                (cls.AttributeHeader, cls._add_attributeheader),
+                (cls.Library, cls._add_library),
+                (cls.DeviceSetHeader, cls._add_devicesetheader),
+                (cls.SymbolHeader, cls._add_symbolheader),
+                (cls.PackageHeader, cls._add_packageheader),
+                (cls.Symbol, cls._add_shapeset),
+                (cls.Package, cls._add_shapeset),
+                (cls.DeviceSet, cls._add_shapeset),
+                (cls.ShapeHeader, cls._add_shapeheader),
+                (cls.Bus, cls._add_bus),
+                (cls.Net, cls._add_net),
+                (cls.Segment, cls._add_segment),
+                (cls.Instance, cls._add_segment),
+                (cls.ConnectionHeader, cls._add_connectionheader),
+                (cls.Part, cls._add_part),
+                (cls.Polygon, cls._add_polygon),
+                (cls.Connections, cls._add_connections),
+                (cls.Attribute, cls._add_attribute),
+               ) + tuple((_shape, cls._add_shape) for _shape in (
+                cls.Gate, cls.Circle, cls.Rectangle, cls.Wire, cls.Hole,
+                cls.SMD, cls.PinRef, cls.Junction, cls.Pad, cls.Pin,
+                cls.Label, cls.AttributeNam, cls.AttributeVal,
+                cls.AttributePrt, cls.Text, cls.Frame,
+               ))
+# set first, so _blocks being set means both are
+            cls._externals = dict((_block.constant, (_block.no_embed_str,
+                                        cls._string_offsets(_block.template)))
+                                  for _block, _add in _handlers
+                                  if hasattr(_block, 'no_embed_str'))
+            cls._blocks = dict((_block.constant, (_block.parse, _add))
+                               for _block, _add in _handlers)
+        return cls._blocks
+
+    @classmethod
+    def _external_table(cls):
+        """ Returns a map of block type bytes to (marker, offsets) pairs,
+            for the blocks with string fields: each field starting with
+            the marker byte takes the next external string instead
+        """
+        if None == cls._externals:
+            cls._block_table()
+        return cls._externals
+
+    @staticmethod
+    def _string_offsets(template):
+        """ Returns the byte offsets of the string fields of a template """
+        _offsets = []
+        _offset = 0
+        for _count, _code in re.findall(r'(\d*)([a-zA-Z?])', template):
+            if 's' == _code:
+                _offsets.append(_offset)
+            _offset += struct.calcsize('=' + _count + _code)
+        return tuple(_offsets)
+
+    def _add_settings(self, cursor, block): # pylint: disable=W0613
+        """ Adds a settings block """
+        block.seqno = len(self.settings)
+        self.settings.append(block)
+
+    def _add_grid(self, cursor, block): # pylint: disable=W0613
+        """ Adds the grid block """
+        self.grid = block
+
+    def _add_layer(self, cursor, block): # pylint: disable=W0613
+        """ Adds a layer block """
+        self.layers.append(block)
+
+    def _add_attributeheader(self, cursor, block): # pylint: disable=W0613
+        """ Adds the attribute header block """
+        self.attributeheader = block
+
+    def _add_library(self, cursor, block):
+        """ Adds a library, which the following blocks go in """
+        cursor.lib = block
+        self.libraries.append(block)
+        if None != cursor.used and len(self.libraries) not in cursor.used:
+# no part comes from it, so neither its devsets, symbols nor packages are needed
+            cursor.skip = (block.numofdevsetblocks + block.numofsymbolblocks +
+                           block.numofpackageblocks)
+
+    def _add_devicesetheader(self, cursor, block):
+        """ Adds a deviceset header to the current library """
+        cursor.web = block
+        cursor.lib.devsets.append(block)
+
+    def _add_symbolheader(self, cursor, block):
+        """ Adds a symbol header to the current library """
+        cursor.web = block
+        cursor.lib.symbols.append(block)
+
+    def _add_packageheader(self, cursor, block):
+        """ Adds a package header to the current library """
+        cursor.web = block
+        cursor.lib.packages.append(block)
+        if None != cursor.used: # packages aren't converted
+            cursor.skip = block.numofblocks
+
+    def _add_shapeset(self, cursor, block):
+        """ Adds a symbol, package or deviceset to the current header """
+        cursor.segment = block
+        cursor.web.shapesets.append(block)
+        cursor.prev_segment = None
+
+    def _add_shapeheader(self, cursor, block):
+        """ Adds the header of the schematic's parts, buses and nets """
+        self.shapeheader = block
+        cursor.segment = block
+
+    def _add_bus(self, cursor, block):
+        """ Adds a bus """
+        cursor.web = block
+        self.shapeheader.buses.append(block)
+
+    def _add_net(self, cursor, block):
+        """ Adds a net """
+        cursor.web = block
+        self.shapeheader.nets.append(block)
+
+    def _add_segment(self, cursor, block):
+        """ Adds a segment or an instance to the current bus, net or part """
+        cursor.segment = block
+        cursor.web.shapes.append(block)
+        cursor.prev_segment = None
+
+    def _add_connectionheader(self, cursor, block):
+        """ Adds a connection header to the current deviceset """
+        cursor.connset = block
+        cursor.segment.connblocks.append(block)
+        cursor.prev_segment = None
+
+    def _add_part(self, cursor, block):
+        """ Adds a part """
+        cursor.web = block
+        self.shapeheader.parts.append(block)
+
+    def _add_polygon(self, cursor, block):
+        """ Adds a polygon, the shapes after which go in it """
+        if None == cursor.prev_segment: # next polygon in the same segment
+            cursor.prev_segment = cursor.segment
+        cursor.segment = block
+        cursor.prev_segment.shapes.append(block)
+
+    def _add_connections(self, cursor, block):
+        """ Adds connections to the current connection header """
+        cursor.connset.shapes.append(block)
+
+    def _add_shape(self, cursor, block):
+        """ Adds a shape to the current segment """
+        cursor.segment.shapes.append(block)
+
+    def _add_attribute(self, cursor, block): # pylint: disable=W0613
+        """ Adds an attribute block """
+        self.attributes.append(block)
+
     def _parse_netclasses(self, filehandle):
         """ Parse netclasses part (fixed part + length + data part)
         """
@@ -2432,15 +2616,6 @@ class Eagle:
         self.noname_counter += 1
         return _ret_val
 
-    attr_jar = [] # attribute list
-
-    @classmethod
-    def attr_jar_iter(cls):
-        """ Returns next attribute on each call
-        """
-        for _aa in cls.attr_jar:
-            yield _aa
-
     def _parse(self, filehandle):
         """ Parse an Eagle file into a set of Eagle objects
         """
@@ -2452,15 +2627,19 @@ class Eagle:
         filehandle.read(4) # noregblockheader
         _unreg_dta = filehandle.read(struct.unpack("I",
                         filehandle.read(4))[0]).split(self.noregdelimeter)
-        filehandle.seek(1 * self.blocksize)
-        for _aa in _unreg_dta:
-            if 0 < len(_aa):
-                Eagle.attr_jar.append(Eagle.Attribute.parse2(_aa))
-        Eagle.attr_jar_list = Eagle.attr_jar_iter()
+# kept for this parse only, so parsers don't share (or pile up) them
+        _strings = iter([Eagle.Attribute.parse2(_aa)
+                         for _aa in _unreg_dta if 0 < len(_aa)])
 
-        self._parse_blocks(filehandle, -1 + self.header.numofblocks)
+        _data = Eagle._map_file(filehandle)
+        try:
+            self._parse_blocks(_data, -1 + self.header.numofblocks, _strings)
+        finally:
+            if isinstance(_data, mmap.mmap):
+                _data.close()
 
 # desc (length driven)
+        filehandle.seek(self.header.numofblocks * self.blocksize)
         filehandle.read(4) # noregblockheader
 ## TODO remove
 #        if Eagle.noregblockconst != _noregblockheader:
@@ -2476,6 +2655,17 @@ class Eagle:
         self._parse_netclasses(filehandle)
         return
 
+    @staticmethod
+    def _map_file(filehandle):
+        """ Returns the whole file as a read only memory map, or as a
+            string if it can't be mapped (eg. it's not a real file)
+        """
+        try:
+            return mmap.mmap(filehandle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, EnvironmentError, ValueError):
+            filehandle.seek(0)
+            return filehandle.read()
+
     @staticmethod
     def _convert_arc(sarc):
         """ Converts a Eagle's Arc / FixedArc objects into Arc
@@ -2677,8 +2867,8 @@ class Eagle:
                             elif isinstance(_ss, Eagle.Frame):
                                 pass # a kind of a box around a schematic
                             else:
-# TODO remove
-                                print("unexpected block %s in shapeset" % _ss.__class__.__name__)
+                                log.debug('unexpected block %s in shapeset',
+                                          _ss.__class__.__name__)
 
                             if None != _sp: # i.e. label (!= text), hole, ..
                                 _sp.add_attribute('layer', _ss.layer)
@@ -2762,8 +2952,8 @@ class Eagle:
                     elif isinstance(_ss, Eagle.Label):
                         pass # has to be skipped: no use here
                     else:
-# TODO remove
-                        print("unexpected block %s in bus/net" % _ss.__class__.__name__)
+                        log.debug('unexpected block %s in bus/net',
+                                  _ss.__class__.__name__)
                 design.add_net(_net)
 
 # Components (Array) -- above
@@ -2777,10 +2967,12 @@ class Eagle:
         return design
 
     def parse(self, filename):
-        """ Parse an Eagle file into a design """
+        """ Parse an Eagle file (a file name or an open file-like
+        object) into a design """
         design = None
 
-        with open(filename, 'rb') as _if:
+        self.__init__(self.lazy) # drop whatever an earlier parse left behind
+        with open_input(filename, 'rb') as _if:
             self._parse(_if)
 
         design = self._convert()
@@ -56,10 +56,22 @@ from upconvert.core.component_instance import ComponentInstance, SymbolAttribute
 from upconvert.core.net import Net, NetPoint, ConnectedComponent
 from upconvert.core.shape import Arc, Circle, Label, Line, Rectangle, Polygon
 
-from upconvert.parser.eaglexml.generated_g import parse
+from upconvert.parser.eaglexml.stream import iter_nodes
+from upconvert.utils.inputs import open_input, read_head
+from upconvert.utils.registry import LazyModule
+
+# the generated model is only loaded to parse with it (stream=False)
+generated_g = LazyModule('upconvert.parser.eaglexml.generated_g')
 
 EAGLE_SCALE = 10.0/9.0
 
+# the elements read_stream() reads, by their path below the root
+SCHEMATIC = ('drawing', 'schematic')
+LIBRARY = SCHEMATIC + ('libraries', 'library')
+PART = SCHEMATIC + ('parts', 'part')
+INSTANCE = SCHEMATIC + ('sheets', 'sheet', 'instances', 'instance')
+NET = SCHEMATIC + ('sheets', 'sheet', 'nets', 'net')
+
 
 class EagleXML(object):
     """ The Eagle XML Format Parser.
@@ -75,13 +87,18 @@ class EagleXML(object):
          The xsd is also stored in this directory.
       4. Run a modified version of generateDS.py with the following arguments:
            --silence --external-encoding=utf-8 -o generated.py
+
+    By default the file is read as a stream of elements instead (see
+    read_stream()), which builds the same design without the generated
+    model. EagleXML(stream=False) reads it with the generated code.
      """
 
     SCALE = 2.0
     MULT =  90 / 25.4 # mm to 90 dpi
 
-    def __init__(self):
+    def __init__(self, stream=True):
         self.design = Design()
+        self.stream = stream
 
         # map (component, gate name) to body indices
         self.cptgate2body_index = {}
@@ -112,8 +129,7 @@ class EagleXML(object):
         """ Return our confidence that the given file is an
         eagle xml schematic """
 
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0.0
         if 'eagle.dtd' in data:
             confidence += 0.9
@@ -121,25 +137,63 @@ class EagleXML(object):
 
 
     def parse(self, filename):
-        """ Parse an Eagle XML file into a design """
+        """ Parse an Eagle XML file (a file name or an open file-like
+        object) into a design """
 
-        root = parse(filename)
+        with open_input(filename) as f:
+            if self.stream:
+                self.read_stream(f)
+            else:
+                root = generated_g.parse(f)
 
-        self.make_components(root)
-        self.make_component_instances(root)
-        self.make_nets(root)
+        if not self.stream:
+            self.make_components(root)
+            self.make_component_instances(root)
+            self.make_nets(root)
         self.design.scale(EAGLE_SCALE)
 
         return self.design
 
 
+    def read_stream(self, f):
+        """ Read an open eaglexml file as a stream of elements, making the
+        components of each library, and the component instance of each
+        instance, as each one ends. Nets are made once the whole file is
+        read, as their pinrefs may refer to instances on later sheets.
+        Nothing outside the libraries, parts, instances and nets of the
+        schematic is kept, eg. the layers, the settings or a board. """
+
+        parts = {}
+        nets = []
+
+        for path, node in iter_nodes(f, (LIBRARY, PART, INSTANCE, NET)):
+            if path == LIBRARY:
+                self.make_library_components(node)
+            elif path == PART:
+                parts[node.name] = node
+            elif path == INSTANCE:
+                inst = self.ensure_component_instance(parts, node)
+                self.set_symbol_attribute(node, inst)
+            else:
+                nets.append(node)
+
+        for net in nets:
+            self.design.add_net(self.make_net(net))
+
+
     def make_components(self, root):
         """ Construct openjson components from an eagle model. """
 
         for lib in get_subattr(root, 'drawing.schematic.libraries.library', ()):
-            for deviceset in get_subattr(lib, 'devicesets.deviceset', ()):
-                for cpt in self.make_deviceset_components(lib, deviceset):
-                    self.design.components.add_component(cpt.name, cpt)
+            self.make_library_components(lib)
+
+
+    def make_library_components(self, lib):
+        """ Construct openjson components from an eaglexml library. """
+
+        for deviceset in get_subattr(lib, 'devicesets.deviceset', ()):
+            for cpt in self.make_deviceset_components(lib, deviceset):
+                self.design.components.add_component(cpt.name, cpt)
 
 
     def make_deviceset_components(self, lib, deviceset):
@@ -0,0 +1,104 @@
+#!/usr/bin/env python2
+""" Read an Eagle XML file as a stream of elements """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The generateDS model in generated_g builds an object for every
+# element of a file, layers and settings included. Here the file is
+# read with iterparse instead, and only the elements at the paths asked
+# for are kept, as Nodes which are read the same way as the generated
+# objects are. Every other element is dropped as soon as it ends.
+
+try:
+    from xml.etree.cElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
+
+# the tags which can occur more than once in their parent element
+# (eagle.dtd), which the generated objects keep in lists
+REPEATED = frozenset((
+    'approved', 'attribute', 'bus', 'circle', 'class', 'clearance',
+    'connect', 'contactref', 'device', 'deviceset', 'element', 'frame',
+    'gate', 'hole', 'instance', 'junction', 'label', 'layer', 'library',
+    'net', 'note', 'package', 'pad', 'param', 'part', 'pass', 'pin',
+    'pinref', 'polygon', 'rectangle', 'segment', 'setting', 'sheet',
+    'signal', 'smd', 'symbol', 'technology', 'text', 'variant',
+    'variantdef', 'vertex', 'via', 'wire'))
+
+
+class Node(object):
+    """ An element read from an Eagle XML file, with the interface of the
+    generateDS objects: its XML attributes and its child elements are
+    python attributes, the XML attributes first (eg. the symbol of a
+    gate). Children with a tag in REPEATED are a list, any other child
+    is a Node, and anything missing is None. The text of the element is
+    in valueOf_. """
+
+    def __init__(self, element):
+        fields = self.__dict__
+        fields.update(element.attrib)
+        text = element.text or ''
+        for child in element:
+            tag = child.tag
+            if tag in REPEATED:
+                fields.setdefault(tag, []).append(Node(child))
+            else:
+                fields.setdefault(tag, Node(child))
+            text += child.tail or ''
+        fields.setdefault('valueOf_', text)
+
+
+    def __getattr__(self, name):
+        # only called for what the element doesn't have
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return [] if name in REPEATED else None
+
+
+def iter_nodes(source, paths):
+    """ Generate (path, Node) for each element of an open Eagle XML file
+    at one of paths, as the element ends. A path is a tuple of the tags
+    below the root element, eg. ('drawing', 'schematic', 'parts',
+    'part'). Elements which are not at or inside one of the paths are
+    thrown away as they end, so only the ancestors of the element being
+    read are ever held in memory. """
+
+    tags = frozenset(path[-1] for path in paths)
+    path = []
+    parents = []
+    inside = None # the element at one of paths being read, if any
+
+    for event, element in iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            path.append(element.tag)
+            parents.append(element)
+            if (inside is None and element.tag in tags
+                    and tuple(path[1:]) in paths):
+                inside = element
+            continue
+
+        path.pop()
+        parents.pop()
+        if element is inside:
+            yield tuple(path[1:]) + (element.tag,), Node(element)
+            inside = None
+        if inside is None and parents:
+            # its earlier siblings are gone, so it is the only child
+            parents[-1].remove(element)
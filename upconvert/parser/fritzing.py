@@ -26,6 +26,7 @@ from upconvert.core.shape import Circle, Line, Polygon, Rectangle, BezierCurve
 from upconvert.core.net import Net, NetPoint, ConnectedComponent
 
 from upconvert.library.fritzing import lookup_part
+from upconvert.utils.inputs import input_name, list_archive, open_input, read_head
 
 from xml.etree.ElementTree import ElementTree
 
@@ -66,25 +67,23 @@ class Fritzing(object):
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an fritzing file """
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0
         if 'fritzingVersion' in data:
             confidence += 0.9
-        elif filename.endswith('.fzz'):
+        elif input_name(filename).endswith('.fzz'):
             confidence += 0.9
-        if confidence == 0 and zipfile.is_zipfile(filename):
-            zip_file = zipfile.ZipFile(filename)
-            for name in zip_file.namelist():
+        if confidence == 0:
+            for name in list_archive(filename):
                 if name.endswith('.fz'):
                     confidence += 0.9
                     break
-            zip_file.close()
         return confidence
 
 
     def parse(self, filename):
-        """ Parse a Fritzing file into a design """
+        """ Parse a Fritzing file (a file name or an open file-like
+        object) into a design """
 
         tree = self.make_tree(filename)
 
@@ -107,18 +106,18 @@ class Fritzing(object):
 
     def make_tree(self, filename):
         """
-        Return an ElementTree for the given file name.
+        Return an ElementTree for the given file name or file-like
+        object.
         """
 
         if zipfile.is_zipfile(filename):
             self.fzz_zipfile = zipfile.ZipFile(filename)
             fz_name = [name for name in self.fzz_zipfile.namelist()
                        if name.endswith('.fz')][0]
-            fz_file = self.fzz_zipfile.open(fz_name)
-        else:
-            fz_file = filename
+            return ElementTree(file=self.fzz_zipfile.open(fz_name))
 
-        return ElementTree(file=fz_file)
+        with open_input(filename) as fz_file:
+            return ElementTree(file=fz_file)
 
     def parse_instance(self, instance):
         """ Parse a Fritzing instance block """
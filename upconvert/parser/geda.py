@@ -59,10 +59,11 @@
 import os
 import zipfile
 import logging
-import tempfile
 import itertools
 
 from collections import defaultdict
+from contextlib import closing
+from io import BytesIO
 from math import pi, cos, sin
 from StringIO import StringIO
 
@@ -72,10 +73,13 @@ from upconvert.core import net
 
 from upconvert.core.design import Design
 from upconvert.core.annotation import Annotation
+from upconvert.core.connectivity import build_nets, find_interior_points
 from upconvert.core.component_instance import ComponentInstance
 from upconvert.core.component_instance import SymbolAttribute
 
 from upconvert.parser import geda_commands
+from upconvert.library.geda import find_symbols
+from upconvert.utils.inputs import input_name, is_buffer, open_input, read_all
 
 # pylint: disable=R0904
 
@@ -201,15 +205,19 @@ class GEDA:
         ']': [],  # embedded component
     }
 
-    def __init__(self, symbol_dirs=None):
+    def __init__(self, symbol_dirs=None, libraries=None):
         """ Constuct a gEDA parser object. Specifying a list of symbol
             directories in *symbol_dir* will provide a symbol file
-            lookup in the specified directories. The lookup will be
-            generated instantly examining each directory (if it exists).
+            lookup in the specified directories. The lookup is served
+            from the symbol index of each directory (if it exists), see
+            :py:func:upconvert.library.geda.find_symbols.
 
             Kwargs:
                 symbol_dirs (list): List of directories containing .sym
                     files
+                libraries (dict): Symbol file names mapped to open
+                    file-like objects, used like .sym files next to
+                    the schematic
         """
         self.offset = shape.Point(40000, 40000)
         ## Initialise frame size with largest possible size
@@ -228,6 +236,7 @@ class GEDA:
             [os.path.join(os.path.dirname(__file__), '..', 'library', 'geda')]
 
         self.known_symbols = find_symbols(symbol_dirs)
+        self.libraries = libraries or {}
 
         self.design = None
         self.segments = None
@@ -241,8 +250,7 @@ class GEDA:
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an geda schematic """
-        with open(filename, 'rU') as f:  # pylint: disable=C0103
-            data = f.read()
+        data = read_all(filename)
         confidence = 0
         if data[0:2] == 'v ':
             confidence += 0.51
@@ -269,16 +277,23 @@ class GEDA:
         self.offset.y = point.y
 
     def parse(self, inputfile):
-        """ Parse a gEDA file into a design.
+        """ Parse a gEDA file (a file name or an open file-like
+            object) into a design.
 
             Returns the design corresponding to the gEDA file.
         """
-        directory, _ = os.path.split(inputfile)
+        if not is_buffer(inputfile):
+            directory, _ = os.path.split(inputfile)
 
-        for dir_file in os.listdir(directory):
-            if dir_file.endswith('.sym'):
-                lib_name, _, _ = dir_file.partition('.sym')
-                self.known_symbols[lib_name.lower()] = directory + '/' + dir_file
+            for dir_file in os.listdir(directory):
+                if dir_file.endswith('.sym'):
+                    lib_name, _, _ = dir_file.partition('.sym')
+                    self.known_symbols[lib_name.lower()] = directory + '/' + dir_file
+
+        for lib_file, symbol in self.libraries.iteritems():
+            if lib_file.endswith('.sym'):
+                lib_name, _, _ = os.path.basename(lib_file).partition('.sym')
+                self.known_symbols[lib_name.lower()] = symbol
 
         inputfiles = []
 
@@ -323,7 +338,7 @@ class GEDA:
 
             self.parse_schematic(f_in)
 
-            basename, _ = os.path.splitext(os.path.basename(filename))
+            basename, _ = os.path.splitext(os.path.basename(input_name(filename)))
             self.design.design_attributes.metadata.set_name(basename)
 
             ## modify offset for next page to be shifted to the right
@@ -400,7 +415,7 @@ class GEDA:
         self.offset.y = params['y']
 
         filename = self.known_symbols.get(params['basename'].lower())
-        if not filename or not os.path.exists(filename):
+        if not filename or not (is_buffer(filename) or os.path.exists(filename)):
             log.warn("could not find title symbol '%s'" % params['basename'])
             self.frame_width = 46800
             self.frame_height = 34000
@@ -411,7 +426,7 @@ class GEDA:
             '_geda_titleframe', params['basename'],
         )
 
-        with open(filename, 'rU') as stream:
+        with open_input(filename, 'rU') as stream:
             obj_type, params = self._parse_command(stream)
 
             while obj_type is not None:
@@ -532,7 +547,7 @@ class GEDA:
                     return None, None
 
                 ## requires parsing of referenced symbol file
-                with open(self.known_symbols[basename.lower()], "rU") as f_in:
+                with open_input(self.known_symbols[basename.lower()], "rU") as f_in:
                     self._check_version(f_in)
                     component = self.parse_component_data(f_in, params)
 
@@ -710,13 +725,17 @@ class GEDA:
         ## check if segments need to be divided
         add_segs = set()
         rem_segs = set()
-        for segment in self.segments:
-            for point in self.net_points.values():
-                if self.intersects_segment(segment, point):
-                    pt_a, pt_b = segment
-                    rem_segs.add(segment)
-                    add_segs.add((pt_a, point))
-                    add_segs.add((point, pt_b))
+        interior = find_interior_points(
+            self.segments,
+            self.net_points.values(),
+            coord=lambda point: (point.x, point.y),
+        )
+        for segment, points in interior.iteritems():
+            pt_a, pt_b = segment
+            rem_segs.add(segment)
+            for point in points:
+                add_segs.add((pt_a, point))
+                add_segs.add((point, pt_b))
 
         self.segments -= rem_segs
         self.segments |= add_segs
@@ -749,30 +768,6 @@ class GEDA:
             self.net_points[(x, y)] = net.NetPoint('%da%d' % (x, y), x, y)
         return self.net_points[(x, y)]
 
-    @staticmethod
-    def intersects_segment(segment, pt_c):
-        """ Checks if point *pt_c* lays on the *segment*. This code is
-            adapted from the kiCAD parser.
-            Returns True if *pt_c* is on *segment*, False otherwise.
-        """
-        pt_a, pt_b = segment
-
-        #check vertical segment
-        if pt_a.x == pt_b.x == pt_c.x:
-            if min(pt_a.y, pt_b.y) < pt_c.y < max(pt_a.y, pt_b.y):
-                return True
-        #check vertical segment
-        elif pt_a.y == pt_b.y == pt_c.y:
-            if min(pt_a.x, pt_b.x) < pt_c.x < max(pt_a.x, pt_b.x):
-                return True
-        #check diagonal segment
-        elif (pt_c.x - pt_a.x) * (pt_b.y - pt_a.y) \
-              == (pt_b.x - pt_a.x) * (pt_c.y - pt_a.y):
-            if min(pt_a.x, pt_b.x) < pt_c.x < max(pt_a.x, pt_b.x):
-                return True
-        ## point C not on segment
-        return False
-
     def _parse_environment(self, stream):
         """ Checks if attribute environment starts in the next line
             (marked by '{'). Environment only contains text elements
@@ -811,53 +806,18 @@ class GEDA:
         """ Calculate connected nets from previously stored segments
             and netpoints. The code has been adapted from the kiCAD
             parser since the definition of segments in the schematic
-            file are similar. The segments are checked against
-            existing nets and added when they touch it. For this
+            file are similar. Segments sharing a net point are
+            grouped into nets by :py:func:build_nets. For this
             to work, it is required that intersecting segments are
             divided prior to this method.
 
             Returns a list of valid nets and its net points.
         """
-        nets = []
-
-        used_points = set() # set([NetPoint])
-
-        # Iterate over the segments, removing segments when added to a net
-        while self.segments:
-            seg = self.segments.pop()  # pick a point
-
-            net_name = ''
-            pt_a, pt_b = seg
-            if pt_a.point_id in self.net_names:
-                net_name = self.net_names[pt_a.point_id]
-            elif pt_b.point_id in self.net_names:
-                net_name = self.net_names[pt_b.point_id]
-
-            new_net = net.Net(net_name)
-            map(used_points.add, seg)
-            new_net.connect(seg)
-            found = True
-
-            if net_name:
-                new_net.attributes['name'] = net_name
-
-            while found:
-                found = set()
-
-                for seg in self.segments:  # iterate over segments
-                    if new_net.connected(seg):  # segment touching the net
-                        map(used_points.add, seg)
-                        new_net.connect(seg)  # add the segment
-                        found.add(seg)
-
-                for seg in found:
-                    self.segments.remove(seg)
-
-            nets.append(new_net)
+        nets = build_nets(self.segments, self.net_points.itervalues())
 
         # check if names are available for calculated nets
         for net_obj in nets:
-            for point_id, point in net_obj.points.items():
+            for point_id in net_obj.points:
                 ## check for stored net names based on pointIDs
                 if point_id in self.net_names:
                     net_obj.net_id = self.net_names[point_id]
@@ -872,18 +832,6 @@ class GEDA:
                 )
                 net_obj.add_annotation(annotation)
 
-        # add single-point nets for overlapping pins that are not
-        # already in other nets
-        for point in set(self.net_points.itervalues()) - used_points:
-            if len(point.connected_components) > 1:
-                new_net = net.Net('')
-                new_net.add_point(point)
-                nets.append(new_net)
-
-        for net_obj in nets:
-            if not net_obj.net_id:
-                net_obj.net_id = min(net_obj.points)
-
         return nets
 
     def _open_file_or_zip(self, filename, mode='rU'):
@@ -891,12 +839,15 @@ class GEDA:
         Open the file with *filename* and return a file
         handle for it. If the current file is a ZIP file
         the filename will be treated as compressed file in
-        this ZIP file.
+        this ZIP file, which is read into memory.
         """
         if self.geda_zip is not None:
-            temp_dir = tempfile.mkdtemp()
-            self.geda_zip.extract(filename, temp_dir)
-            filename = os.path.join(temp_dir, filename)
+            with closing(self.geda_zip.open(filename, mode)) as f_in:
+                return BytesIO(f_in.read())
+
+        if is_buffer(filename):
+            with open_input(filename, mode) as f_in:
+                return BytesIO(f_in.read())
 
         return open(filename, mode)
 
@@ -1451,25 +1402,3 @@ class GEDA:
             angle = abs(360 - angle)
         return round(angle / 180.0, 1)
 
-
-def find_symbols(symbol_dirs):
-    """ Parses each directory in *symbol_dirs* searching for
-        gEDA symbol files based on its extension (extension: .sym).
-        It creates a symbol file lookup of basename (without
-        extension) and absolute path to the symbol file.
-
-        Returns a dictionary of file basename and absolute path.
-    """
-    known_symbols = {}
-    for symbol_dir in symbol_dirs:
-        if os.path.exists(symbol_dir):
-            for dirpath, dirnames, filenames in os.walk(symbol_dir):
-                dirnames.sort()
-                for filename in filenames:
-                    if filename.endswith('.sym'):
-                        filepath = os.path.join(dirpath, filename)
-                        filename, _ = os.path.splitext(filename)
-                        if filename.lower() not in known_symbols:
-                            known_symbols[filename.lower()] = filepath
-
-    return known_symbols
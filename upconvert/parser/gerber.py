@@ -22,7 +22,9 @@
 import re
 from math import sqrt, sin, cos, acos, pi
 from collections import namedtuple
-from zipfile import ZipFile
+from multiprocessing import Pool, current_process
+from StringIO import StringIO
+from zipfile import ZipFile, is_zipfile
 from tarfile import TarFile, ReadError
 import csv
 from os import path
@@ -32,6 +34,7 @@ from upconvert.core.layout import Layout, Layer, Image, Macro, Primitive
 from upconvert.core.layout import Fill, Smear, ShapeInstance, Aperture
 from upconvert.core.shape import Line, Arc, Point, Circle, Rectangle
 from upconvert.core.shape import Obround, RegularPolygon, Polygon, Moire, Thermal
+from upconvert.utils.inputs import input_name, is_buffer, read_head, read_input
 
 
 # exceptions
@@ -130,6 +133,10 @@ TOK_SPEC = (('MACRO', r'%AM[^%]*%'),
            ) + tuple([(p, r'%s[^\*]*\*' % p) for p in ALL_PARAMS]) + (
             ('COMMENT', r'G04[^\*]*\*'),
             ('DEPRECATED', r'G54\*?'), # historic crud
+            ('DATA', r'(?=[GDXY])(?:G(?P<g>\d\d))?(?:X(?P<x>[+-]?\d+))?'
+                     r'(?:Y(?P<y>[+-]?\d+))?(?:I(?P<i>[+-]?\d+))?'
+                     r'(?:J(?P<j>[+-]?\d+))?(?:D(?P<d>\d*))?\*'),
+                                       # well-formed funct/coord
             ('FUNCT', r'[GD][^\*]*\*'),# function codes
             ('COORD', r'[XY][^\*]*\*'),# coordinates
             ('EOF', r'M02\*'),         # end of file
@@ -145,8 +152,9 @@ TOK_RE = re.compile(REG_EX, re.MULTILINE)
 class Gerber:
     """ The Gerber Format Parser """
 
-    def __init__(self, ignore_unknown=True):
+    def __init__(self, ignore_unknown=True, processes=None):
         self.ignore_unknown = ignore_unknown
+        self.processes = processes # for batches; None parses layers in turn
         self.layout = Layout()
         self.layer_buff = None
         self.macro_buff = None
@@ -182,8 +190,7 @@ class Gerber:
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an gerber file """
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0
         if '%ADD' in data:
             confidence += 0.2
@@ -195,19 +202,27 @@ class Gerber:
             confidence += 0.2
         if 'M02*' in data:
             confidence += 0.2
-        if filename.endswith('.ger'):
+        if input_name(filename).endswith('.ger'):
             confidence += 0.5
         return confidence
 
 
     def parse(self, infile='.'):
-        """ Parse tokens from gerber files into a design. """
-        is_zip = infile.endswith('.zip')
-        openarchive = ZipFile if is_zip else TarFile.open
+        """ Parse tokens from gerber files into a design. An open
+        file-like object is read as an archive or a single gerber file. """
+        if is_buffer(infile):
+            infile.seek(0)
+            is_zip = is_zipfile(infile)
+            infile.seek(0)
+            openarchive = ZipFile if is_zip else \
+                (lambda fileobj: TarFile.open(fileobj=fileobj))
+        else:
+            is_zip = infile.endswith('.zip')
+            openarchive = ZipFile if is_zip else TarFile.open
         archive = batch_member = None
         try:
             # define multiple layers from folder
-            if LAYERS_CFG in infile:
+            if not is_buffer(infile) and LAYERS_CFG in infile:
                 archive = None
                 cfg_name = infile
                 cfg = open(cfg_name, 'r')
@@ -222,7 +237,7 @@ class Gerber:
 
         # define single layer from single gerber file
         except ReadError:
-            name, ext = path.split(infile)[1].rsplit('.', 1)
+            name, _, ext = path.split(input_name(infile))[1].rpartition('.')
             layer_defs = [LayerDef(ext.lower() == 'ger' and name or ext,
                                    'unknown', infile)]
             self._gen_layers(layer_defs, None, None)
@@ -256,23 +271,55 @@ class Gerber:
     # primary parser support methods
 
     def _gen_layers(self, layer_defs, archive, batch_member):
-        """ Parse gerbers into a PCB layers. """
+        """ Parse gerbers into a PCB layers.
+
+        Each layer is an independent gerber file, so each is parsed by
+        a photo plotter of its own. If processes is more than one, the
+        layers are parsed in that many worker processes (unless we are
+        one already). They are added to the layout in the order of
+        layer_defs. """
+        jobs = []
         for layer_def in layer_defs:
-            self.layer_buff = Layer(layer_def.name, layer_def.type)
-            self.macro_buff = {}
-            layer_file = (archive and
-                          batch_member(layer_def.filename) or
-                          open(layer_def.filename, 'r'))
-            for block in self._tokenize(layer_file):
-                if isinstance(block, MacroDef):
-                    self.macro_buff[block.name] = InternalMacro(block)
-                    effect = {}
-                elif isinstance(block, Funct):
-                    effect = self._do_funct(block)
-                else:
-                    effect = self._move(block)
-                self.status.update(effect)
-            self.layout.layers.append(self.layer_buff)
+            if archive:
+                layer_file = batch_member(layer_def.filename)
+                try:
+                    content = layer_file.read()
+                finally:
+                    layer_file.close()
+            else:
+                content = read_input(layer_def.filename)
+            jobs.append((self.ignore_unknown, layer_def, content))
+
+        processes = min(self.processes or 1, len(jobs))
+        if processes > 1 and not current_process().daemon:
+            pool = Pool(processes)
+            try:
+                results = pool.map(_plot_layer, jobs)
+            finally:
+                pool.terminate()
+                pool.join()
+        else:
+            results = [_plot_layer(job) for job in jobs]
+
+        for layer, units in results:
+            self.layout.layers.append(layer)
+            self.params['MO'] = units
+
+
+    def _gen_layer(self, layer_def, layer_file):
+        """ Parse a gerber file into a PCB layer. """
+        self.layer_buff = Layer(layer_def.name, layer_def.type)
+        self.macro_buff = {}
+        for block in self._tokenize(layer_file):
+            if isinstance(block, MacroDef):
+                self.macro_buff[block.name] = InternalMacro(block)
+                effect = {}
+            elif isinstance(block, Funct):
+                effect = self._do_funct(block)
+            else:
+                effect = self._move(block)
+            self.status.update(effect)
+        self.layout.layers.append(self.layer_buff)
 
 
     def _do_funct(self, block):
@@ -422,48 +469,65 @@ class Gerber:
     # tokenizer
 
     def _tokenize(self, layer_file):
-        """ Split gerber file into pythonic tokens. """
+        """ Split gerber file into pythonic tokens, in a single pass
+        over the layer. """
         content = layer_file.read()
         layer_file.close()
         param_block = eof = False
-        pos = 0
-        match = TOK_RE.match(content)
-        while pos < len(content):
-            if match is None:
-                pos += 1
-            else:
-                typ = match.lastgroup
-                tok = match.group(typ)[:-1]
-                try:
-                    if typ == 'MACRO':
-                        yield self._parse_macro(tok)
-                    elif typ == 'PARAM_DELIM':
-                        param_block = not param_block
-
-                    # params
-                    elif len(typ) == 2:
-                        self._check_pb(param_block, tok)
-                        self.params.update(self._parse_param(tok))
-
-                    # data blocks
-                    elif typ not in IGNORE:
-                        if typ == 'EOF':
-                            self._check_eof(content[match.end():])
-                            eof = True
-                        elif typ == 'UNKNOWN':
-                            if not self.ignore_unknown:
-                                raise UnintelligibleDataBlock(tok)
-                        else:
-                            self._check_pb(param_block, tok, False)
-                            # explode self-referential data blocks
-                            blocks = self._parse_data_block(tok)
-                            for block in blocks:
-                                yield block
-
-                except Unparsable:
-                    raise
-                pos = match.end()
-            match = TOK_RE.match(content, pos)
+
+        # coordinate values under the current format spec, by axis, and
+        # function codes, which are immutable so can be shared
+        decoded = (Memo(lambda num_str: self._format_dec(num_str, 4)),
+                   Memo(lambda num_str: self._format_dec(num_str, 5)))
+        functs = Memo(lambda key: Funct(*key))
+
+        for match in TOK_RE.finditer(content):
+            typ = match.lastgroup
+
+            # data blocks, exploding self-referential ones
+            if typ == 'DATA':
+                if param_block:
+                    self._check_pb(param_block, match.group(typ)[:-1], False)
+                g_code, x, y, i, j, d_code = match.group('g', 'x', 'y',
+                                                         'i', 'j', 'd')
+                if g_code is not None and int(g_code) in G_MAP:
+                    yield functs['G', g_code]
+                if x is None and y is None and i is None and j is None:
+                    if d_code:
+                        # identify D03 without coord - flash at current pos
+                        yield functs[d_code == '03' and 'XD' or 'D', d_code]
+                else:
+                    if d_code:
+                        yield functs['D', d_code]
+                    yield self._format_coord(decoded, x, y, i, j)
+                continue
+
+            tok = match.group(typ)[:-1]
+            if typ in ('FUNCT', 'COORD'):
+                self._check_pb(param_block, tok, False)
+                for block in self._parse_data_block(tok):
+                    yield block
+
+            elif typ == 'MACRO':
+                yield self._parse_macro(tok)
+            elif typ == 'PARAM_DELIM':
+                param_block = not param_block
+
+            # params
+            elif len(typ) == 2:
+                self._check_pb(param_block, tok)
+                self.params.update(self._parse_param(tok))
+                if typ == 'FS':
+                    for values in decoded:
+                        values.clear()
+
+            elif typ == 'EOF':
+                self._check_eof(content[match.end():])
+                eof = True
+            elif typ == 'UNKNOWN':
+                if not self.ignore_unknown:
+                    raise UnintelligibleDataBlock(tok)
+
         self._check_eof(eof=eof)
         self.layer_buff.images.append(self.img_buff)
 
@@ -669,6 +733,24 @@ class Gerber:
         return result
 
 
+    def _format_coord(self, decoded, x, y, i, j):
+        """ Convert the number strings of a well-formed coordinate set
+        into pythonic data. decoded is a pair of Memos of the values
+        of number strings on the a and b axes. """
+        self._check_fs()
+        a_values, b_values = decoded
+        # in the order _parse_coord pops them, so errors match
+        if j is not None:
+            j = b_values[j]
+        if i is not None:
+            i = a_values[i]
+        if y is not None:
+            y = b_values[y]
+        if x is not None:
+            x = a_values[x]
+        return Coord(x, y, i, j)
+
+
     def _format_dec(self, num_str, axis):
         """
         Interpret a coordinate value using format spec.
@@ -800,6 +882,16 @@ class Gerber:
         raise Unparsable('deliberate error')
 
 
+def _plot_layer(job):
+    """ Parse one layer of a batch with a photo plotter of its own,
+    returning the layer and its units. This is a module level function
+    so that it can run in a worker process. """
+    ignore_unknown, layer_def, content = job
+    plotter = Gerber(ignore_unknown)
+    plotter._gen_layer(layer_def, StringIO(content)) # pylint: disable=W0212
+    return plotter.layout.layers[0], plotter.params['MO']
+
+
 class InternalMacro(object):
     """
     Complex shape built from multiple primitives.
@@ -1093,6 +1185,18 @@ class Modifier(object):
             raise InvalidExpression(token, stack, values)
 
 
+class Memo(dict):
+    """ A dict which fills in a missing key with function(key). """
+
+    def __init__(self, function):
+        dict.__init__(self)
+        self.function = function
+
+    def __missing__(self, key):
+        value = self[key] = self.function(key)
+        return value
+
+
 class TraceBuffer(object):
     """
     Map precision-rounded points to traces for fast trace lookup.
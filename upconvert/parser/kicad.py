@@ -36,11 +36,14 @@
 from upconvert.core.design import Design
 from upconvert.core.components import Component, Symbol, SBody, Pin
 from upconvert.core.component_instance import ComponentInstance, SymbolAttribute
-from upconvert.core.net import Net, NetPoint, ConnectedComponent
+from upconvert.core.net import NetPoint, ConnectedComponent
 from upconvert.core.shape import Arc, Circle, Line, Rectangle, Label
 from upconvert.core.annotation import Annotation
+from upconvert.core.connectivity import build_nets, split_segments
 
-from upconvert.library.kicad import lookup_part
+from upconvert.library.kicad import lookup_part, scan_parts, \
+    LIBRARY_STORE, StoredLibrary
+from upconvert.utils.inputs import is_buffer, open_input, read_head
 
 from os.path import split
 from os import listdir
@@ -53,11 +56,15 @@ class KiCAD(object):
 
     library = None
 
+    def __init__(self, libraries=None):
+        # library file name -> open file-like object, for libraries
+        # that are not files next to the schematic
+        self.libraries = libraries or {}
+
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an kicad schematic """
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0
         if 'EESchema Schematic' in data:
             confidence += 0.75
@@ -65,7 +72,8 @@ class KiCAD(object):
 
 
     def parse(self, filename, library_filename=None):
-        """ Parse a kicad file into a design """
+        """ Parse a kicad file (a file name or an open file-like object)
+        into a design """
 
         design = Design()
         segments = set() # each wire segment
@@ -76,15 +84,19 @@ class KiCAD(object):
         self.library = KiCADLibrary()
 
         if library_filename is None:
-            directory, _ = split(filename)
-            for dir_file in listdir(directory):
-                if dir_file.endswith('.lib'):
-                    self.library.parse(directory + '/' + dir_file)
+            if not is_buffer(filename):
+                directory, _ = split(filename)
+                for dir_file in listdir(directory):
+                    if dir_file.endswith('.lib'):
+                        self.library.parse(directory + '/' + dir_file)
+            for lib_name in sorted(self.libraries):
+                if lib_name.endswith('.lib'):
+                    self.library.parse(self.libraries[lib_name])
 
         for cpt in self.library.components:
             design.add_component(cpt.name, cpt)
 
-        with open(filename) as f:
+        with open_input(filename) as f:
             libs = []
             line = f.readline().strip()
 
@@ -123,6 +135,8 @@ class KiCAD(object):
 
         design.scale(MULT)
 
+        LIBRARY_STORE.flush()
+
         return design
 
 
@@ -241,36 +255,9 @@ class KiCAD(object):
         return inst, comp
 
 
-    def intersect(self, segment, ptc):
-        """ Does point c intersect the segment """
-        pta, ptb = segment
-        ptax, ptay, ptbx, ptby, ptcx, ptcy = pta + ptb + ptc
-        if ptax == ptbx == ptcx: # Vertical
-            if min(ptay, ptby) < ptcy < max(ptay, ptby): # between a and b
-                return True
-        elif ptay == ptby == ptcy: # Horizontal
-            if min(ptax, ptbx) < ptcx < max(ptax, ptbx): # between a and b
-                return True
-        elif (ptcx-ptax)*(ptby-ptay)==(ptbx-ptax)*(ptcy-ptay): # Diagonal
-            if min(ptax, ptbx) < ptcx < max(ptax, ptbx): # between a and b
-                return True
-        return False
-
-
     def divide(self, segments, junctions):
         """ Divide segments by junctions """
-        for ptc in junctions:
-            toremove = set()
-            toadd = set()
-            for seg in segments:
-                if self.intersect(seg, ptc):
-                    pta, ptb = seg
-                    toremove.add((pta, ptb))
-                    toadd.add((pta, ptc))
-                    toadd.add((ptc, ptb))
-            segments -= toremove
-            segments |= toadd
-        return segments
+        return split_segments(segments, junctions)
 
 
     def calc_nets(self, design, segments):
@@ -293,44 +280,8 @@ class KiCAD(object):
 
         # turn the (x, y) points into unique NetPoint objects
         segments = set((get_point(p1), get_point(p2)) for p1, p2 in segments)
-        nets = []
-
-        # Iterate over the segments, removing segments when added to a net
-        while segments:
-            seg = segments.pop() # pick a point
-            newnet = Net('')
-            map(pin_points.discard, seg) # mark points as used
-            newnet.connect(seg)
-            found = True
-
-            while found:
-                found = set()
-
-                for seg in segments: # iterate over segments
-                    if newnet.connected(seg): # segment touching the net
-                        map(pin_points.discard, seg) # mark points as used
-                        newnet.connect(seg) # add the segment
-                        found.add(seg)
-
-                for seg in found:
-                    segments.remove(seg)
-
-            nets.append(newnet)
 
-        # add single-point nets for overlapping pins that are not
-        # already in other nets
-        for point in pin_points:
-            if len(point.connected_components) > 1:
-                net = Net('')
-                net.add_point(point)
-                nets.append(net)
-
-        for net in nets:
-            net.net_id = min(net.points)
-
-        nets.sort(key=lambda net : net.net_id)
-
-        return nets
+        return build_nets(segments, pin_points)
 
 
     def make_pin_points(self, design, point_factory):
@@ -378,45 +329,86 @@ ROTFLIP2MATRIX = dict((v, k) for k, v in MATRIX2ROTATIONFLIP.iteritems())
 class KiCADLibrary(object):
     """
     I represent a library of kicad parts.
+
+    Library files are indexed by component name and alias when they are
+    parsed. Unless lazy is False, a component is only built the first
+    time it is looked up (or all of them are, when components is read),
+    so the work done scales with the parts a design uses.
     """
 
-    def __init__(self):
-        self.components = []
-        self.name2cpt = {}
+    def __init__(self, lazy=True):
+        self.lazy = lazy
+        self.refs = [] # (StoredLibrary, index) of each component
+        self.name2ref = {}
+        self.ref2cpt = {}
+
+    @property
+    def components(self):
+        """ All the components, in the order they were parsed """
+        self.build_all(self.refs)
+        return [self.ref2cpt[ref] for ref in self.refs]
+
+    def build(self, ref):
+        """ Return the component for a (StoredLibrary, index) ref,
+        building it the first time it is asked for """
+        cpt = self.ref2cpt.get(ref)
+        if cpt is None:
+            library, index = ref
+            cpt = self.ref2cpt[ref] = library.part(index)
+        return cpt
+
+    def build_all(self, refs):
+        """ Build the components for all the refs not built yet, a
+        library file at a time """
+        missing = {}
+        for ref in refs:
+            if ref not in self.ref2cpt:
+                missing.setdefault(ref[0], []).append(ref[1])
+
+        for library, indexes in missing.iteritems():
+            for index, cpt in zip(indexes, library.components(indexes)):
+                self.ref2cpt[library, index] = cpt
 
     def lookup_part(self, name):
         """
         Return a kicad component by name, or None if not found.
         """
 
-        return self.name2cpt.get(name.upper())
+        ref = self.name2ref.get(name.upper())
+        if ref is None:
+            return None
+        return self.build(ref)
 
     def __getitem__(self, name):
         return self.lookup_part(name)
 
     def __contains__(self, name):
-        return self.lookup_part(name) != None
+        return name.upper() in self.name2ref
 
     def parse(self, filename):
         """
-        Parse the library file, and update the KiCADLibrary.
+        Parse the library file (or file-like object), and update the
+        KiCADLibrary.
         """
 
-        new_components = []
-
-        with open(filename) as f:
-            for line in f:
-                if line.startswith('DEF '):
-                    new_components.append(ComponentParser(line).parse(f))
-
-        for new_component in new_components:
-            new_component.name = new_component.name.upper()
-            if new_component.name not in self.name2cpt:
-                self.name2cpt[new_component.name] = new_component
-                self.components.append(new_component)
-                if 'kicad_alias' in new_component.attributes:
-                    for name in new_component.attributes['kicad_alias'].split():
-                        self.name2cpt[name.upper()] = new_component
+        if is_buffer(filename):
+            library = StoredLibrary(filename, None, scan_parts(filename))
+        else:
+            library = LIBRARY_STORE.get(filename)
+        new_refs = []
+
+        for index, (name, aliases) in enumerate(library.names()):
+            if name not in self.name2ref:
+                ref = (library, index)
+                self.name2ref[name] = ref
+                new_refs.append(ref)
+                for alias in aliases:
+                    self.name2ref[alias] = ref
+
+        self.refs.extend(new_refs)
+
+        if not self.lazy:
+            self.build_all(new_refs)
 
 
 class ComponentParser(object):
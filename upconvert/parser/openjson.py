@@ -31,9 +31,12 @@ from upconvert.core.components import Component, Symbol, SBody, Pin, FBody, Foot
 from upconvert.core.design import Design
 from upconvert.core.design_attributes import DesignAttributes, Metadata
 from upconvert.core.generated_object import parse_gen_obj_json, Path, Pour
-from upconvert.core.shape import Rectangle, RoundedRectangle, Arc, Circle, Label, Line, Polygon, BezierCurve, RoundedSegment, Point
+from upconvert.core.shape import Rectangle, RoundedRectangle, Arc, Circle, Label, Line, Polygon, BezierCurve, RoundedSegment, Point, \
+    PointArray
 from upconvert.core.net import Net, NetPoint, ConnectedComponent
 from upconvert.core.layout import Segment, Layer
+from upconvert.utils import jsonstream
+from upconvert.utils.inputs import input_size, open_input, read_all
 
 log = logging.getLogger('parser.openjson')
 
@@ -43,15 +46,32 @@ class JSON(object):
     This is mostly for sanity checks, it reads in the Open JSON format,
     and then outputs it. """
 
-    def __init__(self):
+    # the list sections that are read an element at a time when
+    # streaming (as are components), and the method that parses a one
+    # element list of them
+    STREAMED = {'component_instances': 'parse_component_instances',
+                'shapes': 'parse_sch_shapes',
+                'nets': 'parse_nets',
+                'layer_options': 'parse_layer_options',
+                'trace_segments': 'parse_trace_segments',
+                'gen_objs': 'parse_layout_objects',
+                'paths': 'parse_paths',
+                'pours': 'parse_pours',
+                'text': 'parse_pcb_text'}
+
+    # files bigger than this are streamed, unless told otherwise
+    STREAM_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, stream=None):
         self.design = Design()
+        self.stream = stream
+        self.unlinked = None # instances waiting for their components
 
 
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an openjson file """
-        with open(filename, 'r') as f:
-            data = f.read()
+        data = read_all(filename)
         confidence = 0
         if 'component_instances' in data:
             confidence += 0.3
@@ -61,10 +81,18 @@ class JSON(object):
 
 
     def parse(self, filename):
-        """ Parse the openjson file into the core. """
+        """ Parse the openjson file (a file name or an open file-like
+        object) into the core. """
         log.debug('Starting parse of %s', filename)
-        with open(filename) as f:
-            read = json.loads(f.read())
+        stream = self.stream
+        if stream is None:
+            stream = input_size(filename) > self.STREAM_BYTES
+
+        with open_input(filename) as f:
+            if stream:
+                read = self.read_stream(f)
+            else:
+                read = json.loads(f.read())
 
         self.parse_components(read.get('components'))
         self.parse_component_instances(read.get('component_instances'))
@@ -85,6 +113,46 @@ class JSON(object):
         return self.design
 
 
+    def read_stream(self, f):
+        """ Read an open openjson file as a stream of events, parsing the
+        components, instances, nets etc. into the core as each one is
+        read, so there is only ever one of them in JSON form. Returns the
+        sections of the file with the streamed ones left empty, for the
+        rest to be parsed the same way parse() does it. """
+        events = jsonstream.basic_parse(f)
+        if next(events)[0] != 'start_map':
+            raise ValueError('openjson file is not a JSON object')
+
+        # instances come before the components they refer to in files
+        # with sorted keys, so they are linked up at the end
+        self.unlinked = []
+        read = {}
+
+        for _, key in iter(events.next, ('end_map', None)):
+            event, value = next(events)
+            if key == 'components' and event == 'start_map':
+                for _, library_id in iter(events.next, ('end_map', None)):
+                    event, value = next(events)
+                    component = jsonstream.build_value(events, event, value)
+                    self.parse_components({library_id: component})
+                read[key] = {}
+            elif key in self.STREAMED and event == 'start_array':
+                parse_section = getattr(self, self.STREAMED[key])
+                for event, value in iter(events.next, ('end_array', None)):
+                    element = jsonstream.build_value(events, event, value)
+                    parse_section([element])
+                read[key] = []
+            else:
+                read[key] = jsonstream.build_value(events, event, value)
+
+        components = self.design.components.components
+        for inst in self.unlinked:
+            inst.library_component = components[inst.library_id]
+        self.unlinked = None
+
+        return read
+
+
     def parse_version(self, version):
         """ Extract the file version. """
         file_version = version.get('file_version')
@@ -116,7 +184,8 @@ class JSON(object):
             return None
 
         for path_json in paths_json:
-            points = [Point(point_json['x'], point_json['y']) for point_json in path_json['points']]
+            points = PointArray((point_json['x'], point_json['y'])
+                                for point_json in path_json['points'])
             width = path_json['width']
             is_closed = path_json['is_closed']
             layer = path_json['layer']
@@ -129,7 +198,8 @@ class JSON(object):
             return None
 
         for pour_json in pours_json:
-            points = [Point(point_json['x'], point_json['y']) for point_json in pour_json['points']]
+            points = PointArray((point_json['x'], point_json['y'])
+                                for point_json in pour_json['points'])
 
             layer = pour_json['layer']
             subtractive_shapes = [];
@@ -173,7 +243,13 @@ class JSON(object):
             symbol_index = int(instance.get('symbol_index'))
             footprint_index = int(instance.get('footprint_index'))
             # Make the ComponentInstance()
-            inst = ComponentInstance(instance_id, self.design.components.components[library_id], library_id, symbol_index, footprint_index)
+            if self.unlinked is None:
+                library_component = self.design.components.components[library_id]
+            else:
+                library_component = None
+            inst = ComponentInstance(instance_id, library_component, library_id, symbol_index, footprint_index)
+            if self.unlinked is not None:
+                self.unlinked.append(inst)
 
             # Get the SymbolAttributes
             for symbol_attribute in instance.get('symbol_attributes', []):
@@ -32,6 +32,7 @@ from upconvert.core.component_instance import ComponentInstance, FootprintAttrib
 from upconvert.core.net import Net, NetPoint, ConnectedComponent
 from upconvert.core.trace import Trace
 from upconvert.core.shape import Circle, Line, Rectangle, Polygon, Point, Arc
+from upconvert.utils.inputs import read_head, read_input
 
 from string import whitespace
 from sys import maxint
@@ -55,20 +56,19 @@ class Specctra(object):
     @staticmethod
     def auto_detect(filename):
         """ Return our confidence that the given file is an specctra schematic """
-        with open(filename, 'r') as f:
-            data = f.read(4096)
+        data = read_head(filename)
         confidence = 0
         if '(pcb ' in data or '(PCB ' in data:
             confidence += 0.75
         return confidence
 
     def parse(self, filename):
-        """ Parse a specctra file into a design """
+        """ Parse a specctra file (a file name or an open file-like
+        object) into a design """
 
         self.design = Design()
 
-        with open(filename) as f:
-            data = f.read()
+        data = read_input(filename)
 
         tree = DsnParser().parse(data)
 
@@ -22,19 +22,29 @@
 # limitations under the License.
 
 import unittest
+from threading import Thread
+from os.path import dirname, join
+from StringIO import StringIO
 
 from upconvert.parser.eagle import Eagle
 
+TEST_DIR = join(dirname(__file__), '..', '..', '..', 'test', 'eagle')
+
+def parse_json(parser, filename):
+    """ Parse a file, and return the design's json minus its timestamp """
+    design = parser.parse(filename)
+    design.design_attributes.metadata.updated_timestamp = 0
+    return design.json()
+
 class EagleTests(unittest.TestCase):
     """ The tests of the eagle parser """
 
     def setUp(self):
         """ Setup the test case. """
-        Eagle.attr_jar = [Eagle.Attribute('name_a', 'value_a'),
-                            Eagle.Attribute('name_b', 'value_b'),
-                            Eagle.Attribute('name_c', 'value_c'),
-                         ]
-        Eagle.attr_jar_list = Eagle.attr_jar_iter()
+        self.strings = iter([Eagle.Attribute('name_a', 'value_a'),
+                             Eagle.Attribute('name_b', 'value_b'),
+                             Eagle.Attribute('name_c', 'value_c'),
+                            ])
 
     def tearDown(self):
         """ Teardown the test case. """
@@ -65,7 +75,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x11\x00\x78\x20\x99\xa0\x1a\x47",
                                  b"\xa9\xcd\x10\x02\x00\x78\x20\x99",
                                  b"\xa0\x1a\x47\xa9\xcd\x10\x00\x00"))
-        _settings = Eagle.Settings.parse(_valid_chunk)
+        _settings = Eagle.Settings.parse(_valid_chunk, self.strings)
 
         self.assertNotEqual(_settings, None)
 
@@ -78,7 +88,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x12\x00\x02\xaa\x0f\x00\x00\x00",
                                  b"\x7f\xc2\xd9\xad\x65\x32\xd9\x3f",
                                  b"\x00\x00\x00\x00\x00\x00\x24\x40"))
-        _grid = Eagle.Grid.parse(_valid_chunk)
+        _grid = Eagle.Grid.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_grid.distance, 0.1)
         self.assertEqual(_grid.unitdist, "mil")
@@ -97,7 +107,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x13\x00\x0f\x5b\x5b\x01\x02\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x4e",
                                  b"\x65\x74\x73\x00\x00\x00\x00\x00"))
-        _layer = Eagle.Layer.parse(_valid_chunk)
+        _layer = Eagle.Layer.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_layer.number, 91)
         self.assertEqual(_layer.name, "Nets")
@@ -115,7 +125,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x14\x80\x01\x00\x00\x00\x00\x00",
                                  b"\x02\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x7f\x10\xfa\x0d\x09"))
-        _attrheader = Eagle.AttributeHeader.parse(_valid_chunk)
+        _attrheader = Eagle.AttributeHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_attrheader.schematic, 'name_a')
         self.assertEqual(_attrheader.numofshapes, 1)
@@ -130,7 +140,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x15\x80\x00\x00\x09\x00\x00\x00",
                                  b"\x16\x00\x00\x00\x24\x00\x00\x00",
                                  b"\x64\x69\x6f\x64\x65\x00\x00\x00"))
-        _library = Eagle.Library.parse(_valid_chunk)
+        _library = Eagle.Library.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_library.name, "diode")
         self.assertEqual(_library.numofdevsetblocks, 9)
@@ -147,7 +157,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x17\x80\x00\x00\x08\x00\x00\x00",
                                  b"\x02\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x64\x69\x6f\x64\x65\x00\x00\x00"))
-        _devicesetheader = Eagle.DeviceSetHeader.parse(_valid_chunk)
+        _devicesetheader = Eagle.DeviceSetHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_devicesetheader.name, "diode")
         self.assertEqual(_devicesetheader.numofblocks, 8)
@@ -164,7 +174,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x18\x80\x00\x00\x15\x00\x00\x00",
                                  b"\x02\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x64\x69\x6f\x64\x65\x00\x00\x00"))
-        _symbolheader = Eagle.SymbolHeader.parse(_valid_chunk)
+        _symbolheader = Eagle.SymbolHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_symbolheader.name, "diode")
         self.assertEqual(_symbolheader.numofblocks, 21)
@@ -181,7 +191,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x19\x80\x00\x00\x23\x00\x00\x00",
                                  b"\x02\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x64\x69\x6f\x64\x65\x00\x00\x00"))
-        _packageheader = Eagle.PackageHeader.parse(_valid_chunk)
+        _packageheader = Eagle.PackageHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_packageheader.name, "diode")
         self.assertEqual(_packageheader.numofblocks, 35)
@@ -198,7 +208,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x1d\x00\x0a\x00\xf4\xfe\x62\xff",
                                  b"\x2e\x01\xa8\x00\x00\x00\x00\x00",
                                  b"\x5a\x44\x00\x00\x00\x00\x00\x00"))
-        _symbol = Eagle.Symbol.parse(_valid_chunk)
+        _symbol = Eagle.Symbol.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_symbol.name, "ZD")
         self.assertEqual(_symbol.numofshapes, 10)
@@ -216,7 +226,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x1e\x00\x0d\x00\x7c\xfe\xb5\xff",
                                  b"\x84\x01\x97\x00\x00\x7f\x34\xe3",
                                  b"\x2a\x09\x7f\x2b\xe3\x2a\x09\x00"))
-        _package = Eagle.Package.parse(_valid_chunk)
+        _package = Eagle.Package.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_package.name, 'name_a')
         self.assertEqual(_package.desc, 'name_b')
@@ -231,7 +241,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x1f\x80\x05\x00\xff\x7f\xff\x7f",
                                  b"\x00\x80\x00\x80\x00\x01\x00\x00",
                                  b"\x4e\x24\x31\x00\x00\x00\x00\x00"))
-        _net = Eagle.Net.parse(_valid_chunk)
+        _net = Eagle.Net.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_net.name, "N$1")
         self.assertEqual(_net.nclass, 1)
@@ -247,7 +257,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x38\x00\x02\x00\x01\x00\x02\x00",
                                  b"\x01\x01\x01\x49\x43\x39\x00\x00",
                                  b"\x44\x53\x33\x36\x36\x38\x00\x00"))
-        _part = Eagle.Part.parse(_valid_chunk)
+        _part = Eagle.Part.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_part.name, "IC9")
         self.assertEqual(_part.libid, 1)
@@ -267,7 +277,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x37\x80\x01\x00\x02\x00\x00\x84",
                                  b"\x44\x00\x00\x00\x00\x7f\xdd\x95",
                                  b"\x3c\x09\x31\x4e\x35\x33\x33\x33"))
-        _devset = Eagle.DeviceSet.parse(_valid_chunk)
+        _devset = Eagle.DeviceSet.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_devset.name, "1N5333")
         self.assertEqual(_devset.prefix, "D")
@@ -280,7 +290,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x37\x00\x01\x00\x02\x00\x01\x85",
                                  b"\x4A\x50\x00\x00\x00\x00\x00\x00",
                                  b"\x00\x00\x7f\xc1\xd3\xcf\x08\x00"))
-        _devset = Eagle.DeviceSet.parse(_valid_chunk)
+        _devset = Eagle.DeviceSet.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_devset.name, 'name_b')
         self.assertEqual(_devset.prefix, "JP")
@@ -298,7 +308,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x3a\x80\x04\x00\x42\x24\x33\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _bus = Eagle.Bus.parse(_valid_chunk)
+        _bus = Eagle.Bus.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_bus.name, "B$3")
         self.assertEqual(_bus.numofshapes, 4)
@@ -312,7 +322,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x1a\x00\x03\x00\x33\x01\x05\x0d",
                                  b"\x64\x07\x4b\x10\x04\x00\x00\x00",
                                  b"\x05\x00\x00\x00\x0e\x00\x00\x00"))
-        _shapeheader = Eagle.ShapeHeader.parse(_valid_chunk)
+        _shapeheader = Eagle.ShapeHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_shapeheader.numofshapes, 3)
         self.assertEqual(_shapeheader.numofpartblocks, 4)
@@ -326,7 +336,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x20\x00\x04\x00\xcd\x05\x9b\x01",
                                  b"\xc8\x13\x0d\x10\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _segment = Eagle.Segment.parse(_valid_chunk)
+        _segment = Eagle.Segment.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_segment.numofshapes, 4)
         self.assertEqual(_segment.cumulativenumofshapes, 19)
@@ -338,7 +348,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x21\x00\x03\x00\x05\xff\xfe\xff",
                                  b"\x27\xff\x34\x00\xfc\x01\xce\x18",
                                  b"\x00\x00\x15\x8e\x00\x00\x00\x00"))
-        _polygon = Eagle.Polygon.parse(_valid_chunk)
+        _polygon = Eagle.Polygon.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_polygon.numofshapes, 3)
         self.assertEqual(_polygon.width, 0.1016)
@@ -351,7 +361,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x36\x00\x01\x00\x04\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x27\x27\x00\x00\x00"))
-        _connheader = Eagle.ConnectionHeader.parse(_valid_chunk)
+        _connheader = Eagle.ConnectionHeader.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_connheader.numofshapes, 1)
         self.assertEqual(_connheader.sindex, 4)
@@ -364,7 +374,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x3c\x00\x21\x22\x23\x24\x25\x26",
                                  b"\x27\x28\x29\x2a\x2b\x2c\x2d\x2e",
                                  b"\x2f\x30\x00\x00\x00\x00\x00\x00"))
-        _connections = Eagle.Connections.parse(_valid_chunk)
+        _connections = Eagle.Connections.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_connections.connections, [33, 34, 35, 36, 37, 38, 
                             39, 40, 41, 42, 43, 44, 45, 46, 47, 48])
@@ -376,7 +386,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x30\x00\x02\x00\xd0\x54\x21\x00",
                                  b"\x40\x4d\x09\x00\xff\xff\x01\x00",
                                  b"\x00\x04\x01\x00\x00\x00\x00\x00"))
-        _instance = Eagle.Instance.parse(_valid_chunk)
+        _instance = Eagle.Instance.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_instance.numofshapes, 2)
         self.assertEqual(_instance.x, 218.44)
@@ -391,7 +401,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x22\x00\x00\x5b\xd8\x09\x05\x00",
                                  b"\x40\x4d\x09\x00\xd8\x09\x05\x00",
                                  b"\x60\xc0\x07\x00\xfa\x02\x03\x00"))
-        _wire = Eagle.Wire.parse(_valid_chunk)
+        _wire = Eagle.Wire.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_wire.x1, 33.02)
         self.assertEqual(_wire.y1, 60.96)
@@ -408,7 +418,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x28\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x90\xb4\x01\x00\x7e\x40\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _hole = Eagle.Hole.parse(_valid_chunk)
+        _hole = Eagle.Hole.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_hole.x, 0.)
         self.assertEqual(_hole.y, 11.176)
@@ -421,7 +431,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x2b\x80\x00\x01\x96\xb5\xff\xff",
                                  b"\x0e\x78\x00\x00\xe6\x0c\xb0\x27",
                                  b"\x00\x00\x00\x31\x34\x00\x00\x00"))
-        _smd = Eagle.SMD.parse(_valid_chunk)
+        _smd = Eagle.SMD.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_smd.name, "14")
         self.assertEqual(_smd.x, -1.905)
@@ -438,7 +448,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x22\x80\x30\x15\x8c\xba\xff\xff",
                                  b"\xce\x18\x00\x00\x78\xc4\xff\xff",
                                  b"\xba\x22\x00\x00\xfa\x02\x00\x79"))
-        _arc = Eagle.Wire.parse(_valid_chunk)
+        _arc = Eagle.Wire.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_arc.x1, -1.778)
         self.assertEqual(_arc.y1, 0.635)
@@ -455,7 +465,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x22\x00\x00\x5b\xc0\x80\x0f\xd8",
                                  b"\x48\xd0\x05\x70\xa0\x0d\x11\x11",
                                  b"\x40\x4d\x09\x00\xe8\x0b\x32\x81"))
-        _arc = Eagle.Wire.parse(_valid_chunk)
+        _arc = Eagle.Wire.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_arc.x1, 101.6)
         self.assertEqual(_arc.y1, 38.1)
@@ -476,7 +486,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x25\x00\x00\x5b\x48\x37\x12\x00",
                                  b"\xb0\x13\x0a\x00\xbd\x65\x01\x00",
                                  b"\xbd\x65\x01\x00\xf4\x05\x00\x00"))
-        _circle = Eagle.Circle.parse(_valid_chunk)
+        _circle = Eagle.Circle.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_circle.x, 119.38)
         self.assertEqual(_circle.y, 66.04)
@@ -491,7 +501,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x26\x80\x00\x5c\x50\x53\x02\x00",
                                  b"\xe8\x76\x0a\x00\x08\xea\x08\x00",
                                  b"\xa0\x0d\x11\x00\x00\x00\x00\x00"))
-        _rectangle = Eagle.Rectangle.parse(_valid_chunk)
+        _rectangle = Eagle.Rectangle.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_rectangle.x1, 15.24)
         self.assertEqual(_rectangle.y1, 68.58)
@@ -508,7 +518,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x2a\x80\x01\x00\x70\xc6\x00\x00",
                                  b"\x00\x00\x00\x00\xd4\x15\x00\x00",
                                  b"\x00\x00\x00\x41\x00\x00\x00\x00"))
-        _pad = Eagle.Pad.parse(_valid_chunk)
+        _pad = Eagle.Pad.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_pad.name, "A")
         self.assertEqual(_pad.x, 5.08)
@@ -525,7 +535,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x2c\x80\x00\x00\x38\x63\x00\x00",
                                  b"\x00\x00\x00\x00\x96\x00\x43\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _pin = Eagle.Pin.parse(_valid_chunk)
+        _pin = Eagle.Pin.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_pin.name, "C")
         self.assertEqual(_pin.x, 2.54)
@@ -540,7 +550,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x2c\x80\x41\x00\x90\x39\xff\xff",
                                  b"\x38\x63\x00\x00\x11\x01\x49\x4e",
                                  b"\x2b\x00\x00\x00\x00\x00\x00\x00"))
-        _pin = Eagle.Pin.parse(_valid_chunk)
+        _pin = Eagle.Pin.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_pin.name, "IN+")
         self.assertEqual(_pin.x, -5.08)
@@ -562,7 +572,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x2d\x00\x00\x00\xd0\x1f\xfc\xff",
                                  b"\x38\x63\x00\x00\x03\x00\x02\x00",
                                  b"\x50\x00\x00\x00\x00\x00\x00\x00"))
-        _gate = Eagle.Gate.parse(_valid_chunk)
+        _gate = Eagle.Gate.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_gate.name, "P")
         self.assertEqual(_gate.x, -25.4)
@@ -580,7 +590,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x31\x80\x02\x5b\x80\x9a\x12\x00",
                                  b"\xc0\x19\x03\x00\x02\x7e\x4c\x00",
                                  b"\x00\x08\x74\x65\x78\x74\x21\x00"))
-        _text = Eagle.Text.parse(_valid_chunk)
+        _text = Eagle.Text.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_text.value, "text!")
         self.assertEqual(_text.x, 121.92)
@@ -595,7 +605,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x31\x80\x02\x5b\x18\xf0\x01\x00",
                                  b"\x18\x57\x0e\x00\x02\x7e\x4c\x00",
                                  b"\x00\x00\x7f\xf8\xcd\x35\x09\x00"))
-        _text = Eagle.Text.parse(_valid_chunk)
+        _text = Eagle.Text.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_text.value, 'name_a')
         self.assertEqual(_text.x, 12.7)
@@ -613,7 +623,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x33\x00\x02\x5f\xe0\xf3\x0d\x00",
                                  b"\xa0\xa6\x04\x00\xe0\x0f\x0c\x00",
                                  b"\x00\x1c\x01\x00\x00\x00\x00\x00"))
-        _label = Eagle.Label.parse(_valid_chunk)
+        _label = Eagle.Label.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_label.x, 91.44)
         self.assertEqual(_label.y, 30.48)
@@ -632,7 +642,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x34\x00\x01\x5f\xd6\xd0\x21\x00",
                                  b"\x14\xe2\x09\x00\xc4\x1d\x20\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _attrnam = Eagle.AttributeNam.parse(_valid_chunk)
+        _attrnam = Eagle.AttributeNam.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_attrnam.x, 221.615)
         self.assertEqual(_attrnam.y, 64.77)
@@ -648,7 +658,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x35\x00\x01\x60\x3a\x9f\x21\x00",
                                  b"\xbe\x8d\x09\x00\xc4\x1d\x20\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _attrval = Eagle.AttributeVal.parse(_valid_chunk)
+        _attrval = Eagle.AttributeVal.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_attrval.x, 220.345)
         self.assertEqual(_attrval.y, 62.611)
@@ -664,7 +674,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x3f\x80\x01\x5f\x18\xf3\x3f\x00",
                                  b"\x40\xe6\xfc\xff\xba\x22\x20\x00",
                                  b"\x00\x10\x00\x00\x00\x00\x00\x00"))
-        _attrprt = Eagle.AttributePrt.parse(_valid_chunk)
+        _attrprt = Eagle.AttributePrt.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_attrprt.x, 419.1)
         self.assertEqual(_attrprt.y, -20.32)
@@ -680,7 +690,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x3d\x00\x00\x00\x06\x00\x01\x00",
                                  b"\x07\x00\x00\x00\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _pinref = Eagle.PinRef.parse(_valid_chunk)
+        _pinref = Eagle.PinRef.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_pinref.partno, 6)
         self.assertEqual(_pinref.gateno, 1)
@@ -693,7 +703,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x43\x80\x00\x5e\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x30\xe3\x41\x00",
                                  b"\x10\xa2\x2a\x00\x09\x06\x0e\x00"))
-        _frame = Eagle.Frame.parse(_valid_chunk)
+        _frame = Eagle.Frame.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_frame.x1, 0)
         self.assertEqual(_frame.y1, 0)
@@ -715,7 +725,7 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x42\x80\x2a\x00\x00\x00\x00\x31",
                                  b"\x32\x33\x34\x35\x36\x37\x38\x39",
                                  b"\x30\x21\x71\x77\x21\x72\x74\x00"))
-        _attr = Eagle.Attribute.parse(_valid_chunk)
+        _attr = Eagle.Attribute.parse(_valid_chunk, self.strings)
 
         self.assertEqual(_attr.name, "1234567890")
         self.assertEqual(_attr.value, "qw!rt")
@@ -724,8 +734,87 @@ class EagleTests(unittest.TestCase):
         _valid_chunk = b''.join((b"\x42\x80\x2a\x00\x00\x00\x00\x7f",
                                  b"\x88\x2b\x18\x09\x00\x00\x00\x00",
                                  b"\x00\x00\x00\x00\x00\x00\x00\x00"))
-        _attr = Eagle.Attribute.parse(_valid_chunk)
+        _attr = Eagle.Attribute.parse(_valid_chunk, self.strings)
         self.assertEqual(_attr.name, 'name_a')
         self.assertEqual(_attr.value, None)
         return
 
+    def test_block_table(self):
+        """ Test each block type maps to one 24 byte long decoder """
+        _table = Eagle._block_table()
+        self.assertEqual(len(_table), 37)
+        for _type, (_parse, _add) in _table.items():
+            self.assertTrue(0 < _type < 0x100)
+            self.assertEqual(_add.im_class, Eagle)
+        for _block in (Eagle.Wire, Eagle.Arc, Eagle.Pin, Eagle.Attribute,
+                       Eagle.Part, Eagle.Layer):
+            self.assertEqual(_block.codec.size, Eagle.blocksize)
+        return
+
+    def test_mapped_and_read_parse(self):
+        """ Test a mapped file parses the same as a file-like object """
+        _path = join(TEST_DIR, 'dionet.sch')
+        _mapped = parse_json(Eagle(), _path)
+        with open(_path, 'rb') as _if:
+            _read = parse_json(Eagle(), StringIO(_if.read()))
+        self.assertEqual(_mapped, _read)
+        return
+
+    def test_parsers_share_nothing(self):
+        """ Test parses don't see each other's state, in turn or at once """
+        _paths = [join(TEST_DIR, _name)
+                  for _name in ('dionet.sch', 'maple-jtagadapter.sch')]
+        _alone = [parse_json(Eagle(), _path) for _path in _paths]
+
+        _parser = Eagle()
+        for _path, _json in zip(_paths, _alone):
+            self.assertEqual(parse_json(_parser, _path), _json)
+        # the first of its own external strings, not one of dionet's
+        self.assertEqual(_parser.attributeheader.schematic,
+                         '%F%N/%S.%C%R\t/%S.%C%R')
+
+        _results = {}
+        def _run(_index):
+            """ Parse every path, starting from a different one """
+            _order = _paths[_index:] + _paths[:_index]
+            _results[_index] = [parse_json(Eagle(), _path)
+                                for _path in _order]
+        _threads = [Thread(target=_run, args=(_i,)) for _i in (0, 1)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+        self.assertEqual(_results[0], _alone)
+        self.assertEqual(_results[1], _alone[1:] + _alone[:1])
+        return
+
+    def test_external_table(self):
+        """ Test each string field of a block is found by its offset """
+        _table = Eagle._block_table()
+        for _type, (_marker, _fields) in Eagle._external_table().items():
+            _chunk = bytearray(Eagle.blocksize)
+            _chunk[0] = _type
+            for _field in _fields:
+                _chunk[_field] = _marker
+            _strings = iter([Eagle.Attribute('name_a', 'value_a')] *
+                            (1 + len(_fields)))
+            _table[_type][0](str(_chunk), _strings)
+            # exactly one string is left over
+            self.assertEqual(len(list(_strings)), 1)
+        return
+
+    def test_lazy_parse(self):
+        """ Test a lazy parse builds the same design from fewer blocks """
+        _path = join(TEST_DIR, 'dionet.sch')
+        _eager, _lazy = Eagle(), Eagle(lazy=True)
+        self.assertEqual(parse_json(_lazy, _path), parse_json(_eager, _path))
+
+        _used = set(_part.libid for _part in _lazy.shapeheader.parts)
+        self.assertEqual(len(_lazy.libraries), len(_eager.libraries))
+        for _libid, _library in enumerate(_lazy.libraries, 1):
+            self.assertEqual(_library.name,
+                             _eager.libraries[-1 + _libid].name)
+            self.assertEqual(0 != len(_library.devsets), _libid in _used)
+            for _packages in _library.packages:
+                self.assertEqual(_packages.shapesets, [])
+        return
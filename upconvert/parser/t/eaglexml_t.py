@@ -23,11 +23,13 @@
 
 from upconvert.parser.eaglexml import EagleXML
 from upconvert.parser.eaglexml.generated_g import wire
+from upconvert.parser.eaglexml.stream import iter_nodes
 
 import unittest
 
 from functools import wraps
 from os.path import dirname, join
+from StringIO import StringIO
 
 TEST_DIR = join(dirname(__file__), '..', '..', '..', 'test', 'eaglexml')
 EAGLE_SCALE = 10.0/9.0
@@ -465,6 +467,41 @@ class EagleXMLTests(unittest.TestCase):
         self.assertEqual(s.radius, parser.make_length('35.915'))
 
 
+    def test_stream_same_design(self):
+        """ Streaming a file builds the same design as the model does. """
+        for filename in ('E1AA60D5.sch', 'D9CD1423.sch', 'WiFi.sch'):
+            designs = [EagleXML(stream).parse(join(TEST_DIR, filename))
+                       for stream in (True, False)]
+            for design in designs:
+                design.design_attributes.metadata.updated_timestamp = 0
+            self.assertEqual(designs[0].json(), designs[1].json())
+
+
+    def test_stream_nodes(self):
+        """ Streamed elements read like the generated model's. """
+        xml = StringIO('<eagle><drawing><layers><layer number="1"/></layers>'
+                       '<library name="l"><symbols><symbol name="s">'
+                       '<pin name="1"/><pin name="2"/>'
+                       '<text x="1">&gt;NAME</text></symbol></symbols>'
+                       '<devicesets><deviceset name="d"><gates>'
+                       '<gate name="G$1" symbol="s"/></gates>'
+                       '</deviceset></devicesets></library>'
+                       '</drawing></eagle>')
+        nodes = list(iter_nodes(xml, [('drawing', 'library')]))
+        self.assertEqual([path for path, _ in nodes], [('drawing', 'library')])
+
+        lib = nodes[0][1]
+        self.assertEqual(lib.name, 'l')
+        self.assertEqual(lib.description, None)
+        symbol = lib.symbols.symbol[0]
+        self.assertEqual([pin.name for pin in symbol.pin], ['1', '2'])
+        self.assertEqual(symbol.wire, [])
+        self.assertEqual(symbol.text[0].valueOf_, '>NAME')
+        deviceset = lib.devicesets.deviceset[0]
+        self.assertEqual(deviceset.gates.gate[0].symbol, 's')
+        self.assertEqual(deviceset.devices, None)
+
+
     def get_component(self, library_id):
         """ Return the component given its id. """
         return self.design.components.components[library_id]
@@ -23,15 +23,21 @@
 
 from functools import wraps
 from os import path
+from shutil import rmtree
+from StringIO import StringIO
+from tempfile import mkdtemp
 import unittest
 
 from nose.tools import raises
 
+from upconvert.parser import gerber
 from upconvert.parser.gerber import Gerber, DelimiterMissing, ParamContainsBadData, \
                             CoordPrecedesFormatSpec, CoordMalformed, \
                             FileNotTerminated, DataAfterEOF, \
                             UnintelligibleDataBlock, QuadrantViolation, \
-                            OpenFillBoundary, IncompatibleAperture, Modifier
+                            OpenFillBoundary, IncompatibleAperture, Modifier, \
+                            Funct, Coord
+from upconvert.core.layout import Layer
 
 STRIP_DIRS = path.join('upconvert', 'parser', 't')
 BASE_DIR = path.dirname(__file__).split(STRIP_DIRS)[0]
@@ -199,6 +205,43 @@ class GerberTests(unittest.TestCase):
         """ Parse a batch of gerber files in a gz tarball. """
         assert self.design.layout.layers[0].name == 'top'
 
+    def parse_layers(self, names, **kwargs):
+        """ Parse the named test files as the layers of a layers.cfg """
+        cfg_dir = mkdtemp()
+        try:
+            with open(path.join(cfg_dir, 'layers.cfg'), 'w') as cfg:
+                for name in names:
+                    cfg.write('%s, copper, %s\n'
+                              % (name, path.join(DIR, name + '.ger')))
+            parser = Gerber(ignore_unknown=False, **kwargs)
+            return parser.parse(path.join(cfg_dir, 'layers.cfg'))
+        finally:
+            rmtree(cfg_dir)
+
+    def test_layers_in_cfg_order(self):
+        """ Layers parsed in worker processes keep layers.cfg order. """
+        names = ['smear', 'fills', 'flash-current-pos']
+        design = self.parse_layers(names, processes=2)
+
+        layers = design.layout.layers
+        self.assertEqual([layer.name for layer in layers], names)
+
+        # each layer was parsed by a photo plotter of its own
+        fills = Gerber().parse(path.join(DIR, 'fills.ger')).layout.layers[0]
+        self.assertEqual([len(image.fills) for image in layers[1].images],
+                         [len(image.fills) for image in fills.images])
+
+    def test_layers_serial_by_default(self):
+        """ Layers are only parsed in worker processes when asked to. """
+        pool = gerber.Pool
+        gerber.Pool = None # fail if called
+        try:
+            design = self.parse_layers(['smear', 'fills'])
+        finally:
+            gerber.Pool = pool
+        self.assertEqual([layer.name for layer in design.layout.layers],
+                         ['smear', 'fills'])
+
     def test_modifier(self):
         """ The Modifier can evaluate expressions correctly. """
         modif = Modifier('1.2')
@@ -222,6 +265,26 @@ class GerberTests(unittest.TestCase):
         self.assertEqual(modif.evaluate(values), 3)
         self.assertEqual(values, {1:1, 2:2, 3:3.0})
 
+    def test_tokenize(self):
+        """ Well-formed and irregular data blocks give the same tokens. """
+        parser = Gerber()
+        parser.layer_buff = Layer('top', 'unknown')
+        content = ('%FSLAX23Y23*%G01*D10*X1000Y-20D02*Y0I5J+5D01*D03*'
+                   'G01X1000Y2000*X1000Y-20D02*G55*M02*\n')
+        tokens = list(parser._tokenize(StringIO(content)))
+        self.assertEqual(tokens, [
+            Funct('G', '01'), Funct('D', '10'),
+            Funct('D', '02'), Coord(1.0, -0.02, None, None),
+            Funct('D', '01'), Coord(None, 0.0, 0.005, 0.005),
+            Funct('XD', '03'),
+            Funct('G', '01'), Coord(1.0, 2.0, None, None),
+            Funct('D', '02'), Coord(1.0, -0.02, None, None)])
+        blocks = []
+        for tok in ('G01', 'D10', 'X1000Y-20D02', 'Y0I5J+5D01', 'D03',
+                    'G01X1000Y2000', 'X1000Y-20D02', 'G55'):
+            blocks.extend(parser._parse_data_block(tok))
+        self.assertEqual(tokens, blocks)
+
     # tests that pass if they raise expected errors
 
     @raises(DelimiterMissing)
@@ -29,6 +29,7 @@ import unittest
 from functools import wraps
 from os.path import dirname, join
 from os import devnull
+from StringIO import StringIO
 
 TEST_DIR = join(dirname(__file__), '..', '..', '..', 'test', 'kicad')
 
@@ -224,3 +225,21 @@ class KiCADTests(unittest.TestCase):
         self.assertEqual(ann.x, 1150)
         self.assertEqual(ann.y, -11950)
         self.assertEqual(ann.rotation, 0)
+
+
+    def test_parse_buffer(self):
+        """
+        A schematic and library read into memory parse the same as the
+        files on disk.
+        """
+
+        with open(join(TEST_DIR, 'test', 'test.sch')) as f:
+            schematic = StringIO(f.read())
+        with open(join(TEST_DIR, 'test', 'test-cache.lib')) as f:
+            library = StringIO(f.read())
+
+        design = KiCAD(libraries={'test-cache.lib': library}).parse(schematic)
+        expected = get_design('test/test.sch')
+        design.design_attributes.metadata.updated_timestamp = \
+            expected.design_attributes.metadata.updated_timestamp
+        self.assertEqual(design.json(), expected.json())
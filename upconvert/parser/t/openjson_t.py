@@ -22,10 +22,44 @@
 # limitations under the License.
 
 
+from upconvert.core.components import Component, Symbol, SBody, Pin
+from upconvert.core.component_instance import ComponentInstance, SymbolAttribute
+from upconvert.core.design import Design
+from upconvert.core.net import Net, NetPoint
 from upconvert.parser.openjson import JSON
+from upconvert.utils.jsonstream import python_basic_parse, build_value
+from upconvert.writer.openjson import JSON as JSONWriter
+
+from StringIO import StringIO
+import json
+import os
+import tempfile
 import unittest
 
 
+def make_design():
+    """ Return a small design with something in every section """
+    design = Design()
+    design.design_attributes.add_attribute('title', 'caf\xc3\xa9')
+
+    cpt = Component('R')
+    body = SBody()
+    body.add_pin(Pin('1', (0, 0), (0, 10)))
+    symbol = Symbol()
+    symbol.add_body(body)
+    cpt.add_symbol(symbol)
+    design.add_component('R', cpt)
+
+    inst = ComponentInstance('R1', cpt, 'R', 0)
+    inst.add_symbol_attribute(SymbolAttribute(0, 10, 0.5))
+    design.add_component_instance(inst)
+
+    net = Net('N1')
+    net.add_point(NetPoint('0a0', 0, 0))
+    design.add_net(net)
+    return design
+
+
 class JSONTests(unittest.TestCase):
     """ The tests of the json parser """
 
@@ -41,3 +75,30 @@ class JSONTests(unittest.TestCase):
         """ Test creating an empty parser. """
         parser = JSON()
         assert parser != None
+
+    def test_stream_matches_loads(self):
+        """ Test streaming a file parses the same design as loading it. """
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            JSONWriter().write(make_design(), filename)
+            loaded = JSON(stream=False).parse(filename)
+            streamed = JSON(stream=True).parse(filename)
+        finally:
+            os.remove(filename)
+
+        self.assertEqual(streamed.json(), loaded.json())
+        inst = streamed.component_instances[0]
+        self.assertTrue(inst.library_component is
+                        streamed.components.components['R'])
+
+    def test_python_basic_parse(self):
+        """ Test the fallback tokenizer reads values split across reads
+        the way json.loads reads them. """
+        text = '{"a": [1, -2.5e3, "\\u00e9\\"x", true, null], "b": {}}'
+        events = python_basic_parse(StringIO(text), 1)
+        event, value = next(events)
+        self.assertEqual(build_value(events, event, value), json.loads(text))
+        self.assertEqual(list(events), [])
+        self.assertRaises(ValueError, list,
+                          python_basic_parse(StringIO('[1, 2'), 1))
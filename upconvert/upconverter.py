@@ -51,9 +51,15 @@ Upverter's Open JSON Interchange Format """
 import logging
 import os
 import sys
+import time
+import select
+import signal
 import operator
-import tempfile
 import zipfile
+import hashlib
+import multiprocessing
+import cPickle as pickle
+from StringIO import StringIO
 from argparse import ArgumentParser
 try:
     import simplejson as json
@@ -61,52 +67,60 @@ except ImportError:
     import json
 
 from upconvert import version as ver
-
-from upconvert.parser import openjson as openjson_p, kicad as kicad_p, geda as geda_p, \
-    eagle as eagle_p, eaglexml as eaglexml_p, fritzing as fritzing_p, gerber as gerber_p, \
-    specctra as specctra_p
-from upconvert.writer import openjson as openjson_w, kicad as kicad_w, geda as geda_w, \
-    eagle as eagle_w, eaglexml as eaglexml_w, gerber as gerber_w, specctra as specctra_w, \
-    bom_csv as bom_w, netlist_csv as netlist_w, ncdrill as ncdrill_w
-
-
-# Try to include image writer support
-try:
-    from upconvert.writer import image as image_w
-    image_parser = image_w.Image # pylint: disable=C0103
-except ImportError, err:
-    if err.message != 'No module named PIL':
-        raise
-    image_parser = None # pylint: disable=C0103
+from upconvert.utils.cache import cache_dir, make_dir, ConversionCache, \
+    CACHE_DIR_ENV, DEFAULT_CACHE_DIR
+from upconvert.utils.inputs import is_buffer, Probe
+from upconvert.utils.importtime import ImportProfiler
+from upconvert.utils.jsonstream import loaded_value
+from upconvert.utils.registry import Registry
 
 
 # Logging
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger('main')  # pylint: disable=C0103
 
-PARSERS = {
-    'openjson': openjson_p.JSON,
-    'kicad': kicad_p.KiCAD,
-    'geda': geda_p.GEDA,
-    'eagle': eagle_p.Eagle,
-    'eaglexml': eaglexml_p.EagleXML,
-    'fritzing': fritzing_p.Fritzing,
-    'gerber': gerber_p.Gerber,
-    'specctra': specctra_p.Specctra,
-}
-
-WRITERS = {
-    'openjson': openjson_w.JSON,
-    'kicad': kicad_w.KiCAD,
-    'geda': geda_w.GEDA,
-    'eagle': eagle_w.Eagle,
-    'eaglexml': eaglexml_w.EagleXML,
-    'gerber': gerber_w.Gerber,
-    'ncdrill': ncdrill_w.NCDrill,
-    'specctra': specctra_w.Specctra,
-    'image':  image_parser,
-    'bom': bom_w.BOM,
-    'netlist': netlist_w.Netlist,
+# the parser and writer classes, whose modules are only imported when a
+# conversion needs them
+PARSERS = Registry({
+    'openjson': ('upconvert.parser.openjson', 'JSON'),
+    'kicad': ('upconvert.parser.kicad', 'KiCAD'),
+    'geda': ('upconvert.parser.geda', 'GEDA'),
+    'eagle': ('upconvert.parser.eagle', 'Eagle'),
+    'eaglexml': ('upconvert.parser.eaglexml', 'EagleXML'),
+    'fritzing': ('upconvert.parser.fritzing', 'Fritzing'),
+    'gerber': ('upconvert.parser.gerber', 'Gerber'),
+    'specctra': ('upconvert.parser.specctra', 'Specctra'),
+})
+
+WRITERS = Registry({
+    'openjson': ('upconvert.writer.openjson', 'JSON'),
+    'kicad': ('upconvert.writer.kicad', 'KiCAD'),
+    'geda': ('upconvert.writer.geda', 'GEDA'),
+    'eagle': ('upconvert.writer.eagle', 'Eagle'),
+    'eaglexml': ('upconvert.writer.eaglexml', 'EagleXML'),
+    'gerber': ('upconvert.writer.gerber', 'Gerber'),
+    'ncdrill': ('upconvert.writer.ncdrill', 'NCDrill'),
+    'specctra': ('upconvert.writer.specctra', 'Specctra'),
+    'image': ('upconvert.writer.image', 'Image'),
+    'bom': ('upconvert.writer.bom_csv', 'BOM'),
+    'netlist': ('upconvert.writer.netlist_csv', 'Netlist'),
+}, optional={'image': 'PIL'}) # image writer support needs PIL
+
+# the order formats are detected in: the ones that only look at the
+# start of a file first, so the whole file is only read if need be
+DETECT_ORDER = ['eagle', 'eaglexml', 'fritzing', 'gerber', 'kicad',
+                'specctra', 'geda', 'openjson']
+
+# the confidence at which autodetect stops trying other formats
+SURE = 0.9
+
+# bump whenever converted designs or outputs change, to drop cached ones
+CACHE_VERSION = 2
+
+# the library files a parser reads from the directory of its input
+LIBRARY_EXTENSIONS = {
+    'kicad': '.lib',
+    'geda': '.sym',
 }
 
 EXTENSIONS = {
@@ -128,13 +142,53 @@ EXTENSIONS = {
 class Upconverter(object):
     """ The bee knees """
 
+    # the ConversionCache used by parse() and json_to_format(), if any
+    cache = None
+
+    @staticmethod
+    def enable_cache(directory=None, max_bytes=256 * 1024 * 1024):
+        """ Keep the results of parse() and json_to_format() in a
+        ConversionCache in directory (by default 'conversions' in the
+        on-disk cache, or in DEFAULT_CACHE_DIR if that is not set), and
+        reuse them for the same input bytes, format and parser
+        arguments. Returns the cache, or None if there is no cache
+        directory. """
+        if directory is None:
+            directory = cache_dir('conversions') or \
+                make_dir(os.path.join(DEFAULT_CACHE_DIR, 'conversions'))
+        elif not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        if directory is None:
+            Upconverter.cache = None
+        else:
+            Upconverter.cache = ConversionCache(directory, max_bytes)
+        return Upconverter.cache
+
+
+    @staticmethod
+    def disable_cache():
+        """ Stop using the conversion cache """
+        Upconverter.cache = None
+
+
     @staticmethod
     def autodetect(inputfile):
-        """ Autodetect the given input files formatting """
+        """ Autodetect the given input files formatting. inputfile may
+        be a file name or an open file-like object. The input is read
+        once and shared by the detectors, which are tried in
+        DETECT_ORDER until one of them is sure. """
         confidence = {}
 
-        for name, parser in PARSERS.iteritems():
-            confidence[name] = parser.auto_detect(inputfile)
+        probe = Probe(inputfile)
+        try:
+            for name in DETECT_ORDER:
+                confidence[name] = PARSERS[name].auto_detect(probe)
+                if confidence[name] >= SURE:
+                    log.info('Auto-detected input type: %s', name)
+                    return name
+        finally:
+            probe.close()
 
         ordered = sorted(confidence.iteritems(), key=operator.itemgetter(1), reverse=True)
         if ordered[0][1] < 0.5:
@@ -148,18 +202,48 @@ class Upconverter(object):
 
     @staticmethod
     def parse(in_filename, in_format='openjson', **parser_kwargs):
-        """ Parse the given input file using the in_format """
+        """ Parse the given input file (a file name or an open file-like
+        object) using the in_format """
 
         log.debug('parsing %s in format %s', in_filename, in_format)
+        if in_format == 'geda':
+            kwargs = dict((key, parser_kwargs[key])
+                          for key in ('symbol_dirs', 'libraries')
+                          if key in parser_kwargs)
+        elif in_format == 'kicad' and 'libraries' in parser_kwargs:
+            kwargs = {'libraries': parser_kwargs['libraries']}
+        elif in_format == 'eagle' and 'lazy' in parser_kwargs:
+            kwargs = {'lazy': parser_kwargs['lazy']}
+        elif in_format == 'gerber' and 'processes' in parser_kwargs:
+            kwargs = {'processes': parser_kwargs['processes']}
+        else:
+            kwargs = {}
+
+        cache = Upconverter.cache
+        key = None
+        if cache is not None:
+            key = _parse_key(in_filename, in_format, kwargs)
+            data = key and cache.get(key)
+            if data:
+                log.debug('using cached design for %s', in_filename)
+                return pickle.loads(data)
+
         try:
-            if in_format == 'geda':
-                par = PARSERS[in_format](**parser_kwargs)
-            else:
-                par = PARSERS[in_format]()
+            par = PARSERS[in_format](**kwargs) #pylint: disable=W0142
         except KeyError:
             raise Exception('ERROR: Unsupported input type: %s' % (in_format))
 
-        return par.parse(in_filename)
+        design = par.parse(in_filename)
+
+        if key is not None and design is not None:
+            try:
+                data = pickle.dumps(design, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError), err:
+                log.debug('not caching design for %s: %s', in_filename, err)
+            else:
+                cache.put(key, data)
+
+        return design
 
 
     @staticmethod
@@ -167,8 +251,8 @@ class Upconverter(object):
         """ Write the converted input file to the out_format """
 
         try:
-            if out_format == 'geda':
-                wri = WRITERS[out_format](**parser_kwargs)
+            if out_format == 'geda' and 'symbol_dirs' in parser_kwargs:
+                wri = WRITERS[out_format](symbol_dirs=parser_kwargs['symbol_dirs'])
             else:
                 wri = WRITERS[out_format]()
         except KeyError:
@@ -179,30 +263,20 @@ class Upconverter(object):
 
     @staticmethod
     def file_to_upv(file_content, lib_contents):
-        """ convert file_content into upv data pre-jsonification """
+        """ convert file_content into upv data pre-jsonification. The
+        content and the libraries in lib_contents (file name -> stream)
+        are read into memory and parsed from there. """
         log.info('Starting to convert content into upv')
 
-        tmp_dir = tempfile.mkdtemp()
-
-        tmp_fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
-        os.write(tmp_fd, file_content.read())
-        os.close(tmp_fd)
-
-        lib_path_list = []
-        for lib_filename, lib_content in lib_contents.iteritems():
-            lib_tmp_fd, lib_tmp_path = tempfile.mkstemp(suffix = lib_filename, prefix = lib_filename, dir=tmp_dir)
-            os.write(lib_tmp_fd, lib_content.read())
-            os.close(lib_tmp_fd)
-            lib_path_list.append(lib_tmp_path)
+        content = StringIO(file_content.read())
+        libraries = dict((lib_filename, StringIO(lib_content.read()))
+                         for lib_filename, lib_content in lib_contents.iteritems())
 
-        frmt = Upconverter.autodetect(tmp_path)
-        design = Upconverter.parse(tmp_path, frmt)
-        os.remove(tmp_path)
+        frmt = Upconverter.autodetect(content)
+        design = Upconverter.parse(content, frmt, libraries=libraries)
 
-        for path in lib_path_list:
-            os.remove(path)
-
-        return json.loads(json.dumps(design.json(), sort_keys=True, indent=4))
+        # as the JSON text of the design would load
+        return loaded_value(design.json())
 
 
     @staticmethod
@@ -210,14 +284,25 @@ class Upconverter(object):
         """ convert upv_json_data into format as a file @ path """
         log.info('Converting upv data into %s at %s', frmt, path)
 
-        path_w_ext = path + EXTENSIONS[frmt]
-        tmp_fd, tmp_path = tempfile.mkstemp()
-        os.write(tmp_fd, upv_json_data)
-        os.close(tmp_fd)
+        cache = Upconverter.cache
+        if cache is not None:
+            # the output names the files in it after path
+            key = cache.key('json_to_format', CACHE_VERSION, frmt,
+                            os.path.basename(path),
+                            hashlib.sha1(upv_json_data).hexdigest())
+            data = cache.get(key)
+            if data is not None:
+                if frmt in ('kicad', 'geda'):
+                    path_w_ext = path + '.zip'
+                else:
+                    path_w_ext = path + EXTENSIONS[frmt]
+                with open(path_w_ext, 'wb') as f:
+                    f.write(data)
+                return path_w_ext
 
-        design = Upconverter.parse(tmp_path, 'openjson')
+        path_w_ext = path + EXTENSIONS[frmt]
+        design = Upconverter.parse(StringIO(upv_json_data), 'openjson')
         Upconverter.write(design, path_w_ext, frmt)
-        os.remove(tmp_path)
 
         if frmt == 'kicad':
             kicad_zip = zipfile.ZipFile(path + '.zip', mode='w')
@@ -234,9 +319,279 @@ class Upconverter(object):
             geda_zip.close()
             path_w_ext = path + '.zip'
 
+        if cache is not None:
+            with open(path_w_ext, 'rb') as f:
+                cache.put(key, f.read())
+
         return path_w_ext
 
 
+    @staticmethod
+    def convert(inputfile, outputfile, in_format=None, out_format='openjson',
+                **parser_kwargs):
+        """ Convert a single file, returning a dict describing the result
+        instead of raising. This is the unit of work of a batch run. """
+        result = {
+            'input': inputfile,
+            'output': outputfile,
+            'from': in_format,
+            'to': out_format,
+            'success': False,
+            'error': None,
+        }
+        start = time.time()
+        try:
+            if in_format is None:
+                in_format = Upconverter.autodetect(inputfile)
+                result['from'] = in_format
+
+            design = Upconverter.parse(inputfile, in_format, **parser_kwargs) #pylint: disable=W0142
+            if design is None:
+                raise Exception('parser returned no design')
+
+            Upconverter.write(design, outputfile, out_format, **parser_kwargs) #pylint: disable=W0142
+            result['success'] = True
+        except Exception, err: #pylint: disable=W0703
+            result['error'] = '%s: %s' % (err.__class__.__name__, err)
+        result['seconds'] = round(time.time() - start, 3)
+        return result
+
+
+    @staticmethod
+    def batch(jobs, processes=None, timeout=None):
+        """ Convert many files over worker processes.
+
+        jobs is a list of (inputfile, outputfile, in_format, out_format,
+        parser_kwargs) tuples. Workers live for the whole run, so module
+        imports and parser library state are only paid once per worker.
+        Every job yields a result dict (see convert()), in job order. A
+        job that does not finish within timeout seconds of starting, or
+        whose worker dies, is reported as failed and its worker replaced,
+        rather than stalling the run. """
+        results = [None] * len(jobs)
+        waiting = list(reversed(list(enumerate(jobs))))
+        count = min(processes or multiprocessing.cpu_count(), len(jobs))
+        workers = [_BatchWorker() for _ in xrange(count)]
+
+        try:
+            while waiting or any(worker.job for worker in workers):
+                for number, worker in enumerate(workers):
+                    if worker.job is None and waiting:
+                        if not worker.process.is_alive():
+                            worker.stop()
+                            worker = workers[number] = _BatchWorker()
+                        worker.start(waiting.pop(), timeout)
+
+                busy = [worker for worker in workers if worker.job]
+                deadlines = [worker.deadline for worker in busy
+                             if worker.deadline is not None]
+                wait = max(min(deadlines) - time.time(), 0) if deadlines else None
+                ready = select.select([worker.conn for worker in busy], [], [], wait)[0]
+
+                for worker in busy:
+                    index, job = worker.job
+                    if worker.conn in ready:
+                        try:
+                            results[index] = worker.conn.recv()
+                        except (EOFError, IOError):
+                            results[index] = _batch_failure(
+                                job, 'worker died with exit code %s' % worker.stop())
+                            workers[workers.index(worker)] = _BatchWorker()
+                        else:
+                            worker.job = None
+                    elif worker.deadline is not None and time.time() >= worker.deadline:
+                        worker.stop()
+                        results[index] = _batch_failure(job, 'timed out after %ss' % timeout)
+                        workers[workers.index(worker)] = _BatchWorker()
+        finally:
+            for worker in workers:
+                worker.close()
+
+        return results
+
+
+def _parse_key(inputfile, in_format, parser_kwargs):
+    """ Return the conversion cache key for parsing inputfile, or None
+    if the result cannot be cached. The key covers the bytes of the
+    input and of any library files next to it that the parser reads,
+    the format, and the parser arguments, including a fingerprint of
+    the symbol files in any gEDA symbol_dirs. """
+    if in_format == 'gerber' and not is_buffer(inputfile):
+        from upconvert.parser.gerber import LAYERS_CFG
+        if LAYERS_CFG in inputfile:
+            return None # the layers are read from other files
+
+    try:
+        libraries = []
+        extension = LIBRARY_EXTENSIONS.get(in_format)
+        if extension is not None and not is_buffer(inputfile):
+            directory = os.path.dirname(inputfile) or '.'
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(extension):
+                    libraries.append((name, ConversionCache.digest(
+                        os.path.join(directory, name))))
+
+        kwargs = []
+        for name, value in sorted(parser_kwargs.iteritems()):
+            if name == 'libraries':
+                value = sorted((lib_name, ConversionCache.digest(lib))
+                               for lib_name, lib in value.iteritems())
+            elif name == 'symbol_dirs':
+                from upconvert.library.geda import fingerprint
+                value = (value, fingerprint(value))
+            kwargs.append((name, value))
+
+        return ConversionCache.key('parse', CACHE_VERSION, in_format,
+                                   ConversionCache.digest(inputfile),
+                                   libraries, kwargs)
+    except (IOError, OSError):
+        return None # eg. a directory of gerber layers
+
+
+class _BatchWorker(object):
+    """ A worker process of a batch run, the (index, job) it is running
+    (or None), and when that job times out (or None, for never) """
+
+    def __init__(self):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_batch_worker,
+                                               args=(child_conn,))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+        self.job = None
+        self.deadline = None
+
+    def start(self, job, timeout):
+        """ Send the worker an (index, job) to run """
+        self.job = job
+        self.deadline = None if timeout is None else time.time() + timeout
+        self.conn.send(job[1])
+
+    def stop(self):
+        """ Kill the worker, returning its exit code """
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+        return self.process.exitcode
+
+    def close(self):
+        """ Let an idle worker exit, or kill a busy one """
+        if self.job is None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(1)
+            except (IOError, OSError):
+                pass
+        self.stop()
+
+
+def _batch_worker(conn):
+    """ Run the batch jobs sent over conn in a worker process, sending
+    back each result, until sent None. The parent process handles ^C
+    for the whole run. """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for job in iter(conn.recv, None):
+        inputfile, outputfile, in_format, out_format, parser_kwargs = job
+        conn.send(Upconverter.convert(inputfile, outputfile, in_format,
+                                      out_format, **parser_kwargs)) #pylint: disable=W0142
+
+
+def _batch_failure(job, error):
+    """ Build the result of a job that never returned from its worker """
+    return {
+        'input': job[0],
+        'output': job[1],
+        'from': job[2],
+        'to': job[3],
+        'success': False,
+        'error': error,
+        'seconds': None,
+    }
+
+
+def batch_inputs(inputfile, manifest, in_format=None):
+    """ Collect the input files of a batch run, either from a manifest
+    (one path per line, relative to the manifest, # for comments) or by
+    walking an input directory. Returns (root, files), where root is the
+    directory output paths are made relative to. """
+    if manifest is not None:
+        root = os.path.dirname(os.path.abspath(manifest))
+        files = []
+        with open(manifest, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    files.append(os.path.join(root, line))
+        return root, files
+
+    if in_format is not None:
+        extensions = set([EXTENSIONS[in_format]])
+    else:
+        extensions = set(EXTENSIONS[frmt] for frmt in PARSERS)
+    if 'fritzing' in PARSERS and (in_format is None or in_format == 'fritzing'):
+        extensions.add('.fzz')
+
+    files = []
+    for top, _, names in os.walk(inputfile):
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() in extensions:
+                files.append(os.path.join(top, name))
+    files.sort()
+    return inputfile, files
+
+
+def batch_output(inputfile, root, outputdir, outputtype):
+    """ Pick the output path of a batch input file. Without an output
+    directory the output goes next to its input. """
+    file_name = os.path.splitext(inputfile)[0]
+    if outputdir is not None:
+        rel_name = os.path.relpath(file_name, root)
+        if rel_name.startswith(os.pardir):
+            rel_name = os.path.basename(file_name)
+        file_name = os.path.join(outputdir, rel_name)
+    return file_name + EXTENSIONS[outputtype]
+
+
+def run_batch(args, parser_kwargs):
+    """ Run a batch conversion from the command line arguments and
+    report a JSON summary. Returns the process exit status. """
+    root, inputs = batch_inputs(args.inputfile, args.batch, args.inputtype)
+
+    jobs = []
+    for inputfile in inputs:
+        outputfile = batch_output(inputfile, root, args.outputfile, args.outputtype)
+        outputdir = os.path.dirname(outputfile)
+        if outputdir and not os.path.isdir(outputdir):
+            os.makedirs(outputdir)
+        jobs.append((inputfile, outputfile, args.inputtype, args.outputtype, parser_kwargs))
+
+    log.info('Converting %d files with %s workers', len(jobs),
+             args.jobs or multiprocessing.cpu_count())
+    start = time.time()
+    results = Upconverter.batch(jobs, args.jobs, args.timeout)
+
+    failed = [res for res in results if not res['success']]
+    for res in failed:
+        log.error('Failed to convert %s: %s', res['input'], res['error'])
+
+    summary = {
+        'total': len(results),
+        'succeeded': len(results) - len(failed),
+        'failed': len(failed),
+        'seconds': round(time.time() - start, 3),
+        'results': results,
+    }
+    if args.summary is not None:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, sort_keys=True, indent=4)
+    else:
+        print json.dumps(summary, sort_keys=True, indent=4)
+
+    return 1 if failed else 0
+
+
 def main(): #pylint: disable=R0912,R0915
     """ Also, bees knees """
     argp = ArgumentParser()
@@ -245,13 +600,26 @@ def main(): #pylint: disable=R0912,R0915
     argp.add_argument("-f", "--from", dest="inputtype",
                       help="read input file as TYPE", metavar="TYPE")
     argp.add_argument("-o", "--output", dest="outputfile",
-                      help="write OUTPUT file out", metavar="OUTPUT")
+                      help="write OUTPUT file out (an output directory in batch mode)",
+                      metavar="OUTPUT")
     argp.add_argument("-t", "--to", dest="outputtype",
                       help="write output file as TYPE", metavar="TYPE",
                       default="openjson")
     argp.add_argument("-s", "--sym-dirs", dest="sym_dirs",
                       help="specify SYMDIRS to search for .sym files (for gEDA only)", 
                       metavar="SYMDIRS", nargs="+")
+    argp.add_argument("-b", "--batch", dest="batch",
+                      help="convert every file listed in MANIFEST (one per line)",
+                      metavar="MANIFEST")
+    argp.add_argument("-j", "--jobs", dest="jobs", type=int,
+                      help="use JOBS worker processes in batch mode (default: one per cpu), "
+                      "or for the layers of a gerber input",
+                      metavar="JOBS")
+    argp.add_argument("--timeout", dest="timeout", type=float,
+                      help="fail a batch file after SECONDS", metavar="SECONDS")
+    argp.add_argument("--summary", dest="summary",
+                      help="write the batch JSON summary to SUMMARY instead of stdout",
+                      metavar="SUMMARY")
     argp.add_argument('--unsupported', action='store_true', default=False,
                       help="run with an unsupported python version")
     argp.add_argument('--raise-errors', dest='raise_errors',
@@ -259,6 +627,12 @@ def main(): #pylint: disable=R0912,R0915
                       help="show tracebacks for parsing and writing errors")
     argp.add_argument('--profile', action='store_true', default=False,
                       help="collect profiling information")
+    argp.add_argument('--startup-profile', dest='startup_profile',
+                      action='store_true', default=False,
+                      help="report how long each module took to import")
+    argp.add_argument('--cache', action='store_true', default=False,
+                      help="reuse parsed designs and libraries from the on-disk cache "
+                      "(in $%s, or else %s)" % (CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
     argp.add_argument('-v', '--version', action='store_true', default=False,
                       help="print version information and quit")
     argp.add_argument('--formats', action='store_true', default=False,
@@ -266,6 +640,10 @@ def main(): #pylint: disable=R0912,R0915
 
     args = argp.parse_args()
 
+    if args.startup_profile:
+        import_profiler = ImportProfiler()
+        import_profiler.start()
+
     if args.version:
         print "upconverter %s in python %s.%s" % (ver.version(), sys.version_info[0], sys.version_info[1])
         print "Copyright (C) 2007 Upverter, Inc."
@@ -301,6 +679,22 @@ def main(): #pylint: disable=R0912,R0915
     if args.sym_dirs:
         parser_kwargs['symbol_dirs'] = args.sym_dirs
 
+    if args.cache:
+        # the library stores use the on-disk cache only when it is set
+        os.environ.setdefault(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+        Upconverter.enable_cache()
+
+    # Batch mode, from a manifest or an input directory
+    if args.batch is not None or (inputfile is not None and os.path.isdir(inputfile)):
+        status = run_batch(args, parser_kwargs)
+        if args.startup_profile:
+            import_profiler.stop()
+            print import_profiler.report(limit=30)
+        sys.exit(status)
+
+    if args.jobs:
+        parser_kwargs['processes'] = args.jobs
+
     # Test for input file
     if inputfile == None:
         log.error('No input file provided.')
@@ -359,6 +753,10 @@ def main(): #pylint: disable=R0912,R0915
         profile.disable()
         profile.print_stats()
 
+    if args.startup_profile:
+        import_profiler.stop()
+        print import_profiler.report(limit=30)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,163 @@
+""" Locates and writes the converter's on-disk caches """
+
+import os
+import hashlib
+import tempfile
+
+from upconvert.utils.inputs import open_input
+
+CACHE_DIR_ENV = 'UPCONVERT_CACHE_DIR'
+
+
+# where the conversion cache goes when enabled without a directory
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'upconvert')
+
+
+def cache_dir(*parts):
+    """ Return the on-disk cache directory, creating it if needed. It is
+    $UPCONVERT_CACHE_DIR plus any subdirectory parts. Caching on disk is
+    opt-in: this returns None if the variable is not set (or is empty),
+    or if the directory cannot be created. """
+    path = os.environ.get(CACHE_DIR_ENV)
+    if not path:
+        return None
+    return make_dir(os.path.join(path, *parts))
+
+
+def make_dir(path):
+    """ Create the directory path if needed, and return it, or None if
+    it cannot be created """
+    if not os.path.isdir(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                return None
+    return path
+
+
+def write_atomic(path, data):
+    """ Write data to path so that readers only ever see the old or the
+    new contents, even with several processes writing at once """
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                        prefix='.tmp-')
+    try:
+        with os.fdopen(tmp_fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ConversionCache(object):
+    """ A content-addressed store of conversion results on disk, one file
+    per key, bounded by the total size of the files. Reading an entry
+    touches its file, so the least recently used entries are the ones
+    with the oldest mtimes, and are evicted first once over max_bytes.
+    The hit and miss counts are kept for monitoring.
+
+    The total size is counted as entries are stored, from one listing of
+    the directory. Only when the count goes over max_bytes is the
+    directory listed again, to recount it (other processes may share the
+    store) and evict entries down to low_water of max_bytes. """
+
+    # the fraction of max_bytes eviction brings the store down to
+    low_water = 0.9
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = None # the bytes stored, once counted
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        """ Return the key of an entry made from the reprs of parts """
+        return hashlib.sha1(repr(parts)).hexdigest()
+
+    @staticmethod
+    def digest(source):
+        """ Return a hash of the bytes of a file name or file-like object """
+        sha1 = hashlib.sha1()
+        with open_input(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), ''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def path(self, key):
+        """ Return the file an entry is stored in """
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """ Return the data stored for key, or None """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """ Store data for key, then evict entries if over max_bytes """
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self.entries())
+        path = self.path(key)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        try:
+            write_atomic(path, data)
+        except (IOError, OSError):
+            return
+        self.size += len(data) - old_size
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """ Return [(mtime, size, path)] of the stored entries, least
+        recently used first """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.tmp-'):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """ Remove the least recently used entries until the store is no
+        bigger than low_water of max_bytes, if it is over max_bytes """
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size > self.max_bytes:
+            for _, entry_size, path in entries:
+                if size <= self.max_bytes * self.low_water:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                size -= entry_size
+        self.size = size
+
+    def stats(self):
+        """ Return the hit and miss counts, and the number and total size
+        of the stored entries """
+        entries = self.entries()
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries)}
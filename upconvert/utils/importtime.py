@@ -0,0 +1,83 @@
+""" Measures how long each module takes to import """
+
+import imp
+import sys
+import time
+
+
+class ImportProfiler(object):
+    """ Times every module imported for the first time while it is
+    installed, as an import hook in front of the normal ones. For each
+    module it keeps the total time spent importing it, and the time
+    spent in the module itself, leaving out the modules it imported
+    in turn. """
+
+    def __init__(self):
+        self.times = {} # module name -> [total seconds, own seconds]
+        self.stack = [] # seconds spent in nested imports, per open import
+
+    def start(self):
+        """ Start timing imports """
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def stop(self):
+        """ Stop timing imports """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_module(self, fullname, path=None):
+        """ Find a module the way the normal import does, returning a
+        loader that times it, or None to leave it to the normal import """
+        try:
+            found = imp.find_module(fullname.rpartition('.')[2], path)
+        except ImportError:
+            return None
+        return _TimedLoader(self, found)
+
+    def timed(self, fullname, load):
+        """ Return load(), recording how long it took under fullname """
+        self.stack.append(0.0)
+        start = time.time()
+        try:
+            return load()
+        finally:
+            total = time.time() - start
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += total
+            self.times[fullname] = [total, total - nested]
+
+    def report(self, limit=None):
+        """ Return a table of the timed modules, slowest first """
+        rows = sorted(self.times.iteritems(), key=lambda item: -item[1][0])
+        if limit is not None:
+            rows = rows[:limit]
+
+        lines = ['%10s %10s  %s' % ('total ms', 'self ms', 'module')]
+        for module, (total, own) in rows:
+            lines.append('%10.1f %10.1f  %s' % (total * 1000, own * 1000, module))
+        lines.append('%d modules imported in %.1f ms' % (
+            len(self.times), sum(own for _, own in self.times.itervalues()) * 1000))
+        return '\n'.join(lines)
+
+
+class _TimedLoader(object):
+    """ Loads a module found by imp.find_module, timing it """
+
+    def __init__(self, profiler, found):
+        self.profiler = profiler
+        self.found = found
+
+    def load_module(self, fullname):
+        """ Load the module, or return it if it already is loaded """
+        if fullname in sys.modules:
+            return sys.modules[fullname]
+
+        open_file, pathname, description = self.found
+        try:
+            return self.profiler.timed(fullname, lambda: imp.load_module(
+                fullname, open_file, pathname, description))
+        finally:
+            if open_file is not None:
+                open_file.close()
@@ -0,0 +1,127 @@
+""" Lets the parsers read their input from a file name, or from an open
+file-like object such as an upload held in memory """
+
+import os
+import zipfile
+from contextlib import contextmanager
+from StringIO import StringIO
+
+
+def is_buffer(source):
+    """ Return whether source is an open file-like object rather than
+    a file name """
+    return hasattr(source, 'read')
+
+
+def input_name(source):
+    """ Return the file name of source, or '' for a file-like object
+    without one """
+    if isinstance(source, Probe):
+        return source.name
+    if is_buffer(source):
+        return getattr(source, 'name', '')
+    return source
+
+
+def input_size(source):
+    """ Return the size of source in bytes """
+    if is_buffer(source):
+        source.seek(0, os.SEEK_END)
+        return source.tell()
+    return os.path.getsize(source)
+
+
+@contextmanager
+def open_input(source, mode='r'):
+    """ Open a file name for reading, or rewind a file-like object to
+    read it from the start. A file-like object is left open afterwards.
+    With 'U' in mode, line endings are translated the way open() does. """
+    if not is_buffer(source):
+        with open(source, mode) as f:
+            yield f
+    elif 'U' in mode:
+        source.seek(0)
+        yield StringIO(source.read().replace('\r\n', '\n').replace('\r', '\n'))
+    else:
+        source.seek(0)
+        yield source
+
+
+def read_input(source, size=-1, mode='r'):
+    """ Return the contents of source, or the first size bytes of it """
+    with open_input(source, mode) as f:
+        return f.read(size)
+
+
+class Probe(object):
+    """ What the format detectors look at in an input, read once and
+    shared between them: the first HEAD_BYTES of it, all of it (only
+    read if a detector asks), and the names in it if it is a zip
+    archive. The input is opened once, and is kept open until close(). """
+
+    HEAD_BYTES = 4096
+
+    def __init__(self, source):
+        self.source = source
+        self.name = input_name(source)
+        if is_buffer(source):
+            source.seek(0)
+            self.f = source
+        else:
+            self.f = open(source, 'rb')
+        self.head = self.f.read(self.HEAD_BYTES)
+        self._data = None
+        self._names = None
+
+    @property
+    def data(self):
+        """ The whole input """
+        if self._data is None:
+            if len(self.head) < self.HEAD_BYTES:
+                self._data = self.head
+            else:
+                self.f.seek(len(self.head))
+                self._data = self.head + self.f.read()
+        return self._data
+
+    @property
+    def names(self):
+        """ The names of the files in a zip archive input, or [] """
+        if self._names is None:
+            self._names = []
+            if zipfile.is_zipfile(self.f):
+                zip_file = zipfile.ZipFile(self.f)
+                self._names = zip_file.namelist()
+        return self._names
+
+    def close(self):
+        """ Close the input, if the probe opened it """
+        if not is_buffer(self.source):
+            self.f.close()
+
+
+def read_head(source):
+    """ Return the first Probe.HEAD_BYTES of a Probe, file name or
+    file-like object """
+    if isinstance(source, Probe):
+        return source.head
+    return read_input(source, Probe.HEAD_BYTES)
+
+
+def read_all(source):
+    """ Return all of a Probe, file name or file-like object """
+    if isinstance(source, Probe):
+        return source.data
+    return read_input(source)
+
+
+def list_archive(source):
+    """ Return the names of the files in a Probe, file name or file-like
+    object that is a zip archive, or [] """
+    if isinstance(source, Probe):
+        return source.names
+    probe = Probe(source)
+    try:
+        return probe.names
+    finally:
+        probe.close()
@@ -0,0 +1,205 @@
+""" Reads JSON as a stream of parse events, so large files can be turned
+into objects a piece at a time instead of all at once """
+
+import re
+from json.decoder import scanstring
+
+try:
+    import ijson
+except ImportError:
+    ijson = None # pylint: disable=C0103
+
+BUF_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+# the literals json.loads accepts, and the events they are read as
+CONSTANTS = [('true', ('boolean', True)),
+             ('false', ('boolean', False)),
+             ('null', ('null', None)),
+             ('NaN', ('number', float('nan'))),
+             ('Infinity', ('number', float('inf'))),
+             ('-Infinity', ('number', float('-inf')))]
+LONGEST_CONSTANT = max(len(text) for text, _ in CONSTANTS)
+
+# parser states: what the next token may be
+VALUE, FIRST_ITEM, KEY, FIRST_KEY, COLON, NEXT, DONE = range(7)
+
+STARTS = {'{': 'start_map', '[': 'start_array'}
+ENDS = {'{': ('}', 'end_map'), '[': (']', 'end_array')}
+
+
+def basic_parse(f, buf_size=BUF_SIZE):
+    """ Return an iterator of the (event, value) pairs of the JSON
+    document in the open file f, the way ijson.basic_parse does. The
+    events are start_map, map_key, end_map, start_array, end_array,
+    string, number, boolean and null. Strings and numbers come out as
+    json.loads would make them: unicode, int/long or float.
+
+    ijson is used if it is installed, otherwise the document is read
+    by a pure python tokenizer. """
+    if ijson is not None:
+        try:
+            return ijson.basic_parse(f, buf_size=buf_size, use_float=True)
+        except TypeError:
+            pass # ijson < 3 makes Decimals, which json.loads does not
+    return python_basic_parse(f, buf_size)
+
+
+def python_basic_parse(f, buf_size=BUF_SIZE):
+    """ Generate the (event, value) pairs of the JSON document in the
+    open file f, reading it buf_size bytes at a time. """
+    # pylint: disable=R0912
+    stack = []
+    state = VALUE
+    for token, value in _tokens(f, buf_size):
+        if state == COLON:
+            if token != ':':
+                raise ValueError("Expecting ':' delimiter")
+            state = VALUE
+        elif state == NEXT:
+            if token == ',':
+                state = KEY if stack[-1] == '{' else VALUE
+            elif token == ENDS[stack[-1]][0]:
+                yield ENDS[stack.pop()][1], None
+                state = NEXT if stack else DONE
+            else:
+                raise ValueError("Expecting ',' delimiter")
+        elif state in (KEY, FIRST_KEY):
+            if token == 'string':
+                yield 'map_key', value
+                state = COLON
+            elif token == '}' and state == FIRST_KEY:
+                yield ENDS[stack.pop()][1], None
+                state = NEXT if stack else DONE
+            else:
+                raise ValueError('Expecting property name')
+        elif state in (VALUE, FIRST_ITEM):
+            if token in STARTS:
+                stack.append(token)
+                yield STARTS[token], None
+                state = FIRST_KEY if token == '{' else FIRST_ITEM
+            elif token == ']' and state == FIRST_ITEM:
+                yield ENDS[stack.pop()][1], None
+                state = NEXT if stack else DONE
+            elif token in (':', ',', '}', ']'):
+                raise ValueError('No JSON object could be decoded')
+            else:
+                yield token, value
+                state = NEXT if stack else DONE
+        else:
+            raise ValueError('Extra data')
+
+    if state != DONE:
+        raise ValueError('Unexpected end of JSON document')
+
+
+def _tokens(f, buf_size):
+    """ Generate the tokens of the JSON text in the open file f as
+    (token, value) pairs, where the token is one of the punctuation
+    characters, or the event name of a string, number, etc. """
+    # pylint: disable=R0912
+    buf = f.read(buf_size)
+    pos = 0
+    eof = not buf
+
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()
+        more = False
+
+        if pos == len(buf):
+            if eof:
+                return
+            more = True
+        elif buf[pos] in '{}[]:,':
+            yield buf[pos], None
+            pos += 1
+        elif buf[pos] == '"':
+            if STRING_END.match(buf, pos + 1) is None:
+                more = True
+            else:
+                value, pos = scanstring(buf, pos + 1, 'utf-8', True)
+                yield 'string', value
+        else:
+            match = NUMBER.match(buf, pos)
+            # a number or literal cut off by the end of the buffer
+            # might go on past it
+            end = pos if match is None else match.end()
+            if not eof and end + LONGEST_CONSTANT >= len(buf):
+                more = True
+            elif match is not None:
+                integer, frac, exp = match.groups()
+                if frac or exp:
+                    yield 'number', float(match.group())
+                else:
+                    yield 'number', int(integer)
+                pos = match.end()
+            else:
+                for text, event in CONSTANTS:
+                    if buf.startswith(text, pos):
+                        yield event
+                        pos += len(text)
+                        break
+                else:
+                    raise ValueError('No JSON object could be decoded')
+
+        if more:
+            if eof:
+                raise ValueError('Unexpected end of JSON document')
+            data = f.read(buf_size)
+            eof = not data
+            buf = buf[pos:] + data
+            pos = 0
+
+
+def build_value(events, event, value):
+    """ Build the python value that starts with (event, value), taking
+    the rest of its events from the events iterator """
+    if event == 'start_map':
+        obj = {}
+        for event, key in events:
+            if event == 'end_map':
+                return obj
+            event, value = next(events)
+            obj[key] = build_value(events, event, value)
+    elif event == 'start_array':
+        array = []
+        for event, value in events:
+            if event == 'end_array':
+                return array
+            array.append(build_value(events, event, value))
+    else:
+        return value
+
+
+# the text json.dumps writes for dict keys which are not strings
+KEY_CONSTANTS = {True: u'true', False: u'false', None: u'null'}
+
+
+def loaded_value(value):
+    """ Return value the way json.loads(json.dumps(value)) would, without
+    the text in between: strings as unicode (byte strings are utf-8),
+    tuples as lists, and dict keys as strings """
+    if isinstance(value, dict):
+        return dict((_loaded_key(key), loaded_value(item))
+                    for key, item in value.iteritems())
+    if isinstance(value, (list, tuple)):
+        return [loaded_value(item) for item in value]
+    if isinstance(value, str):
+        return value.decode('utf-8')
+    if isinstance(value, long):
+        return int(value)
+    return value
+
+
+def _loaded_key(key):
+    """ Return a dict key the way json.loads(json.dumps()) would """
+    if isinstance(key, basestring):
+        return loaded_value(key)
+    if isinstance(key, bool) or key is None:
+        return KEY_CONSTANTS[key]
+    if isinstance(key, float):
+        return unicode(repr(key))
+    return unicode(key)
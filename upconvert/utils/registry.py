@@ -0,0 +1,82 @@
+""" A table of format names to parser or writer classes, whose modules
+are only imported when a format is first looked up, and a stand-in for
+a module that is only imported when it is first used """
+
+import logging
+from importlib import import_module
+
+log = logging.getLogger('utils.registry') # pylint: disable=C0103
+
+
+class Registry(object):
+    """ Maps format names to the classes that handle them, given as
+    (module name, class name). A class's module is imported the first
+    time the format is looked up, so a conversion only pays for the
+    modules of the formats it uses.
+
+    optional maps a format name to a module its class needs but that
+    may not be installed. If it is not, the format maps to None
+    instead of raising ImportError. """
+
+    def __init__(self, entries, optional=None):
+        self.entries = entries
+        self.optional = optional or {}
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self.loaded:
+            module_name, class_name = self.entries[name]
+            try:
+                module = import_module(module_name)
+            except ImportError, err:
+                missing = self.optional.get(name)
+                if missing is None or err.message != 'No module named ' + missing:
+                    raise
+                log.debug('%s is not available without %s', name, missing)
+                self.loaded[name] = None
+            else:
+                self.loaded[name] = getattr(module, class_name)
+        return self.loaded[name]
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        """ Return the format names, without importing anything """
+        return self.entries.keys()
+
+    def get(self, name, default=None):
+        """ Return the class for a format, or default if it is unknown """
+        if name not in self.entries:
+            return default
+        return self[name]
+
+    def iteritems(self):
+        """ Generate (format name, class) pairs, importing every module """
+        for name in self.entries:
+            yield name, self[name]
+
+
+class LazyModule(object):
+    """ Stands in for the module named name, which is imported the first
+    time one of its attributes is read. Each attribute read is kept on
+    the stand-in, so later reads of it cost no more than on the module.
+
+    For module-level imports of big modules that only some uses of the
+    importing module need, eg. generated bindings. """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        value = getattr(import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
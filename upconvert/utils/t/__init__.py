@@ -0,0 +1 @@
+""" Utils tests """
\ No newline at end of file
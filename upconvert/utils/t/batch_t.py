@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The batch conversion test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.upconverter import Upconverter, PARSERS
+
+from unittest import TestCase
+
+import os
+import time
+import shutil
+import signal
+import tempfile
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                         'test', 'kicad', 'test', 'test.sch')
+
+
+class CrashParser(object):
+    """ A parser whose process dies, as if it segfaulted """
+
+    def parse(self, filename): # pylint: disable=W0613,R0201
+        """ Kill the process """
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+class HangParser(object):
+    """ A parser which never finishes """
+
+    def parse(self, filename): # pylint: disable=W0613,R0201
+        """ Sleep for longer than any test """
+        time.sleep(60)
+
+
+class BatchTests(TestCase):
+    """ The tests of batch conversion """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        PARSERS.entries['crash'] = (__name__, 'CrashParser')
+        PARSERS.entries['hang'] = (__name__, 'HangParser')
+
+    def tearDown(self):
+        for name in ('crash', 'hang'):
+            del PARSERS.entries[name]
+            PARSERS.loaded.pop(name, None)
+        shutil.rmtree(self.directory)
+
+    def job(self, in_format, name):
+        """ Return a batch job converting the test file to openjson """
+        return (TEST_FILE, os.path.join(self.directory, name), in_format,
+                'openjson', {})
+
+    def test_success(self):
+        """ Test that every job is converted, in job order """
+
+        jobs = [self.job('kicad', '%d.upv' % i) for i in range(3)]
+        results = Upconverter.batch(jobs, 2)
+
+        self.assertEqual([res['success'] for res in results], [True] * 3)
+        self.assertEqual([res['output'] for res in results],
+                         [job[1] for job in jobs])
+        for job in jobs:
+            self.assertTrue(os.path.exists(job[1]))
+
+    def test_parse_error(self):
+        """ Test that a failed parse fails only its own job """
+
+        results = Upconverter.batch([self.job('openjson', 'a.upv'),
+                                     self.job('kicad', 'b.upv')], 1)
+
+        self.assertEqual([res['success'] for res in results], [False, True])
+        self.assertTrue(results[0]['error'])
+
+    def test_worker_death(self):
+        """ Test that a job whose worker dies fails, and the rest run """
+
+        results = Upconverter.batch([self.job('crash', 'a.upv'),
+                                     self.job('kicad', 'b.upv'),
+                                     self.job('crash', 'c.upv'),
+                                     self.job('kicad', 'd.upv')], 1)
+
+        self.assertEqual([res['success'] for res in results],
+                         [False, True, False, True])
+        self.assertEqual(results[0]['error'],
+                         'worker died with exit code %d' % -signal.SIGKILL)
+
+    def test_timeout(self):
+        """ Test that each job gets the timeout from when it starts """
+
+        start = time.time()
+        results = Upconverter.batch([self.job('hang', 'a.upv'),
+                                     self.job('hang', 'b.upv'),
+                                     self.job('kicad', 'c.upv')], 1, 1)
+
+        self.assertEqual([res['success'] for res in results],
+                         [False, False, True])
+        self.assertEqual(results[0]['error'], 'timed out after 1s')
+        self.assertTrue(2 <= time.time() - start < 30)
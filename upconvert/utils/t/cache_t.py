@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The conversion cache test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.utils.cache import ConversionCache
+from upconvert.upconverter import Upconverter, _parse_key
+
+from StringIO import StringIO
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                         'test', 'kicad', 'test', 'test.sch')
+GEDA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                         'test', 'geda', 'simple_example', 'simple_example.sch')
+
+
+class ConversionCacheTests(TestCase):
+    """ The tests of the conversion cache """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ConversionCache(self.directory)
+
+    def tearDown(self):
+        Upconverter.disable_cache()
+        shutil.rmtree(self.directory)
+
+    def test_hits_and_misses(self):
+        """ Test that stored entries are found and counted """
+
+        key = self.cache.key('parse', 'kicad', 'abc')
+        self.assertEqual(self.cache.get(key), None)
+        self.cache.put(key, 'data')
+        self.assertEqual(self.cache.get(key), 'data')
+        self.assertEqual(self.cache.stats(),
+                         {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 4})
+
+    def test_digest(self):
+        """ Test that files and file-like objects hash by content """
+
+        with open(TEST_FILE, 'rb') as f:
+            buf = StringIO(f.read())
+        self.assertEqual(self.cache.digest(TEST_FILE), self.cache.digest(buf))
+        self.assertNotEqual(self.cache.digest(StringIO('x')),
+                            self.cache.digest(buf))
+
+    def test_eviction(self):
+        """ Test that the least recently used entries are evicted """
+
+        self.cache.max_bytes = 35
+        for i, key in enumerate(['a', 'b', 'c']):
+            self.cache.put(key, '0123456789')
+            os.utime(self.cache.path(key), (i, i))
+
+        self.cache.get('a')
+        self.cache.put('d', '0123456789')
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a', 'c', 'd'])
+        self.assertEqual(self.cache.size, 30)
+
+    def test_put_counts_size(self):
+        """ Test that the directory is only listed again once over the limit """
+
+        listings = []
+        entries = self.cache.entries
+        self.cache.entries = lambda: listings.append(1) or entries()
+        self.cache.max_bytes = 100
+        for i in range(10):
+            self.cache.put(str(i), '0123456789')
+        self.cache.put('0', '01234')
+        self.assertEqual((len(listings), self.cache.size), (1, 95))
+
+        self.cache.put('a', '0123456789')
+        self.assertEqual(len(listings), 2)
+        self.assertTrue(self.cache.size <= 90)
+        self.assertEqual(self.cache.size, self.cache.stats()['bytes'])
+
+    def test_cached_parse(self):
+        """ Test that parsing the same input again uses the cache """
+
+        cache = Upconverter.enable_cache(self.directory)
+        design = Upconverter.parse(TEST_FILE, 'kicad')
+        cached = Upconverter.parse(TEST_FILE, 'kicad')
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(cached is design)
+        self.assertEqual(cached.json(), design.json())
+
+    def test_symbol_dirs_key(self):
+        """ Test that editing a gEDA symbol file changes the parse key """
+
+        symbol_dir = os.path.join(self.directory, 'symbols')
+        os.mkdir(symbol_dir)
+        symbol = os.path.join(symbol_dir, 'part.sym')
+        with open(symbol, 'w') as f:
+            f.write('v 20110115 2\n')
+        key = lambda: _parse_key(GEDA_FILE, 'geda', {'symbol_dirs': [symbol_dir]})
+
+        old_key = key()
+        self.assertEqual(key(), old_key)
+        with open(symbol, 'a') as f:
+            f.write('L 0 0 100 100 3 0 0 0 -1 -1\n')
+        self.assertNotEqual(key(), old_key)
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The input probe test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.utils.inputs import Probe, read_head, read_all
+from upconvert.upconverter import Upconverter, DETECT_ORDER, PARSERS
+from upconvert.utils.jsonstream import loaded_value
+
+from StringIO import StringIO
+from unittest import TestCase
+
+import os
+import json
+import zipfile
+
+TEST_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'test')
+
+
+class CountingIO(StringIO):
+    """ A StringIO that counts the bytes read from it """
+
+    def __init__(self, data):
+        StringIO.__init__(self, data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = StringIO.read(self, size)
+        self.bytes_read += len(data)
+        return data
+
+
+class ProbeTests(TestCase):
+    """ The tests of the input probe """
+
+    def test_head_and_data(self):
+        """ The head is read up front, the rest only when asked for """
+        data = 'x' * (Probe.HEAD_BYTES * 3)
+        buf = CountingIO(data)
+        probe = Probe(buf)
+        self.assertEqual(read_head(probe), data[:Probe.HEAD_BYTES])
+        self.assertEqual(buf.bytes_read, Probe.HEAD_BYTES)
+        self.assertEqual(read_all(probe), data)
+        self.assertEqual(read_all(probe), data)
+        self.assertEqual(buf.bytes_read, len(data))
+        probe.close()
+        self.assertFalse(buf.closed)
+
+    def test_names(self):
+        """ The names in a zip archive are listed """
+        buf = StringIO()
+        zip_file = zipfile.ZipFile(buf, 'w')
+        zip_file.writestr('test.fz', '<module/>')
+        zip_file.close()
+        self.assertEqual(Probe(buf).names, ['test.fz'])
+        self.assertEqual(Probe(StringIO('not a zip')).names, [])
+
+    def test_autodetect_stops_when_sure(self):
+        """ A file detected from its start is not read to the end """
+        with open(os.path.join(TEST_DIR, 'eaglexml', '450B679C.sch')) as f:
+            data = f.read()
+        buf = CountingIO(data * 4)
+        self.assertEqual(Upconverter.autodetect(buf), 'eaglexml')
+        self.assertEqual(buf.bytes_read, Probe.HEAD_BYTES)
+
+    def test_detect_order(self):
+        """ Every format is detected """
+        self.assertEqual(sorted(DETECT_ORDER), sorted(PARSERS))
+
+
+class ParseTests(TestCase):
+    """ The tests of passing parser options through parse """
+
+    def test_geda_ignores_processes(self):
+        """ The gEDA parser is not given options meant for gerber """
+        filename = os.path.join(TEST_DIR, 'geda', 'simple_example',
+                                'simple_example.sch')
+        design = Upconverter.parse(filename, 'geda', processes=2)
+        self.assertTrue(design.components.components)
+
+
+class FileToUpvTests(TestCase):
+    """ The tests of converting uploads in memory """
+
+    def test_loaded_value(self):
+        """ Values come out the way the JSON text of them would load """
+        value = {'a': ('b\xc2\xb5', 1L, 2.5), 1: None, True: [u'c']}
+        self.assertEqual(loaded_value(value), json.loads(json.dumps(value)))
+        self.assertEqual(loaded_value(value)[u'a'][0], u'b\xb5')
+        self.assertTrue(isinstance(loaded_value('x'), unicode))
+
+    def test_same_as_json(self):
+        """ file_to_upv returns what the JSON of the design loads as """
+        filename = os.path.join(TEST_DIR, 'eagle', 'pwmdmx_rev_B.sch')
+        with open(filename, 'rb') as f:
+            upv = Upconverter.file_to_upv(f, {})
+        design = Upconverter.parse(filename, 'eagle').json()
+        expected = json.loads(json.dumps(design))
+
+        for value in (upv, expected):
+            metadata = value['design_attributes']['metadata']
+            del metadata['updated_timestamp']
+        self.assertEqual(upv, expected)
+        for name, component in upv['components'].iteritems():
+            self.assertTrue(isinstance(name, unicode))
+            for value in component['attributes'].itervalues():
+                self.assertTrue(isinstance(value, unicode))
@@ -0,0 +1,75 @@
+#!/usr/bin/python
+# encoding: utf-8
+#pylint: disable=R0904
+""" The format registry test class """
+
+# upconvert.py - A universal hardware design file format converter using
+# Format:       upverter.com/resources/open-json-format/
+# Development:  github.com/upverter/schematic-file-converter
+#
+# Copyright 2011 Upverter, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from upconvert.utils.importtime import ImportProfiler
+from upconvert.utils.registry import Registry, LazyModule
+
+from unittest import TestCase
+
+import sys
+
+
+class RegistryTests(TestCase):
+    """ The tests of the format registry """
+
+    def test_lazy_lookup(self):
+        """ A module is only imported when its format is looked up """
+        sys.modules.pop('colorsys', None)
+        registry = Registry({'hls': ('colorsys', 'hls_to_rgb')})
+        self.assertTrue('hls' in registry)
+        self.assertEqual(list(registry), ['hls'])
+        self.assertFalse('colorsys' in sys.modules)
+        self.assertEqual(registry['hls'](0, 0, 0), (0, 0, 0))
+        self.assertTrue('colorsys' in sys.modules)
+        self.assertEqual(registry.get('rgb'), None)
+
+    def test_optional(self):
+        """ A format whose optional module is missing maps to None """
+        registry = Registry({'a': ('no_such_module', 'A'),
+                             'b': ('no_such_module', 'B')},
+                            optional={'a': 'no_such_module'})
+        self.assertEqual(registry['a'], None)
+        self.assertRaises(ImportError, lambda: registry['b'])
+
+    def test_lazy_module(self):
+        """ A lazy module is only imported when an attribute is read """
+        sys.modules.pop('colorsys', None)
+        module = LazyModule('colorsys')
+        self.assertFalse('colorsys' in sys.modules)
+        self.assertEqual(module.hls_to_rgb(0, 0, 0), (0, 0, 0))
+        self.assertTrue('colorsys' in sys.modules)
+        self.assertTrue('hls_to_rgb' in vars(module))
+        self.assertRaises(AttributeError, lambda: module.no_such_attribute)
+
+    def test_import_profiler(self):
+        """ Imports are timed while the profiler runs """
+        sys.modules.pop('colorsys', None)
+        profiler = ImportProfiler()
+        profiler.start()
+        try:
+            import colorsys # pylint: disable=W0612
+        finally:
+            profiler.stop()
+        self.assertTrue('colorsys' in profiler.times)
+        self.assertTrue('colorsys' in profiler.report())
@@ -21,20 +21,34 @@
 
 # TODO: handle layers
 
-import upconvert.parser.eaglexml.generated_g as G
 from math import fabs
 
-default_layers = {
-    "net": G.layer(number="91", name="Nets", color="2", fill="1", visible="yes", active="yes"),
-    "bus": G.layer(number="92", name="Busses", color="1", fill="1", visible="yes", active="yes"),
-    "pin": G.layer(number="93", name="Pins", color="2", fill="1", visible="no", active="yes"),
-    "symbol": G.layer(number="94", name="Symbols", color="4", fill="1", visible="yes", active="yes"),
-    "name": G.layer(number="95", name="Names", color="7", fill="1", visible="yes", active="yes"),
-    "value": G.layer(number="96", name="Values", color="7", fill="1", visible="yes", active="yes"),
-    "info": G.layer(number="97", name="Info", color="7", fill="1", visible="yes", active="yes"),
-    "guide": G.layer(number="98", name="Guide", color="6", fill="1", visible="yes", active="yes"),
+from upconvert.utils.registry import LazyModule
+
+# the generated bindings are loaded by the first write
+G = LazyModule('upconvert.parser.eaglexml.generated_g')
+
+# the G.layer arguments of the default layers, by eaglexml context
+DEFAULT_LAYERS = {
+    "net": dict(number="91", name="Nets", color="2", fill="1", visible="yes", active="yes"),
+    "bus": dict(number="92", name="Busses", color="1", fill="1", visible="yes", active="yes"),
+    "pin": dict(number="93", name="Pins", color="2", fill="1", visible="no", active="yes"),
+    "symbol": dict(number="94", name="Symbols", color="4", fill="1", visible="yes", active="yes"),
+    "name": dict(number="95", name="Names", color="7", fill="1", visible="yes", active="yes"),
+    "value": dict(number="96", name="Values", color="7", fill="1", visible="yes", active="yes"),
+    "info": dict(number="97", name="Info", color="7", fill="1", visible="yes", active="yes"),
+    "guide": dict(number="98", name="Guide", color="6", fill="1", visible="yes", active="yes"),
     }
 
+_default_layers = {}
+
+def get_default_layers():
+    """ Return the default layers, as G.layers by eaglexml context """
+    if not _default_layers:
+        _default_layers.update((context, G.layer(**args)) # pylint: disable=W0142
+                               for context, args in DEFAULT_LAYERS.iteritems())
+    return _default_layers
+
 EAGLE_SCALE = 9.0 / 10.0
 
 class EagleXML(object):
@@ -565,7 +579,7 @@ class EagleXML(object):
             if layernum in self.layercache:
                 return self.layercache[layernum]
 
-        layer = default_layers[eagle_context]
+        layer = get_default_layers()[eagle_context]
 
         if layernum is None or layernum == layer.number:
             pass
@@ -586,7 +600,7 @@ class EagleXML(object):
         Add default layers to the design if they have not been added already.
         """
 
-        for layer in default_layers.itervalues():
+        for layer in get_default_layers().itervalues():
             if layer.number not in self.layercache:
                 self.layercache[layer.number] = layer
                 self.layers.layer.append(layer)
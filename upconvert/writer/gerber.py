@@ -26,7 +26,6 @@ from shutil import rmtree
 from collections import namedtuple
 from tarfile import TarFile
 from zipfile import ZipFile
-import copy
 import errno
 import freetype
 import logging
@@ -364,7 +363,7 @@ class Gerber:
 
             for idx, footprint_attr in enumerate(component_instance.footprint_attributes):
                 log.debug('footprint pos: %s, side %s, flip %s', footprint_attr.layer, footprint_pos.side, footprint_pos.flip_horizontal)
-                fp_attr_cpy = copy.deepcopy(footprint_attr)
+                fp_attr_cpy = footprint_attr.copy()
                 if footprint_attr.layer:
                     if footprint_pos.side == 'bottom':
                         # XXX(shamer): don't flip, just take the footprint side. This is a temporary fix to address the
@@ -375,7 +374,7 @@ class Gerber:
                 if fp_attr_cpy.layer == layer_name:
                     footprint_body = component.footprints[component_instance.footprint_index].bodies[idx]
                     log.debug('adding footprint attribute: %s, %d shapes', fp_attr_cpy, len(footprint_body.shapes))
-                    body_pos = copy.deepcopy(footprint_pos)
+                    body_pos = footprint_pos.copy()
                     if footprint_pos.flip_horizontal != footprint_body.flip_horizontal:
                         body_pos.rotation = (footprint_pos.rotation - footprint_body.rotation) % 2
                     else:
@@ -145,6 +145,8 @@ class NCDrill:
             else:
                 pos.rotate(body_attr.rotation, in_place=True)
         if body_attr.flip_horizontal:
+            # flip a copy, the shape belongs to the library footprint
+            shape = shape.copy()
             shape.flip(body_attr.flip_horizontal)
 
         log.debug('adding %d hole at %d, %d', shape.radius * 2, pos.x, pos.y)
@@ -182,6 +184,8 @@ class NCDrill:
             for idx, footprint_attr in enumerate(component_instance.footprint_attributes):
                 log.debug('footprint pos: %s, side %s, flip %s', footprint_attr.layer, footprint_pos.side, footprint_pos.flip_horizontal)
                 if footprint_attr.layer:
+                    # change the layer on a copy, leaving the design as it was
+                    footprint_attr = footprint_attr.copy()
                     footprint_attr.layer = footprint_attr.layer.replace('top', footprint_pos.side)
                 if footprint_attr.layer == hole_layer:
                     footprint_body = component.footprints[component_instance.footprint_index].bodies[idx]
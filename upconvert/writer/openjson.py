@@ -24,12 +24,127 @@
 
 
 import json
+from operator import itemgetter
 
 
 class JSON:
-    """ The JSON Format Writer """
+    """ The JSON Format Writer
+
+    The design is written out a section at a time, and each section an
+    element at a time, so only one net, component, etc. is turned into
+    JSON at once. The output is the same as json.dumps(design.json(),
+    sort_keys=True, indent=4), or with compact=True the same as
+    json.dumps(design.json(), sort_keys=True, separators=(',', ':')).
+    """
+
+    def __init__(self, compact=False):
+        self.compact = compact
+        if compact:
+            self.encoder = json.JSONEncoder(sort_keys=True,
+                                            separators=(',', ':'))
+        else:
+            self.encoder = json.JSONEncoder(sort_keys=True, indent=4)
+
 
     def write(self, design, filename):
         """ Recursively ask for JSON forms of components for output """
         with open(filename, "w") as f:
-            f.write(json.dumps(design.json(), sort_keys=True, indent=4))
+            self.write_to(design, f)
+
+
+    def write_to(self, design, f):
+        """ Stream the JSON form of a design to an open file """
+        self.write_value(f, self.sections(design), 0)
+
+
+    @staticmethod
+    def sections(design):
+        """ Return the lazy JSON form of a design, with the same
+        sections as design.json() """
+        components = design.components.components
+        return LazyDict([
+            ("version", design.version),
+            ("nets", LazyList(n.json() for n in design.nets)),
+            ("components", LazyDict((library_id, components[library_id].json())
+                                    for library_id in sorted(components))),
+            ("component_instances",
+             LazyList(i.json() for i in design.component_instances)),
+            ("shapes", LazyList(s.json() for s in design.shapes)),
+            ("pins", LazyList(s.json() for s in design.pins)),
+            ("design_attributes", design.design_attributes.json()),
+            ], sort=True)
+
+
+    def write_value(self, f, value, level):
+        """ Write a value at the given indent level. LazyLists and
+        LazyDicts are written an element at a time, anything else is
+        encoded in one go. """
+        if isinstance(value, LazyList):
+            self.write_container(f, '[]', value, level)
+        elif isinstance(value, LazyDict):
+            self.write_container(f, '{}', value, level)
+        elif self.compact:
+            f.write(self.encoder.encode(value))
+        else:
+            f.write(self.encoder.encode(value).replace('\n', self.newline(level)))
+
+
+    def write_container(self, f, brackets, items, level):
+        """ Write the elements of a LazyList or the items of a LazyDict """
+        separator = self.compact and ',' or ', '
+        newline = self.newline(level + 1)
+        empty = True
+        for item in items:
+            f.write(empty and brackets[0] or separator)
+            f.write(newline)
+            empty = False
+            if brackets == '{}':
+                key, item = item
+                f.write(self.encode_key(key))
+                f.write(self.compact and ':' or ': ')
+            self.write_value(f, item, level + 1)
+        if empty:
+            f.write(brackets)
+        else:
+            f.write(self.newline(level))
+            f.write(brackets[1])
+
+
+    def newline(self, level):
+        """ Return what starts a line at the given indent level """
+        if self.compact:
+            return ''
+        return '\n' + ' ' * (4 * level)
+
+
+    def encode_key(self, key):
+        """ Encode a dict key the way json does """
+        if isinstance(key, (int, long, float)) or key is None:
+            # json turns numbers, booleans and None into strings
+            key = self.encoder.encode(key)
+        elif not isinstance(key, basestring):
+            raise TypeError('key %r is not a string' % (key,))
+        return self.encoder.encode(key)
+
+
+class LazyList(object):
+    """ A JSON array whose elements are generated as it is written """
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def __iter__(self):
+        return iter(self.elements)
+
+
+class LazyDict(object):
+    """ A JSON object whose (key, value) items are generated as it is
+    written. Items must be in key order, unless sort is True. """
+
+    def __init__(self, items, sort=False):
+        if sort:
+            items = sorted(items, key=itemgetter(0))
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
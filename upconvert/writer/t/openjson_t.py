@@ -22,10 +22,44 @@
 # limitations under the License.
 
 
+from upconvert.core.components import Component, Symbol, SBody, Pin
+from upconvert.core.component_instance import ComponentInstance, SymbolAttribute
+from upconvert.core.design import Design
+from upconvert.core.net import Net, NetPoint
 from upconvert.writer.openjson import JSON
+
+import json
+import os
+import tempfile
 import unittest
 
 
+def make_design():
+    """ Return a small design with something in every section """
+    design = Design()
+    design.design_attributes.add_attribute('title', 'caf\xc3\xa9')
+
+    cpt = Component('R')
+    cpt.add_attribute('refdes', 'R?')
+    body = SBody()
+    body.add_pin(Pin('1', (0, 0), (0, 10)))
+    symbol = Symbol()
+    symbol.add_body(body)
+    cpt.add_symbol(symbol)
+    design.add_component('R', cpt)
+    design.add_component('C', Component('C'))
+
+    inst = ComponentInstance('R1', cpt, 'R', 0)
+    inst.add_symbol_attribute(SymbolAttribute(0, 10, 0.5))
+    design.add_component_instance(inst)
+
+    net = Net('N1')
+    net.add_point(NetPoint('0a0', 0, 0))
+    design.add_net(net)
+    design.add_net(Net('N2'))
+    return design
+
+
 class JSONTests(unittest.TestCase):
     """ The tests of the json writer """
 
@@ -41,3 +75,21 @@ class JSONTests(unittest.TestCase):
         """ Test creating an empty writer. """
         writer = JSON()
         assert writer != None
+
+    def test_matches_json_dumps(self):
+        """ Test the streamed output is the same as dumping the design. """
+        design = make_design()
+        expected = {
+            False: json.dumps(design.json(), sort_keys=True, indent=4),
+            True: json.dumps(design.json(), sort_keys=True,
+                             separators=(',', ':')),
+            }
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            for compact in (False, True):
+                JSON(compact).write(design, filename)
+                with open(filename) as f:
+                    self.assertEqual(f.read(), expected[compact])
+        finally:
+            os.remove(filename)